@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the ``on_message`` prefix fast path.
+
+Replays message contents through the two ways ``bot.on_message`` can decide
+whether a message is a command:
+
+* old: ``bot.get_context`` for every message (``_dynamic_prefix`` reads
+  ``guild_settings.json``, then a full Context is built);
+* new: ``_may_be_command`` against the cached prefix, with ``get_context``
+  only for messages that pass it.
+
+Commands are looked up but never invoked, and nothing connects to Discord.
+No cogs are loaded: only the command names used by the synthetic sample are
+registered (as no-ops), and every file the bot would touch (the prefix store,
+``DATABASE_NAME``) points into a temporary directory, so running the
+benchmark never creates or migrates the bot's real databases.
+
+Usage (from the repository root):
+
+    python benchmarks/on_message_fast_path.py                # synthetic chat
+    python benchmarks/on_message_fast_path.py messages.txt   # one message per line
+    python benchmarks/on_message_fast_path.py export.ndjson  # {"content": ...} per line
+
+A recorded sample can be taken from a Discord data export or any channel
+dump; only the message text is used.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "src")]
+os.environ.setdefault("DISCORD_TOKEN", "benchmark")
+
+# Scratch data directory, set before config is imported
+SCRATCH = tempfile.TemporaryDirectory(prefix="on_message_fast_path_")
+os.environ["DATABASE_NAME"] = os.path.join(SCRATCH.name, "modbot.db")
+
+import bot as botmod  # noqa: E402
+from discord.ext import commands  # noqa: E402
+from utils import json_store  # noqa: E402
+
+json_store._BASE = os.path.join(SCRATCH.name, "data")
+
+BOT_USER_ID = 1000000000000000001
+GUILD_ID = next(iter(botmod.AUTHORIZED_SERVERS), 1)
+
+_CHAT = [
+    "hey everyone, how's it going?",
+    "does anyone know why my python script can't find the module?",
+    "lol",
+    "I pushed the fix, can someone review?",
+    "```py\nprint('hello')\n```",
+    "thanks for the help!",
+    "what's the difference between a list and a tuple",
+    "https://docs.python.org/3/library/asyncio.html",
+    "good morning 👋",
+    "that worked, cheers",
+]
+_COMMANDS = ["?ping", "?help", "?warnings @someone", "?rank", f"<@{BOT_USER_ID}> help"]
+_COMMAND_NAMES = ("ping", "help", "warnings", "rank")
+
+
+def synthetic_contents(count: int, command_ratio: float, seed: int = 1) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        rng.choice(_COMMANDS) if rng.random() < command_ratio else rng.choice(_CHAT)
+        for _ in range(count)
+    ]
+
+
+def load_contents(path: str) -> list[str]:
+    contents = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    line = json.loads(line).get("content") or ""
+                except json.JSONDecodeError:
+                    pass
+            contents.append(line)
+    return contents
+
+
+def register_commands(bot) -> None:
+    """Add no-op commands so ``get_context`` resolves the sample's command names."""
+    async def noop(ctx, *args):
+        pass
+
+    for name in _COMMAND_NAMES:
+        if bot.get_command(name) is None:
+            bot.add_command(commands.Command(noop, name=name))
+
+
+def make_message(state, content: str, index: int) -> SimpleNamespace:
+    guild = SimpleNamespace(id=GUILD_ID, name="benchmark", me=None)
+    author = SimpleNamespace(id=2000 + index % 500, bot=False)
+    channel = SimpleNamespace(id=3000, guild=guild)
+    return SimpleNamespace(
+        id=index, content=content, guild=guild, author=author, channel=channel, _state=state
+    )
+
+
+async def old_path(bot, messages) -> int:
+    commands = 0
+    for message in messages:
+        # Before the fast path every message re-read the prefix file
+        json_store.invalidate_guild_prefix(GUILD_ID)
+        ctx = await bot.get_context(message)
+        commands += ctx.command is not None
+    return commands
+
+
+async def new_path(bot, messages) -> int:
+    commands = 0
+    for message in messages:
+        if not botmod._may_be_command(bot, message):
+            continue
+        ctx = await bot.get_context(message)
+        commands += ctx.command is not None
+    return commands
+
+
+async def run(contents: list[str], repeat: int) -> None:
+    bot = botmod.bot
+    await bot._async_setup_hook()
+    register_commands(bot)
+    bot._connection.user = SimpleNamespace(id=BOT_USER_ID)
+    messages = [make_message(bot._connection, content, i) for i, content in enumerate(contents)]
+    await json_store.get_guild_prefix(GUILD_ID)  # warm the cache once
+
+    try:
+        results = {}
+        for name, path in (("old", old_path), ("new", new_path)):
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                found = await path(bot, messages)
+                best = min(best, time.perf_counter() - started)
+            results[name] = (best, found)
+    finally:
+        await bot.close()
+
+    n = len(messages)
+    print(f"{n} messages, best of {repeat}")
+    for name, (seconds, found) in results.items():
+        print(f"  {name}: {seconds * 1000:8.1f} ms total  {seconds / n * 1e6:7.1f} µs/message  ({found} commands)")
+    old, new = results["old"][0], results["new"][0]
+    if new:
+        print(f"  speedup: {old / new:.1f}x")
+    if results["old"][1] != results["new"][1]:
+        print("  WARNING: the paths matched a different number of commands")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the on_message prefix fast path.")
+    parser.add_argument("recording", nargs="?", help="Message contents, one per line (text or NDJSON)")
+    parser.add_argument("-n", "--count", type=int, default=5000, help="Synthetic messages (default: 5000)")
+    parser.add_argument("--command-ratio", type=float, default=0.03, help="Synthetic share of commands")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    contents = load_contents(args.recording) if args.recording else synthetic_contents(args.count, args.command_ratio)
+    try:
+        asyncio.run(run(contents, args.repeat))
+    finally:
+        SCRATCH.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,27 @@
 import os
+import sys
 import logging
 import asyncio
+
+# Opt-in import timing (IMPORT_PROFILE=1) must be installed before the heavy imports
+from utils import import_profile
+if os.getenv('IMPORT_PROFILE', '0') == '1':
+    import_profile.enable()
+
 import discord
 import time
 from discord.ext import commands
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
-from commands.modules.sam import bridge as sam_bridge
-from utils.json_store import get_guild_prefix
+from utils.json_store import cached_guild_prefix, get_guild_prefix
 from utils.helpers import safe_interaction_reply
+from utils.cog_loader import CogLoader, record_add_cog
+from utils.command_sync import sync_guild_if_changed
+from utils import command_metrics
+from utils.message_router import MessageRouter
+from utils import member_index
+from utils.dm_outbox import DMOutbox
 from config import AUTHORIZED_GUILD_IDS
 import atexit
 
@@ -26,7 +38,8 @@ LOCK_FILE = os.getenv('BOT_LOCK_FILE', '.bot_instance.lock')
 
 # Authorized servers - Bot will only work in these servers
 # (configured via AUTHORIZED_GUILD_IDS in .env)
-AUTHORIZED_SERVERS = AUTHORIZED_GUILD_IDS
+# (frozenset: checked on every message and interaction)
+AUTHORIZED_SERVERS = frozenset(AUTHORIZED_GUILD_IDS)
 
 # Default prefix (can be overridden per-guild via /prefix)
 DEFAULT_PREFIX = '?'
@@ -40,6 +53,33 @@ async def _dynamic_prefix(bot: commands.Bot, message: discord.Message):
             prefix = stored
     return commands.when_mentioned_or(prefix)(bot, message)
 
+# "<@id> " / "<@!id> ", built once the bot user is known
+_mention_prefixes: tuple[str, ...] = ()
+
+def _command_prefixes(bot: commands.Bot, message: discord.Message) -> tuple[str, ...] | None:
+    """Prefixes a command in ``message`` could start with, from cached state only.
+
+    Mirrors ``_dynamic_prefix`` without awaiting anything. Returns None when
+    the guild's prefix has not been read yet, so the caller takes the full
+    ``process_commands`` path (which reads and caches it).
+    """
+    global _mention_prefixes
+    prefix = DEFAULT_PREFIX
+    if message.guild:
+        known, stored = cached_guild_prefix(message.guild.id)
+        if not known:
+            return None
+        if stored:
+            prefix = stored
+    if not _mention_prefixes and bot.user is not None:
+        _mention_prefixes = (f"<@{bot.user.id}> ", f"<@!{bot.user.id}> ")
+    return (prefix, *_mention_prefixes)
+
+def _may_be_command(bot: commands.Bot, message: discord.Message) -> bool:
+    """Cheap pre-filter: False means ``message`` cannot invoke a prefix command."""
+    prefixes = _command_prefixes(bot, message)
+    return prefixes is None or message.content.startswith(prefixes)
+
 # Command restriction decorator
 def authorized_servers_only():
     """Decorator to restrict commands to authorized servers only"""
@@ -70,6 +110,7 @@ COGS_TO_LOAD = [
     # Core Commands (Essential)
     'commands.core',          # Core hybrid commands (ping, info, help menu)
     'commands.diagnostics',   # Diagnostics (?diag, /diag)
+    'commands.guild_stats',   # Incremental per-guild statistics (serverinfo, ?diag)
     
     # Logging System (Essential - LOAD FIRST)
     'commands.logging',       # Centralized logging system for all events
@@ -93,21 +134,70 @@ COGS_TO_LOAD = [
     'commands.thread',        # Thread/post management (close, lock, pin, etc.)
     'commands.help_thread_notification', # Help thread notification system
     
-    # SAM Module (Script's Advanced Moderation - Essential)
-    'commands.modules.sam',   # Warning/moderation system with logging
-    
     # Event Handlers (Essential)
     'events.member_events',   # Member join/leave event handlers
     'events.message_handler', # Auto-thanks system for staff aura
 ]
 
+# Heavy cogs loaded in the background while the gateway handshake runs;
+# on_ready waits for them before syncing slash commands.
+DEFERRED_COGS = [
+    # SAM Module (Script's Advanced Moderation - Essential). Pulls in
+    # pydantic-settings, SQLAlchemy and SQLModel.
+    'commands.modules.sam',   # Warning/moderation system with logging
+]
+
+# Third-party packages imported in a thread while we log in (see main())
+PRELOAD_MODULES = ('pydantic_settings', 'sqlalchemy', 'sqlmodel', 'aiosqlite')
+
+# Load-order constraints for the parallel cog loader. Cogs not listed here
+# start immediately; the databases are always initialised before any cog.
+COG_DEPENDENCIES = {
+    # Logging first: these hand moderation/ticket events to LoggingCog
+    'commands.tickets': ('commands.logging',),
+    'commands.modcog': ('commands.logging',),
+    'commands.advanced_moderation': ('commands.logging',),
+    'commands.appeals': ('commands.logging',),
+    'commands.spam_catch': ('commands.logging',),
+    'commands.modules.sam': ('commands.logging',),
+    'events.member_events': ('commands.logging',),
+}
+
 class CodeVerseBot(commands.Bot):
     def __init__(self):
         """Initialize the bot with desired prefix and intents."""
         # Default prefix is '$' (per-guild overrides supported via /prefix)
-        super().__init__(command_prefix=_dynamic_prefix, intents=intents, help_command=None)
+        super().__init__(
+            command_prefix=_dynamic_prefix,
+            intents=intents,
+            help_command=None,
+            tree_cls=command_metrics.InstrumentedCommandTree,
+        )
+        # Per-command latency/error/ack metrics (?diag perf, /metrics)
+        command_metrics.install(self)
+        # Channel/guild subscriptions for cogs that react to guild messages
+        self.message_router = MessageRouter()
+        # user_id -> shared guild IDs, for user-level events (on_user_update)
+        self.member_index = member_index.install(self)
+        # Shared DM delivery (welcomes, warnings, appeal forms)
+        self.dm_outbox = DMOutbox(self)
         self.start_time = datetime.now(timezone.utc)
         self.instance_id = INSTANCE_ID
+        # Startup profile shown by ?startup: phase -> seconds, plus the loader
+        self._boot_perf = time.perf_counter()
+        self.startup_phases: dict[str, float] = {}
+        self.cog_loader: CogLoader | None = None
+        self._deferred_cogs_task: asyncio.Task | None = None
+        # Set by the first on_ready; later READYs are gateway reconnects
+        self.startup_complete = False
+
+    async def add_cog(self, cog, /, **kwargs):
+        """Add a cog, timing it (incl. ``cog_load``) for the startup profile."""
+        started = time.perf_counter()
+        try:
+            await super().add_cog(cog, **kwargs)
+        finally:
+            record_add_cog(time.perf_counter() - started)
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Global check for all interactions - restrict to authorized servers only"""
@@ -140,46 +230,97 @@ class CodeVerseBot(commands.Bot):
 
     async def setup_hook(self):
         """Async setup tasks (load cogs, etc.)."""
-        # Initialize databases
+        phase_start = time.perf_counter()
+        self.startup_phases["pre-setup"] = phase_start - self._boot_perf
+
+        # Initialize the main database (SAM's is initialised with its deferred cog)
+        await self._init_main_database()
+        self.startup_phases["databases"] = time.perf_counter() - phase_start
+
+        # Load all cogs, independent ones concurrently
+        phase_start = time.perf_counter()
+        self.cog_loader = CogLoader(self, COGS_TO_LOAD, COG_DEPENDENCIES)
+        await self.cog_loader.load_all()
+        self.startup_phases["cogs"] = time.perf_counter() - phase_start
+
+        self._rebuild_help_index()
+
+        # Heavy subsystems load while the gateway connection is established
+        self._deferred_cogs_task = asyncio.create_task(self._load_deferred_cogs())
+
+    async def _load_deferred_cogs(self):
+        phase_start = time.perf_counter()
+        await self._init_sam_database()
+        deferred = CogLoader(self, DEFERRED_COGS, COG_DEPENDENCIES)
+        await deferred.load_all()
+        if self.cog_loader is not None:
+            self.cog_loader.timings.update(deferred.timings)
+        self._rebuild_help_index()
+
+        # Connect SAM logger to bot's logging channel
+        try:
+            from commands.modules.sam import bridge as sam_bridge
+            sam_bridge.connect_log_consumer(self)
+            sam_bridge.connect_metrics()
+            logger.info("🔗 SAM logging bridge connected.")
+        except Exception as e:
+            logger.error(f"❌ Failed to connect SAM logging bridge: {e}")
+        self.startup_phases["deferred cogs"] = time.perf_counter() - phase_start
+
+    async def close(self):
+        # Deliver queued SAM log actions while the HTTP session is still open
+        sam_logging = sys.modules.get("commands.modules.sam.public.logging_api")
+        if sam_logging is not None:
+            await sam_logging.shutdown()
+        await self.dm_outbox.shutdown()
+        await super().close()
+
+    async def wait_for_deferred_cogs(self):
+        """Wait until the background-loaded cogs are in place."""
+        if self._deferred_cogs_task is not None:
+            await asyncio.shield(self._deferred_cogs_task)
+
+    def _rebuild_help_index(self):
+        # Build the help menu's command index once every cog is in place
+        try:
+            from commands.help_menu import rebuild_help_index
+            rebuild_help_index(self)
+        except Exception as e:
+            logger.warning(f"Failed to build help index: {e}")
+
+    async def _init_main_database(self):
         try:
             from utils.database_init import initialize_all_databases
-            if initialize_all_databases():
+            if await asyncio.to_thread(initialize_all_databases):
                 logger.info("🗄️ Database initialization completed")
             else:
                 logger.warning("⚠️ Database initialization had issues")
         except Exception as e:
             logger.error(f"❌ Database initialization failed: {e}")
 
-        # Initialize SAM module's database
+    async def _init_sam_database(self):
         try:
             # Import models first to ensure they are registered with SQLModel
             from commands.modules.sam.features.warnings.models import Warn
+            from commands.modules.sam.features.warnings import migrations  # noqa - registers migrations
             from commands.modules.sam.internal.database import init_db
             # Create database tables
             await init_db()
             logger.info("✅ SAM module database initialized")
         except Exception as e:
             logger.error(f"❌ SAM module database initialization failed: {e}", exc_info=True)
-        
-        # Load all cogs
-        for cog in COGS_TO_LOAD:
-            try:
-                await self.load_extension(cog)
-                logger.info(f"Loaded cog: {cog}")
-            except Exception as e:
-                logger.warning(f"Failed to load cog {cog}: {e}")
-                
-        # Connect SAM logger to bot's logging channel
-        try:
-            sam_bridge.connect_log_consumer(self)
-            logger.info("🔗 SAM logging bridge connected.")
-        except Exception as e:
-            logger.error(f"❌ Failed to connect SAM logging bridge: {e}")
 
 bot = CodeVerseBot()
 
 @bot.event
 async def on_ready():
+    # Cold start to first READY (on_ready fires again after reconnects)
+    if "ready" not in bot.startup_phases:
+        bot.startup_phases["ready"] = time.perf_counter() - bot._boot_perf
+        logger.info(f"⏱️ Ready {bot.startup_phases['ready']:.2f}s after start")
+        if import_profile.is_enabled():
+            logger.info("Slowest imports:\n%s", import_profile.format_report())
+
     if bot.user:
         logger.info(f"Logged in as {bot.user} (ID: {bot.user.id}) [Instance: {INSTANCE_ID}]")
     else:
@@ -192,6 +333,13 @@ async def on_ready():
         logger.info("✅ Bot status set successfully")
     except Exception as e:
         logger.warning(f"⚠️ Failed to set bot status: {e}")
+
+    # One-shot startup work: on_ready fires again after every gateway reconnect,
+    # and the server sweep and slash sync only need to run once per process.
+    if bot.startup_complete:
+        logger.info("🔁 Reconnected to the gateway; skipping startup sweep and command sync")
+        return
+    bot.startup_complete = True
     
     # Security check: Ensure bot is only in authorized servers
     unauthorized_servers = []
@@ -226,7 +374,10 @@ async def on_ready():
     # Log authorized servers the bot is in
     for guild in bot.guilds:
         if guild.id in AUTHORIZED_SERVERS:
-            logger.info(f"✅ Bot is operating in authorized server: {guild.name} (ID: {guild.id})")    # Sync slash commands
+            logger.info(f"✅ Bot is operating in authorized server: {guild.name} (ID: {guild.id})")
+
+    # Sync slash commands (deferred cogs must be registered first)
+    await bot.wait_for_deferred_cogs()
     try:
         # Sync to authorized guilds the bot is actually in. Syncing to a guild
         # the bot is not a member of (or lacks access to) raises 403/50001
@@ -239,10 +390,12 @@ async def on_ready():
                 )
                 continue
             try:
-                guild = discord.Object(id=guild_id)
-                bot.tree.copy_global_to(guild=guild)
-                guild_synced = await bot.tree.sync(guild=guild)
-                logger.info(f"Synced {len(guild_synced)} commands to guild {guild_id}")
+                # Only hits the API when the serialized tree changed since the last sync
+                synced_count = await sync_guild_if_changed(bot, guild_id)
+                if synced_count is None:
+                    logger.info(f"Slash commands for guild {guild_id} unchanged; sync skipped")
+                else:
+                    logger.info(f"Synced {synced_count} commands to guild {guild_id}")
             except Exception as e:
                 logger.warning(f"Failed to sync commands to guild {guild_id}: {e}")
     except Exception as e:
@@ -283,6 +436,9 @@ async def on_message(message):
     """Process messages and check for prefix commands in authorized servers only"""
     if message.author.bot:
         return
+
+    # Hand the message to the cogs subscribed to its channel/guild
+    bot.message_router.dispatch(message)
     
     # Block prefix commands in unauthorized servers
     if message.guild and message.guild.id not in AUTHORIZED_SERVERS:
@@ -300,17 +456,24 @@ async def on_message(message):
             logger.warning(f"Prefix command blocked in unauthorized server: {message.guild.name} (ID: {message.guild.id})")
         return
     
+    # Plain chat can't match a prefix; skip building a Context for it
+    if not _may_be_command(bot, message):
+        return
+
     # Process commands normally in authorized servers
     await bot.process_commands(message)
 
 def cleanup():
     """Run cleanup tasks before the bot process exits."""
-    # Disconnect SAM logger
-    try:
-        sam_bridge.disconnect_log_consumer()
-        logger.info("🔌 SAM logging bridge disconnected.")
-    except Exception as e:
-        logger.error(f"❌ Failed to disconnect SAM logging bridge: {e}")
+    # Disconnect SAM logger (only if SAM was ever loaded)
+    sam_bridge = sys.modules.get("commands.modules.sam.bridge")
+    if sam_bridge is not None:
+        try:
+            sam_bridge.disconnect_log_consumer()
+            sam_bridge.disconnect_metrics()
+            logger.info("🔌 SAM logging bridge disconnected.")
+        except Exception as e:
+            logger.error(f"❌ Failed to disconnect SAM logging bridge: {e}")
     
     # Clean up the instance lock file
     try:
@@ -368,15 +531,28 @@ async def main():
             atexit.register(_cleanup)
         except Exception as e:
             logger.warning(f"Instance lock handling failed: {e}")
-    # Start lightweight keep-alive server (optional)
-    try:
-        from utils.keep_alive import keep_alive
-        keep_alive()
-    except Exception as e:
-        logger.warning(f"Keep-alive server failed to start: {e}")
-    
+    # Warm heavy third-party imports in parallel with login/gateway handshake
+    import_profile.preload(PRELOAD_MODULES)
+
     async with bot:
-        await bot.start(TOKEN)
+        # Health/metrics server on the bot's own loop (optional)
+        health_server = None
+        try:
+            from utils.health_server import HealthServer
+            health_server = HealthServer(bot)
+            await health_server.start()
+        except Exception as e:
+            health_server = None
+            logger.warning(f"Health server failed to start: {e}")
+        try:
+            await bot.start(TOKEN)
+        finally:
+            if health_server is not None:
+                await health_server.stop()
+            # Close pooled SAM connections (checkpoints the SQLite WAL)
+            sam_database = sys.modules.get("commands.modules.sam.internal.database")
+            if sam_database is not None:
+                await sam_database.dispose_engine()
 
 if __name__ == "__main__":
     try:
@@ -4,10 +4,10 @@ from discord import app_commands  # type: ignore[import-not-found]
 import asyncio
 import time
 import logging
-from collections import defaultdict
 from typing import Optional
 
 from utils.helpers import register_mod_action, discard_mod_action
+from utils.rate_limit import rate_limit
 
 logger = logging.getLogger(__name__)
 
@@ -16,25 +16,10 @@ class AdvancedModeration(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        # Rate limiting for safety
-        self.command_cooldowns = defaultdict(list)
-        
-    def _check_rate_limit(self, user_id: int, command: str, max_uses: int = 5, window: int = 60) -> bool:
-        """Check if user is rate limited for a command (safety mechanism)"""
-        now = time.time()
-        user_commands = self.command_cooldowns[f"{user_id}_{command}"]
-        
-        # Remove old entries
-        user_commands[:] = [cmd_time for cmd_time in user_commands if now - cmd_time < window]
-        
-        if len(user_commands) >= max_uses:
-            return False  # Rate limited
-        
-        user_commands.append(now)
-        return True
 
     @commands.hybrid_command(name="tempban")
     @commands.has_permissions(ban_members=True)
+    @rate_limit("tempban", 3, 300)  # Safety: 3 tempbans per 5 minutes
     @app_commands.describe(
         member="Member to temporarily ban",
         duration="Ban duration in minutes (max 10080 = 7 days)",
@@ -43,10 +28,6 @@ class AdvancedModeration(commands.Cog):
     async def tempban(self, ctx, member: discord.Member, duration: int, *, reason: str = "No reason provided"):
         """Temporarily ban a member (max 7 days for safety)"""
         # Safety checks
-        if not self._check_rate_limit(ctx.author.id, "tempban", 3, 300):  # 3 tempbans per 5 minutes
-            await ctx.send("❌ Rate limit: You can only use tempban 3 times per 5 minutes.", ephemeral=True)
-            return
-            
         if duration > 10080:  # Max 7 days
             await ctx.send("❌ Maximum tempban duration is 7 days (10080 minutes)", ephemeral=True)
             return
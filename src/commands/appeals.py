@@ -34,6 +34,8 @@ from utils.helpers import (
     safe_send,
     sanitize_mentions,
 )
+from utils.dm_outbox import Priority
+from utils.memory_diagnostics import register_cache, unregister_prefix
 
 
 def _appeals_footer_text(guild_name: str | None = None) -> str:
@@ -676,7 +678,6 @@ class Appeals(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        init_db()
         self._timeout_dedupe_cache = {}  # {(user_id, guild_id, action): timestamp} - prevents double DM
         self._ban_event_handled = (
             set()
@@ -685,9 +686,16 @@ class Appeals(commands.Cog):
         # on_member_update listener can log the correct source instead of
         # classifying them as manual removals. {(guild_id, user_id): (appeal_id, timestamp)}
         self._pending_appeal_removals: dict[tuple[int, int], tuple[int, float]] = {}
-        self._ensure_appeal_schema()
+        register_cache("appeals.timeout_dedupe", lambda: self._timeout_dedupe_cache)
+        register_cache("appeals.ban_events_handled", lambda: self._ban_event_handled)
+        register_cache("appeals.pending_removals", lambda: self._pending_appeal_removals)
         self.bot.loop.create_task(self._restore_review_dashboards())
 
+    async def cog_load(self):
+        # Blocking SQLite setup runs off the event loop during startup.
+        await asyncio.to_thread(init_db)
+        await asyncio.to_thread(self._ensure_appeal_schema)
+
     def _ensure_appeal_schema(self):
         try:
             conn = sqlite3.connect(DATABASE_NAME)
@@ -2001,22 +2009,37 @@ class Appeals(commands.Cog):
                 disabled_reason=disabled_reason,
             )
 
-            await user.send(view=view)
-            dm_success = True
-            logger.info(
-                "Sent appeal dashboard to %s (%s) for %s in %s",
+            # Delivered through the shared outbox, ahead of welcome DMs
+            result = await self.bot.dm_outbox.send(
                 user,
-                user.id,
-                action_type,
-                guild.name,
-            )
+                kind="appeal_form",
+                priority=Priority.MODERATION,
+                dedupe_key=("appeal_form", user.id, guild.id, action_type),
+                view=view,
+            )
+            if result.delivered:
+                dm_success = True
+                logger.info(
+                    "Sent appeal dashboard to %s (%s) for %s in %s",
+                    user,
+                    user.id,
+                    action_type,
+                    guild.name,
+                )
 
-            # Log success to appeals channel
-            await self._log_dm_success(
-                user, guild, action_type, reason or "No reason provided"
-            )
+                # Log success to appeals channel
+                await self._log_dm_success(
+                    user, guild, action_type, reason or "No reason provided"
+                )
+            elif result.error is not None:
+                dm_error = _classify_dm_error(result.error)
+            else:
+                dm_error = result.reason
         except Exception as e:
             dm_error = _classify_dm_error(e)
+
+        # Log DM failure to appeals channel
+        if not dm_success and dm_error:
             logger.warning(
                 "[Appeals] Failed to DM %s (%s)\nReason: %s\nGuild: %s\nAction: Timeout Appeal Dashboard",
                 user,
@@ -2024,9 +2047,6 @@ class Appeals(commands.Cog):
                 dm_error,
                 guild.name,
             )
-
-        # Log DM failure to appeals channel
-        if not dm_success and dm_error:
             await self._log_dm_failure(
                 user, guild, action_type, reason or "No reason provided", dm_error
             )
@@ -2788,6 +2808,7 @@ class Appeals(commands.Cog):
 
     def cog_unload(self):
         """Cleanup when cog is unloaded"""
+        unregister_prefix("appeals.")
         self._timeout_dedupe_cache.clear()
         self._ban_event_handled.clear()
 
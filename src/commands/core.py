@@ -1,10 +1,12 @@
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timezone
 from typing import Optional
 from utils.json_store import get_guild_prefix, set_guild_prefix
-from commands.help_menu import send_help_menu
+from utils.command_sync import clear_hashes, sync_guild_if_changed
+from commands.help_menu import send_help_menu, rebuild_help_index
 from config import REPORT_CHANNEL_ID
 
 DEFAULT_PREFIX = '?'
@@ -28,11 +30,17 @@ class Core(commands.Cog):
     @commands.command(name="sync", hidden=True)
     @commands.is_owner()
     async def sync(self, ctx: commands.Context):
-        """Syncs the command tree."""
+        """Syncs the command tree (forcing a guild resync as well)."""
         msg = await ctx.reply("Syncing...", mention_author=False)
         try:
             synced = await self.bot.tree.sync()
-            await msg.edit(content=f"Synced {len(synced)} commands globally.")
+            content = f"Synced {len(synced)} commands globally."
+            # Forget the stored tree hashes so guild syncs are not skipped
+            await asyncio.to_thread(clear_hashes)
+            if ctx.guild is not None:
+                guild_synced = await sync_guild_if_changed(self.bot, ctx.guild.id)
+                content += f" Synced {guild_synced} commands to this server."
+            await msg.edit(content=content)
         except Exception as e:
             await msg.edit(content=f"Sync failed: {e}")
 
@@ -60,6 +68,8 @@ class Core(commands.Cog):
             "logging": "commands.logging",
             "logging_cog": "commands.logging",
             "diagnostics": "commands.diagnostics",
+            "stats": "commands.guild_stats",
+            "guild_stats": "commands.guild_stats",
             "spam": "commands.spam_catch",
             "spam_catch": "commands.spam_catch",
             "roles": "commands.roles",
@@ -81,6 +91,8 @@ class Core(commands.Cog):
                 # If not loaded, try to load it
                 await self.bot.load_extension(cog_path)
                 await msg.edit(content=f"Successfully loaded cog `{cog_name}` ({cog_path})")
+            # Commands may have been added, removed or changed.
+            rebuild_help_index(self.bot)
         except commands.ExtensionNotFound:
             await msg.edit(content=f"Cog `{cog_name}` not found. Path tried: {cog_path}")
         except commands.ExtensionFailed as e:
@@ -1,16 +1,29 @@
+import asyncio
+import io
 import os
+import sys
 import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timezone
 from pathlib import Path
 
+from utils import command_metrics, import_profile, memory_diagnostics
+from utils.loop_monitor import get_loop_monitor
+from utils.sampling_profiler import MAX_SECONDS as PROFILE_MAX_SECONDS, get_profiler
+from utils.rate_limit import rate_limiters
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
 class Diagnostics(commands.Cog):
     """Bot diagnostics and health monitoring."""
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-    @commands.command(name="diag", help="Show comprehensive bot diagnostics")
+    @commands.group(name="diag", invoke_without_command=True, help="Show comprehensive bot diagnostics")
     async def diag(self, ctx: commands.Context):
         """Show bot diagnostics and health status."""
         uptime = datetime.now(timezone.utc) - getattr(self.bot, 'start_time', datetime.now(timezone.utc))
@@ -36,6 +49,16 @@ class Diagnostics(commands.Cog):
             inline=True
         )
         
+        # Guild statistics (maintained incrementally by the GuildStats cog)
+        stats_cog = self.bot.get_cog("GuildStats")
+        if stats_cog is not None:
+            totals = stats_cog.totals()
+            value = f"**Members:** {totals.members:,} ({totals.bots:,} bots)\n**Online:** {totals.online:,}"
+            if ctx.guild is not None:
+                here = stats_cog.get(ctx.guild)
+                value += f"\n**This server:** {here.members:,} members • {here.online:,} online"
+            embed.add_field(name="Guild Statistics", value=value, inline=True)
+
         # Database Status
         db_files = []
         data_dir = Path("data")
@@ -43,12 +66,34 @@ class Diagnostics(commands.Cog):
             for db_file in data_dir.glob("*.db"):
                 db_files.append(db_file.name)
         
+        db_value = f"**Active DBs:** {len(db_files)}\n**Files:** {', '.join(db_files) if db_files else 'None'}"
+        # SAM's pool (only if the warnings module has been loaded)
+        sam_database = sys.modules.get("commands.modules.sam.internal.database")
+        if sam_database is not None:
+            pool = sam_database.pool_stats()
+            if "size" in pool:
+                db_value += (
+                    f"\n**SAM pool ({pool['dialect']}):** {pool['checked_out']} in use • "
+                    f"{pool['checked_in']} idle • {max(pool['overflow'], 0)} overflow / {pool['size']}"
+                )
         embed.add_field(
             name="Database Status",
-            value=f"**Active DBs:** {len(db_files)}\n**Files:** {', '.join(db_files) if db_files else 'None'}",
+            value=db_value,
             inline=False
         )
         
+        # Rate limiter metrics (shared utils.rate_limit registry)
+        limiter_lines = [
+            f"**{name}:** {lim.allowed} allowed • {lim.denied} denied • {len(lim)} keys"
+            for name, lim in sorted(rate_limiters().items())
+        ]
+        if limiter_lines:
+            embed.add_field(
+                name="Rate Limits",
+                value="\n".join(limiter_lines)[:1024],
+                inline=False
+            )
+
         # Environment Check
         required_vars = ['DISCORD_TOKEN', 'GUILD_ID']
         missing_vars = [var for var in required_vars if not os.getenv(var)]
@@ -62,5 +107,269 @@ class Diagnostics(commands.Cog):
         embed.set_footer(text=f"Bot Version: Production | Instance: {os.getenv('INSTANCE_ID', 'prod')}")
         await ctx.reply(embed=embed, mention_author=False)
 
+    @diag.command(name="perf", help="Show per-command latency percentiles and errors")
+    async def diag_perf(self, ctx: commands.Context, limit: int = 15):
+        """Per-command p50/p95/p99 latency, errors, slash acknowledgement times and blocking calls."""
+        stats = [s for s in command_metrics.command_stats().values() if s.latency.count or s.ack.count]
+        monitor = get_loop_monitor()
+        if not stats and not monitor.blocking_sites:
+            await ctx.reply("No command timings recorded yet.", mention_author=False)
+            return
+        limit = max(1, min(limit, 25))
+
+        def ms(value):
+            return "-" if value is None else f"{value * 1000:.0f}"
+
+        # Slowest (by p95) first
+        stats.sort(key=lambda s: s.latency.percentile(95) or 0, reverse=True)
+        rows = [f"{'command':<18}{'n':>5}{'p50':>6}{'p95':>6}{'p99':>6}{'err':>4}"]
+        for s in stats[:limit]:
+            rows.append(
+                f"{s.name[:17]:<18}{s.latency.count:>5}{ms(s.latency.percentile(50)):>6}"
+                f"{ms(s.latency.percentile(95)):>6}{ms(s.latency.percentile(99)):>6}{s.errors:>4}"
+            )
+
+        embed = discord.Embed(
+            title="Command Performance",
+            description=f"Latency in ms over the last {command_metrics.RECENT_SAMPLES} runs per command",
+            color=0x0000ff,
+            timestamp=datetime.now(timezone.utc)
+        )
+        if stats:
+            embed.add_field(name="Execution", value="```\n" + "\n".join(rows)[:1000] + "\n```", inline=False)
+
+        # Interaction acknowledgement (3s deadline)
+        acked = [s for s in stats if s.ack.count or s.ack_missed]
+        if acked:
+            acked.sort(key=lambda s: (s.ack_missed, s.ack.percentile(95) or 0), reverse=True)
+            ack_rows = [f"{'command':<18}{'n':>5}{'p50':>6}{'p95':>6}{'p99':>6}{'late':>5}"]
+            for s in acked[:limit]:
+                ack_rows.append(
+                    f"{s.name[:17]:<18}{s.ack.count:>5}{ms(s.ack.percentile(50)):>6}"
+                    f"{ms(s.ack.percentile(95)):>6}{ms(s.ack.percentile(99)):>6}{s.ack_missed:>5}"
+                )
+            embed.add_field(
+                name="Slash Acknowledgement",
+                value="```\n" + "\n".join(ack_rows)[:1000] + "\n```",
+                inline=False
+            )
+
+        # Code that blocked the event loop (captured by the loop watchdog)
+        sites = monitor.top_blocking_sites(5)
+        if sites:
+            block_rows = [
+                f"{site.count}x {site.total * 1000:.0f} ms (max {site.max * 1000:.0f}) {site.site}"
+                for site in sites
+            ]
+            embed.add_field(
+                name=f"Blocking Calls (>{monitor.block_threshold * 1000:.0f} ms)",
+                value="```\n" + "\n".join(block_rows)[:1000] + "\n```",
+                inline=False
+            )
+
+        router = getattr(self.bot, "message_router", None)
+        subscribers = [s for s in router.subscriber_stats() if s.calls] if router is not None else []
+        if subscribers:
+            route_rows = [
+                f"{s.name}: {s.calls}x avg {s.mean * 1000:.1f} ms max {s.max * 1000:.0f} ms"
+                + (f" ({s.errors} err)" if s.errors else "")
+                for s in subscribers[:8]
+            ]
+            embed.add_field(
+                name=f"Message Routing ({router.routed}/{router.received} routed)",
+                value="```\n" + "\n".join(route_rows)[:1000] + "\n```",
+                inline=False
+            )
+
+        total = sum(s.latency.count for s in stats)
+        errors = sum(s.errors for s in stats)
+        embed.set_footer(text=f"{total} invocations • {errors} errors • {len(stats)} commands")
+        await ctx.reply(embed=embed, mention_author=False)
+
+    @diag.command(name="memory", help="Show process memory and the size of every registered cache")
+    async def diag_memory(self, ctx: commands.Context):
+        """Entry counts of registered in-memory caches plus RSS and tracemalloc totals."""
+        embed = discord.Embed(
+            title="Memory",
+            color=0x0000ff,
+            timestamp=datetime.now(timezone.utc)
+        )
+        process = []
+        if resource is not None:
+            # ru_maxrss is in KiB on Linux
+            process.append(f"**Peak RSS:** {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+        if memory_diagnostics.is_tracing():
+            current, peak = memory_diagnostics.traced_memory()
+            process.append(f"**Traced:** {current / 1048576:.1f} MiB (peak {peak / 1048576:.1f} MiB)")
+        else:
+            process.append("**tracemalloc:** off")
+        embed.add_field(name="Process", value="\n".join(process), inline=False)
+
+        sizes = memory_diagnostics.cache_sizes()
+        if sizes:
+            rows = [f"{'cache':<34}{'entries':>8}{'KiB':>7}"]
+            for cache in sizes:
+                rows.append(f"{cache.name[:33]:<34}{cache.entries:>8}{cache.shallow_bytes / 1024:>7.1f}")
+            embed.add_field(name="Caches", value="```\n" + "\n".join(rows)[:1000] + "\n```", inline=False)
+        embed.set_footer(text="KiB is the container itself, not its contents")
+        await ctx.reply(embed=embed, mention_author=False)
+
+    @diag.command(name="tracemalloc", help="Trace allocations: start, snapshot, diff or stop")
+    @commands.is_owner()
+    async def diag_tracemalloc(self, ctx: commands.Context, action: str = "status", limit: int = 10):
+        """Start/stop tracemalloc, take a baseline snapshot or diff against it."""
+        action = action.lower()
+        limit = max(1, min(limit, 25))
+
+        if action == "start":
+            started = memory_diagnostics.start_tracing()
+            await ctx.reply(
+                "tracemalloc started. Run `?diag tracemalloc snapshot` to take a baseline."
+                if started else "tracemalloc is already running.",
+                mention_author=False
+            )
+            return
+        if action == "stop":
+            memory_diagnostics.stop_tracing()
+            await ctx.reply("tracemalloc stopped and the baseline discarded.", mention_author=False)
+            return
+        if action not in ("snapshot", "diff"):
+            if not memory_diagnostics.is_tracing():
+                state = "off"
+            else:
+                current, peak = memory_diagnostics.traced_memory()
+                baseline = "baseline taken" if memory_diagnostics.has_baseline() else "no baseline"
+                state = f"on, {current / 1048576:.1f} MiB traced (peak {peak / 1048576:.1f} MiB), {baseline}"
+            await ctx.reply(
+                f"tracemalloc is {state}.\nUsage: `?diag tracemalloc <start|snapshot|diff|stop> [limit]`",
+                mention_author=False
+            )
+            return
+        if not memory_diagnostics.is_tracing():
+            await ctx.reply("tracemalloc is not running; use `?diag tracemalloc start` first.", mention_author=False)
+            return
+
+        # Snapshots walk every traced block, so keep them off the event loop.
+        if action == "snapshot":
+            stats = await asyncio.to_thread(memory_diagnostics.take_baseline)
+            title = "Allocation Snapshot (baseline)"
+            rows = [f"{size / 1024:>9.1f} KiB {count:>7}  {site[-48:]}" for site, size, count in stats[:limit]]
+        else:
+            if not memory_diagnostics.has_baseline():
+                await ctx.reply("No baseline; run `?diag tracemalloc snapshot` first.", mention_author=False)
+                return
+            stats = await asyncio.to_thread(memory_diagnostics.diff_baseline, limit)
+            title = "Allocation Growth Since Baseline"
+            rows = [
+                f"{size_diff / 1024:>+9.1f} KiB {count_diff:>+7}  {site[-48:]}"
+                for site, size_diff, size, count_diff in stats
+            ]
+
+        embed = discord.Embed(
+            title=title,
+            description="```\n" + ("\n".join(rows) or "No allocations traced.")[:4000] + "\n```",
+            color=0x0000ff,
+            timestamp=datetime.now(timezone.utc)
+        )
+        await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(name="startup", hidden=True, help="Show the cold-start timing profile")
+    @commands.is_owner()
+    async def startup(self, ctx: commands.Context):
+        """Show startup phases and per-cog import/setup times."""
+        phases = getattr(self.bot, "startup_phases", {})
+        loader = getattr(self.bot, "cog_loader", None)
+        if loader is None:
+            await ctx.reply("No startup profile recorded.", mention_author=False)
+            return
+
+        embed = discord.Embed(
+            title="Startup Profile",
+            description=(
+                f"**Cogs:** {len(loader.timings)} in {loader.wall_time * 1000:.0f} ms "
+                f"(sequential sum {sum(t.total for t in loader.timings.values()) * 1000:.0f} ms)"
+            ),
+            color=0x0000ff,
+            timestamp=datetime.now(timezone.utc)
+        )
+        if phases:
+            embed.add_field(
+                name="Phases",
+                value="\n".join(f"**{name}:** {seconds * 1000:.0f} ms" for name, seconds in phases.items()),
+                inline=False
+            )
+
+        # Slowest first; times in ms
+        rows = [f"{'cog':<28}{'start':>6}{'import':>7}{'setup':>7}"]
+        for t in sorted(loader.timings.values(), key=lambda t: t.total, reverse=True):
+            name = t.name.removeprefix("commands.")[:26] + ("" if t.ok else " !")
+            rows.append(f"{name:<28}{t.started * 1000:>6.0f}{t.import_time * 1000:>7.0f}{t.setup_time * 1000:>7.0f}")
+        embed.add_field(name="Cogs (ms)", value="```\n" + "\n".join(rows)[:1000] + "\n```", inline=False)
+
+        extra = []
+        if resource is not None:
+            # ru_maxrss is in KiB on Linux
+            extra.append(f"**Peak RSS:** {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+        extra.append(f"**Modules loaded:** {len(sys.modules)}")
+        embed.add_field(name="Process", value="\n".join(extra), inline=False)
+
+        if import_profile.is_enabled():
+            rows = [f"{cumulative * 1000:>7.1f} {own * 1000:>6.1f}  {name[:32]}" for name, own, cumulative in import_profile.report(12)]
+            embed.add_field(
+                name="Slowest Imports (cumulative / self ms)",
+                value="```\n" + "\n".join(rows)[:1000] + "\n```",
+                inline=False
+            )
+
+        failed = [t for t in loader.timings.values() if not t.ok]
+        if failed:
+            embed.add_field(
+                name="Failed",
+                value="\n".join(f"`{t.name}`: {t.error}" for t in failed)[:1024],
+                inline=False
+            )
+        await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(name="profile", hidden=True, help="Sample the live bot's call stacks for a few seconds")
+    @commands.is_owner()
+    async def profile(self, ctx: commands.Context, seconds: float = 10.0):
+        """Run the sampling profiler and attach flamegraph-compatible collapsed stacks."""
+        profiler = get_profiler()
+        if profiler.running:
+            await ctx.reply("A profile is already running.", mention_author=False)
+            return
+        seconds = max(1.0, min(seconds, PROFILE_MAX_SECONDS))
+        status = await ctx.reply(f"Profiling the event loop for {seconds:.0f}s...", mention_author=False)
+        result = await profiler.run(seconds)
+
+        embed = discord.Embed(
+            title="Profile",
+            description=(
+                f"**Samples:** {result.samples} every {result.interval * 1000:.0f} ms over {result.duration:.1f}s\n"
+                f"**Loop busy:** {result.busy_ratio:.0%} ({result.samples - result.idle} busy, {result.idle} idle)"
+            ),
+            color=0x0000ff,
+            timestamp=datetime.now(timezone.utc)
+        )
+        top = result.top_functions(12)
+        if top:
+            busy = max(result.samples - result.idle, 1)
+            rows = [f"{own / busy:>5.0%} {total / busy:>5.0%}  {name[-40:]}" for name, own, total in top]
+            embed.add_field(
+                name="Hottest Functions (self / total of busy samples)",
+                value="```\n" + "\n".join(rows)[:1000] + "\n```",
+                inline=False
+            )
+        else:
+            embed.add_field(name="Hottest Functions", value="The loop was idle for the whole window.", inline=False)
+        embed.set_footer(text="Attachment: collapsed stacks for flamegraph.pl / speedscope")
+
+        file = discord.File(
+            io.BytesIO(result.collapsed().encode("utf-8")),
+            filename=f"profile-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.folded",
+        )
+        await status.delete()
+        await ctx.reply(embed=embed, file=file, mention_author=False)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Diagnostics(bot))
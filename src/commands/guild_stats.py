@@ -0,0 +1,207 @@
+"""Incrementally maintained per-guild statistics.
+
+Member, bot, online, channel and role counts are kept up to date from
+gateway events so ``serverinfo``, ``?diag`` and dashboards can read them in
+O(1) instead of walking ``guild.members`` on every call. A periodic
+reconciliation pass recounts everything from the cache and logs any drift.
+
+Note: online counts only move when the presences intent is enabled; without
+it Discord sends no presence updates and every cached member is offline.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import discord
+from discord.ext import commands
+
+logger = logging.getLogger("codeverse.guild_stats")
+
+RECONCILE_INTERVAL = 15 * 60  # seconds
+
+
+@dataclass(slots=True)
+class GuildCounters:
+    """Cached counters for one guild."""
+
+    members: int = 0
+    bots: int = 0
+    online: int = 0
+    text_channels: int = 0
+    voice_channels: int = 0
+    categories: int = 0
+    roles: int = 0
+
+    @property
+    def humans(self) -> int:
+        return self.members - self.bots
+
+    @classmethod
+    def from_guild(cls, guild: discord.Guild) -> "GuildCounters":
+        counters = cls()
+        for member in guild.members:
+            counters.members += 1
+            if member.bot:
+                counters.bots += 1
+            if member.status != discord.Status.offline:
+                counters.online += 1
+        for channel in guild.channels:
+            counters.count_channel(channel, 1)
+        counters.roles = max(len(guild.roles) - 1, 0)  # Exclude @everyone
+        return counters
+
+    def count_channel(self, channel: discord.abc.GuildChannel, delta: int) -> None:
+        if isinstance(channel, discord.TextChannel):
+            self.text_channels += delta
+        elif isinstance(channel, discord.VoiceChannel):
+            self.voice_channels += delta
+        elif isinstance(channel, discord.CategoryChannel):
+            self.categories += delta
+
+
+class GuildStats(commands.Cog):
+    """Per-guild statistics tracker (no commands; read via ``get``)."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._stats: dict[int, GuildCounters] = {}
+        self.reconcile_drift = 0
+        self._reconcile_task = self.bot.loop.create_task(self._reconcile_loop())
+
+    def cog_unload(self):
+        self._reconcile_task.cancel()
+
+    # ------------------------------------------------------------------
+    # Read API
+    # ------------------------------------------------------------------
+    def get(self, guild: discord.Guild) -> GuildCounters:
+        """Return the counters for ``guild``, building them on first use."""
+        counters = self._stats.get(guild.id)
+        if counters is None:
+            counters = GuildCounters.from_guild(guild)
+            self._stats[guild.id] = counters
+        return counters
+
+    def totals(self) -> GuildCounters:
+        """Counters summed across every tracked guild."""
+        total = GuildCounters()
+        for counters in self._stats.values():
+            for name in GuildCounters.__dataclass_fields__:
+                setattr(total, name, getattr(total, name) + getattr(counters, name))
+        return total
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+    def reconcile(self, guild: discord.Guild) -> int:
+        """Recount ``guild`` from the cache; return the total absolute drift."""
+        fresh = GuildCounters.from_guild(guild)
+        old = self._stats.get(guild.id)
+        self._stats[guild.id] = fresh
+        if old is None:
+            return 0
+        drift = sum(
+            abs(getattr(fresh, name) - getattr(old, name))
+            for name in GuildCounters.__dataclass_fields__
+        )
+        if drift:
+            logger.info("Guild stats drift corrected for guild_id=%s (off by %s)", guild.id, drift)
+        return drift
+
+    async def _reconcile_loop(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            await asyncio.sleep(RECONCILE_INTERVAL)
+            try:
+                for guild in list(self.bot.guilds):
+                    self.reconcile_drift += self.reconcile(guild)
+                    # Yield between guilds so large recounts don't stall the loop.
+                    await asyncio.sleep(0)
+            except Exception as e:
+                logger.warning("Guild stats reconciliation failed: %s", e)
+
+    def _tracked(self, guild: Optional[discord.Guild]) -> Optional[GuildCounters]:
+        # Guilds that were never read are built lazily on first ``get``.
+        return self._stats.get(guild.id) if guild is not None else None
+
+    # ------------------------------------------------------------------
+    # Event listeners
+    # ------------------------------------------------------------------
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Fires again after reconnects: rebuild from the fresh cache.
+        for guild in self.bot.guilds:
+            self.reconcile(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        self.reconcile(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        self.reconcile(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._stats.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        counters = self._tracked(member.guild)
+        if counters is None:
+            return
+        counters.members += 1
+        if member.bot:
+            counters.bots += 1
+        if member.status != discord.Status.offline:
+            counters.online += 1
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        counters = self._tracked(member.guild)
+        if counters is None:
+            return
+        counters.members -= 1
+        if member.bot:
+            counters.bots -= 1
+        if member.status != discord.Status.offline:
+            counters.online -= 1
+
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: discord.Member, after: discord.Member):
+        counters = self._tracked(after.guild)
+        if counters is None:
+            return
+        was_online = before.status != discord.Status.offline
+        is_online = after.status != discord.Status.offline
+        if was_online != is_online:
+            counters.online += 1 if is_online else -1
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        counters = self._tracked(channel.guild)
+        if counters is not None:
+            counters.count_channel(channel, 1)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        counters = self._tracked(channel.guild)
+        if counters is not None:
+            counters.count_channel(channel, -1)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        counters = self._tracked(role.guild)
+        if counters is not None:
+            counters.roles += 1
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        counters = self._tracked(role.guild)
+        if counters is not None:
+            counters.roles -= 1
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(GuildStats(bot))
@@ -1,8 +1,13 @@
 """Dynamic, self-maintaining help menu for CodeVerse Bot.
 
-The help menu is built entirely from the bot's loaded command tree at
-render time, so new commands appear automatically once their cog is loaded.
-There is no manual command list to keep in sync.
+The help menu is built entirely from the bot's loaded command tree, so new
+commands appear automatically once their cog is loaded. There is no manual
+command list to keep in sync.
+
+Walking the tree and scanning every cog for slash commands is done once,
+into a :class:`CommandIndex`, after the cogs load (and again whenever an
+extension is loaded or reloaded via ``?load``). Rendered category pages are
+cached per (category, page, owner visibility) and served from memory.
 """
 
 import logging
@@ -14,6 +19,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from utils.rate_limit import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -194,18 +201,22 @@ def _slash_command_cogs(bot: commands.Bot) -> dict[str, str]:
     return result
 
 
-def build_categories(bot: commands.Bot, ctx) -> dict[str, list]:
+def _build_categories(
+    bot: commands.Bot,
+    is_owner: bool,
+    tree: dict[str, app_commands.Command],
+    slash_cogs: dict[str, str],
+) -> dict[str, list]:
     """Group every visible command into its display category.
 
     Returns an ordered dict of {category_label: [commands]} where each entry
     is either a commands.Command (prefix/hybrid) or a _SlashCommandInfo
     (slash-only). Every command appears exactly once.
     """
-    is_owner = _is_owner(ctx)
     categories: dict[str, list] = defaultdict(list)
 
     # Prefix + hybrid commands (hybrids carry .app_command and live here).
-    tree = _tree_commands(bot)
+    tree = dict(tree)
     registered_prefix_names: set[str] = set()
     for cmd in bot.commands:
         if not _is_visible_command(cmd, is_owner):
@@ -221,7 +232,6 @@ def build_categories(bot: commands.Bot, ctx) -> dict[str, list]:
     # Slash-only commands from the tree (hybrids were already popped above).
     # Subcommands of groups are skipped here they are listed inside the
     # group's detailed help instead, keeping each category list tidy.
-    slash_cogs = _slash_command_cogs(bot)
     for qname, app_cmd in tree.items():
         if getattr(app_cmd, "parent", None) is not None:
             continue  # subcommand of a group (shown via detail view)
@@ -241,6 +251,75 @@ def build_categories(bot: commands.Bot, ctx) -> dict[str, list]:
     return dict(sorted(result.items()))
 
 
+# ---------------------------------------------------------------------------
+# Cached command index
+# ---------------------------------------------------------------------------
+class CommandIndex:
+    """Snapshot of the categorized command tree plus rendered page cache."""
+
+    def __init__(self, bot: commands.Bot):
+        self.fingerprint = _cog_fingerprint(bot)
+        self.tree = _tree_commands(bot)
+        self.slash_cogs = _slash_command_cogs(bot)
+        self._categories = {
+            is_owner: _build_categories(bot, is_owner, self.tree, self.slash_cogs)
+            for is_owner in (False, True)
+        }
+        self.total_visible = _total_visible_count(bot, self.tree)
+        self._pages: dict[tuple[str, int, bool], discord.Embed] = {}
+
+    def categories(self, is_owner: bool) -> dict[str, list]:
+        return self._categories[is_owner]
+
+    def category_page(
+        self, bot: commands.Bot, label: str, page: int, is_owner: bool, prefix: str
+    ) -> discord.Embed:
+        """Rendered category page, built on first request and then reused."""
+        cmds = self._categories[is_owner].get(label, [])
+        page = max(0, min(page, _total_pages(cmds) - 1))
+        key = (label, page, is_owner)
+        embed = self._pages.get(key)
+        if embed is None:
+            embed = build_category_embed(bot, label, cmds, prefix, page)
+            self._pages[key] = embed
+        # Copy so the per-send timestamp never mutates the cached page.
+        embed = embed.copy()
+        embed.timestamp = datetime.now(timezone.utc)
+        return embed
+
+
+_index: Optional[CommandIndex] = None
+
+
+def _cog_fingerprint(bot: commands.Bot) -> tuple[int, ...]:
+    # Reloaded cogs are new instances, so their ids change.
+    return tuple(id(cog) for cog in bot.cogs.values())
+
+
+def rebuild_help_index(bot: commands.Bot) -> CommandIndex:
+    """(Re)build the command index; call after loading or reloading cogs."""
+    global _index
+    _index = CommandIndex(bot)
+    logger.debug(
+        "Help index rebuilt: %s commands in %s categories",
+        _index.total_visible,
+        len(_index.categories(False)),
+    )
+    return _index
+
+
+def get_help_index(bot: commands.Bot) -> CommandIndex:
+    """Return the cached index, rebuilding it if cogs changed behind our back."""
+    if _index is None or _index.fingerprint != _cog_fingerprint(bot):
+        return rebuild_help_index(bot)
+    return _index
+
+
+def build_categories(bot: commands.Bot, ctx) -> dict[str, list]:
+    """Cached {category_label: [commands]} for the invoking user's visibility."""
+    return get_help_index(bot).categories(_is_owner(ctx))
+
+
 def build_home_embed(
     bot: commands.Bot, categories: dict[str, list[commands.Command]], prefix: str
 ) -> discord.Embed:
@@ -353,7 +432,8 @@ def _perm_label(perm: str) -> str:
 def _format_cooldown(cmd: commands.Command) -> Optional[str]:
     """Return a short cooldown description if the command defines one."""
     for check in getattr(cmd, "checks", []) or []:
-        if isinstance(check, commands.Cooldown):
+        check = getattr(check, "rate_limiter", check)
+        if isinstance(check, (commands.Cooldown, RateLimiter)):
             per = check.per
             unit = "second"
             if per >= 3600:
@@ -413,17 +493,18 @@ def _normalize_command_name(name: str) -> str:
     return name.replace(" ", ".")
 
 
-def _total_visible_count(bot: commands.Bot) -> int:
+def _total_visible_count(bot: commands.Bot, tree: dict[str, app_commands.Command]) -> int:
     """Count of commands shown in the menu (top-level visible commands)."""
     seen: set[str] = set()
+    prefix_names = {c.name for c in bot.commands}
     for c in bot.commands:
         if not _is_visible_command(c, False):
             continue
         seen.add(c.qualified_name)
-    for app_cmd in _tree_commands(bot).values():
+    for app_cmd in tree.values():
         if getattr(app_cmd, "parent", None) is not None:
             continue
-        if app_cmd.name in {c.name for c in bot.commands}:
+        if app_cmd.name in prefix_names:
             continue
         if not _is_visible_command(app_cmd, False):
             continue
@@ -434,16 +515,17 @@ def _total_visible_count(bot: commands.Bot) -> int:
 def _find_command(bot: commands.Bot, name: str):
     """Find a command by (possibly qualified) name across prefix + slash."""
     name = _normalize_command_name(name)
+    index = get_help_index(bot)
     # Try dotted form first (tree-style keys), then the space form (the
     # natural prefix syntax, e.g. 'ls role' resolves via bot.get_command).
     for key in (name, name.replace(".", " ")):
         cmd = bot.get_command(key)
         if cmd is not None:
             return cmd
-        for app_cmd in _tree_commands(bot).values():
-            if app_cmd.qualified_name == key:
-                label = _cog_category(_slash_command_cogs(bot).get(key))
-                return _SlashCommandInfo(app_cmd, key, label)
+        app_cmd = index.tree.get(key)
+        if app_cmd is not None:
+            label = _cog_category(index.slash_cogs.get(key))
+            return _SlashCommandInfo(app_cmd, key, label)
     return None
 
 
@@ -499,7 +581,7 @@ def build_command_embed(
             lines = [f"`{s.name}` - {s.description or 'No description'}" for s in subs]
             embed.add_field(name="Subcommands", value="\n".join(lines), inline=False)
 
-    embed.set_footer(text=f"CodeVerse Bot - {_total_visible_count(bot)} total commands")
+    embed.set_footer(text=f"CodeVerse Bot - {get_help_index(bot).total_visible} total commands")
     return embed
 
 
@@ -624,12 +706,12 @@ class _PageButton(discord.ui.Button):
         view: HelpMenuView = self.view  # type: ignore[assignment]
         page = view.current_page + self.direction
         view.current_page = max(0, min(page, view.total_pages - 1))
-        embed = build_category_embed(
+        embed = get_help_index(view.bot).category_page(
             view.bot,
             view.current_label,
-            view.current_cmds,
-            view.prefix,
             view.current_page,
+            view.is_owner,
+            view.prefix,
         )
         await interaction.response.edit_message(embed=embed, view=view)
 
@@ -659,7 +741,9 @@ class _CategorySelect(discord.ui.Select):
         view.current_cmds = view.categories[label]
         view.current_page = 0
         view.total_pages = _total_pages(view.current_cmds)
-        embed = build_category_embed(view.bot, label, view.current_cmds, view.prefix, 0)
+        embed = get_help_index(view.bot).category_page(
+            view.bot, label, 0, view.is_owner, view.prefix
+        )
         await interaction.response.edit_message(embed=embed, view=view)
 
 
@@ -672,12 +756,14 @@ class HelpMenuView(discord.ui.View):
         categories: dict[str, list[commands.Command]],
         home_embed: discord.Embed,
         prefix: str,
+        is_owner: bool = False,
     ):
         super().__init__(timeout=180)
         self.bot = bot
         self.categories = categories
         self.home_embed = home_embed
         self.prefix = prefix
+        self.is_owner = is_owner
         self.current_label: Optional[str] = None
         self.current_cmds: list[commands.Command] = []
         self.current_page = 0
@@ -723,9 +809,9 @@ async def send_help_menu(
         return
 
     # Interactive menu
-    categories = build_categories(bot, ctx)
+    categories = get_help_index(bot).categories(is_owner)
     home_embed = build_home_embed(bot, categories, prefix)
-    view = HelpMenuView(bot, categories, home_embed, prefix)
+    view = HelpMenuView(bot, categories, home_embed, prefix, is_owner)
     if ctx.interaction:
         await ctx.interaction.response.send_message(embed=home_embed, view=view)
     else:
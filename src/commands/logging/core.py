@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 
 from utils.database import DATABASE_NAME
+from utils.memory_diagnostics import register_cache, unregister_prefix
 from utils.webhook_manager import WebhookManager
 from utils.embeds import create_success_embed, create_error_embed, create_info_embed
 from config import MAIN_GUILD_ID
@@ -42,13 +43,16 @@ class LoggingCog(MemberLogMixin, ChannelLogMixin, RoleLogMixin, ModerationLogMix
         # listeners can attribute logs to the real command invoker instead of
         # the bot (see ModerationLogMixin.register_command_action).
         self._pending_mod_actions: dict = {}
+        # Rebound when pruned, so register a getter rather than the dict
+        register_cache("logging.pending_mod_actions", lambda: self._pending_mod_actions)
         
         # Start log processing task
         self.log_task = asyncio.create_task(self.process_logs())
-        
-        # Create database tables if needed
-        self.setup_database()
-        
+
+    async def cog_load(self):
+        # Create database tables if needed (blocking SQLite, kept off the loop)
+        await asyncio.to_thread(self.setup_database)
+
     def setup_database(self):
         """Create database tables for logging if they don't exist"""
         try:
@@ -91,6 +95,7 @@ class LoggingCog(MemberLogMixin, ChannelLogMixin, RoleLogMixin, ModerationLogMix
     
     def cog_unload(self):
         """Cleanup when cog is unloaded"""
+        unregister_prefix("logging.")
         if self.log_task:
             self.log_task.cancel()
     
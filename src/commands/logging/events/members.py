@@ -231,13 +231,14 @@ class MemberLogMixin(commands.Cog):
     @commands.Cog.listener()
     async def on_user_update(self, before, after):
         if before.name != after.name:
-            # Iterate guilds to find shared ones
-            for guild in self.bot.guilds:
-                if guild.get_member(after.id):
-                    await self.log_event(
-                        event_type="USER_UPDATE",
-                        user_id=after.id,
-                        guild_id=guild.id,
-                        moderator_id=None,
-                        details=f"**Before:** {before.name}\n**After:** {after.name}"
-                    )
+            # Only the guilds this user shares with the bot (maintained index)
+            index = getattr(self.bot, "member_index", None)
+            guilds = index.mutual_guilds(after.id) if index is not None else after.mutual_guilds
+            for guild in guilds:
+                await self.log_event(
+                    event_type="USER_UPDATE",
+                    user_id=after.id,
+                    guild_id=guild.id,
+                    moderator_id=None,
+                    details=f"**Before:** {before.name}\n**After:** {after.name}"
+                )
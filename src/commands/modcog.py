@@ -10,10 +10,11 @@ import sqlite3
 from discord.ext import commands  # type: ignore[import-not-found]
 from discord import app_commands  # type: ignore[import-not-found]
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Union, Any, cast
-from collections.abc import Awaitable, Callable
+from typing import Optional, Union, Any
 from utils.embeds import create_success_embed, create_error_embed, create_info_embed
 from utils.helpers import log_action, safe_send, register_mod_action, discard_mod_action
+from utils.rate_limit import RateLimited, rate_limit
+from utils.purge import PurgeEngine, PurgeFilter, PurgeProgress, compile_pattern, PURGE_MAX_AMOUNT
 from config import (
     BOT_OWNER_ID,
     MODERATION_ROLE_ID,
@@ -24,19 +25,30 @@ from config import (
     VERIFY_JOIN_VC_ROLE_ID,
 )
 
-# SAM Module imports for warnings
-try:
-    from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
-    from .modules.sam.internal import database, logger_config
-    from .modules.sam.features.warnings.services import WarnService
-    from .modules.sam.features.warnings.models import Warn
-    from .modules.sam.public import logging_api
-    
-    SAM_AVAILABLE = True
-    logger = logger_config.logger.getChild("modcog.warnings")
-except ImportError:
-    SAM_AVAILABLE = False
-    print("Warning: SAM module not available. Warnings functionality limited.")
+# Warnings live in the SAM module (commands.modules.sam), which is loaded
+# separately in the background; nothing here imports it.
+
+
+def _parse_message_id(value: Optional[str]) -> Optional[int]:
+    """Accept a raw message ID or a message link; raise ``ValueError`` otherwise."""
+    if not value:
+        return None
+    candidate = value.strip().rstrip("/").rsplit("/", 1)[-1]
+    if not candidate.isdigit():
+        raise ValueError(f"`{value}` is not a valid message ID or link.")
+    return int(candidate)
+
+
+class PurgeFlags(commands.FlagConverter, case_insensitive=True):
+    """Optional filters for ``purge`` (``name: value`` pairs after the amount)."""
+
+    user: Optional[discord.User] = commands.flag(default=None, description="Only delete messages from this user")
+    bots: bool = commands.flag(default=False, description="Only delete messages sent by bots")
+    regex: Optional[str] = commands.flag(default=None, description="Only delete messages matching this regex")
+    attachments: bool = commands.flag(default=False, description="Only delete messages with attachments")
+    links: bool = commands.flag(default=False, description="Only delete messages containing links")
+    before: Optional[str] = commands.flag(default=None, description="Only messages before this message ID/link")
+    after: Optional[str] = commands.flag(default=None, description="Only messages after this message ID/link")
 
 
 class ModCog(commands.Cog):
@@ -55,97 +67,107 @@ class ModCog(commands.Cog):
 
     # -------- Basic Moderation Commands --------
     
-    @commands.hybrid_command(name="purge", description="Delete a number of messages from the current channel or thread.")
+    @commands.hybrid_command(name="purge", description="Delete messages, optionally filtered, from the current channel or thread.")
+    @app_commands.describe(amount=f"Number of matching messages to delete (1-{PURGE_MAX_AMOUNT})")
     @commands.has_permissions(manage_messages=True)
     @commands.bot_has_permissions(manage_messages=True)
     @commands.guild_only()
-    async def purge(self, ctx: commands.Context, amount: int):
-        """Delete messages (prefix: ?purge, slash: /purge). Works in channels and threads!"""
-        if amount < 1 or amount > 100:
-            return await self._safe_reply(ctx, "❌ Please provide a number between 1 and 100.")
+    @rate_limit("purge", 5, 60)
+    @commands.max_concurrency(1, per=commands.BucketType.channel, wait=False)
+    async def purge(self, ctx: commands.Context, amount: int, *, flags: PurgeFlags):
+        """Delete messages (prefix: ?purge, slash: /purge). Works in channels and threads!
+
+        Examples:
+          ?purge 50
+          ?purge 500 user: @spammer
+          ?purge 300 bots: yes
+          ?purge 1000 links: yes after: 1234567890
+          ?purge 200 regex: free\\s*nitro attachments: yes
+        """
+        if amount < 1 or amount > PURGE_MAX_AMOUNT:
+            return await self._safe_reply(ctx, f"❌ Please provide a number between 1 and {PURGE_MAX_AMOUNT}.")
 
         if ctx.channel is None:
             return await self._safe_reply(ctx, "❌ This command must be used in a server channel.")
 
         # Allow text channels, threads, and voice/stage channel text chats (when supported by the API/library).
-        if not isinstance(ctx.channel, discord.abc.Messageable):
+        if not isinstance(ctx.channel, discord.abc.Messageable) or not hasattr(ctx.channel, "history"):
             return await self._safe_reply(ctx, "❌ This channel doesn't support messages, so I can't purge here.")
-        
+
+        try:
+            message_filter = PurgeFilter(
+                author_id=flags.user.id if flags.user else None,
+                bots_only=flags.bots,
+                pattern=compile_pattern(flags.regex),
+                has_attachments=flags.attachments,
+                has_links=flags.links,
+            )
+            before_id = _parse_message_id(flags.before)
+            after_id = _parse_message_id(flags.after)
+        except ValueError as e:
+            return await self._safe_reply(ctx, f"❌ {e}")
+
         if ctx.interaction and not ctx.interaction.response.is_done():
             try:
                 await ctx.interaction.response.defer(ephemeral=True)
             except Exception:
                 pass
-        try:
-            # For prefix commands, include the invoking message in the fetch window.
-            limit = amount + (0 if ctx.interaction else 1)
-
-            purge_fn = getattr(ctx.channel, "purge", None)
-            if callable(purge_fn):
-                deleted = await purge_fn(limit=limit)  # type: ignore[misc]
-                count = len(deleted)
-            else:
-                # Fallback for messageable channels that don't expose `.purge()`.
-                # We implement a safe version using history + bulk delete when possible.
-                import datetime
 
-                now = discord.utils.utcnow()
-                bulk_threshold = now - datetime.timedelta(days=14)
+        # For prefix commands the invoking message is removed separately and the
+        # scan is anchored before it so the progress message is never touched.
+        if before_id is None and not ctx.interaction and getattr(ctx, "message", None) is not None:
+            before_id = ctx.message.id
+            message_filter.skip_ids.add(ctx.message.id)
 
-                fetched = [m async for m in ctx.channel.history(limit=limit)]  # type: ignore[attr-defined]
-                if not ctx.interaction and getattr(ctx, "message", None) is not None:
-                    fetched = [m for m in fetched if m.id != ctx.message.id]
+        status_message: Optional[discord.Message] = None
 
-                targets = fetched[:amount]
-                bulk_candidates = [m for m in targets if m.created_at > bulk_threshold]
-                old_messages = [m for m in targets if m.created_at <= bulk_threshold]
-
-                count = 0
-
-                delete_messages_fn = getattr(ctx.channel, "delete_messages", None)
-                if callable(delete_messages_fn) and len(bulk_candidates) > 1:
-                    try:
-                        delete_messages = cast(Callable[[list[Any]], Awaitable[Any]], delete_messages_fn)
-                        await delete_messages(bulk_candidates)
-                        count += len(bulk_candidates)
-                    except Exception:
-                        # Fall back to individual deletes if bulk delete isn't supported.
-                        for m in bulk_candidates:
-                            try:
-                                await m.delete()
-                                count += 1
-                            except Exception:
-                                pass
-                else:
-                    for m in bulk_candidates:
-                        try:
-                            await m.delete()
-                            count += 1
-                        except Exception:
-                            pass
-
-                for m in old_messages:
-                    try:
-                        await m.delete()
-                        count += 1
-                    except Exception:
-                        pass
-            
-            # For slash commands (interactions), ephemeral already auto-hides
-            # For prefix commands, send regular message and delete after 5s
+        async def report(progress: PurgeProgress) -> None:
+            nonlocal status_message
+            text = progress.render()
             if ctx.interaction:
-                await self._safe_reply(ctx, f"🧹 Deleted {count} messages.\n-# This message will auto-dismiss")
+                await ctx.interaction.edit_original_response(content=text)
+            elif status_message is None:
+                status_message = await ctx.send(text)
             else:
-                msg = await ctx.send(f"🧹 Deleted {count} messages.\n-# Note: This message will be deleted in 5 seconds")
-                await msg.delete(delay=5)
+                await status_message.edit(content=text)
+
+        engine = PurgeEngine(
+            ctx.channel,
+            amount,
+            message_filter,
+            before=discord.Object(id=before_id) if before_id else None,
+            after=discord.Object(id=after_id) if after_id else None,
+            progress_callback=report,
+            reason=f"Purge by {ctx.author} ({ctx.author.id})",
+        )
+        try:
+            result = await engine.run()
         except discord.Forbidden:
-            await self._safe_reply(ctx, "❌ I lack permission to manage messages here.")
+            return await self._safe_reply(ctx, "❌ I lack permission to manage messages here.")
         except Exception as e:
-            await self._safe_reply(ctx, f"❌ Failed to purge messages: {e}")
+            return await self._safe_reply(ctx, f"❌ Failed to purge messages: {e}")
+
+        await log_action(
+            "PURGE",
+            ctx.author.id,
+            f"channel={ctx.channel.id} deleted={result.deleted} scanned={result.scanned} "
+            f"filters={message_filter.describe()}",
+        )
+
+        # For slash commands (interactions), ephemeral already auto-hides
+        # For prefix commands, clean up the invocation and the progress message
+        if not ctx.interaction:
+            try:
+                await ctx.message.delete()
+            except discord.HTTPException:
+                pass
+            if status_message is not None:
+                await status_message.delete(delay=5)
 
     @commands.hybrid_command(name="kick", description="Kick a member from the server.")
     @commands.bot_has_permissions(kick_members=True)
     @commands.guild_only()
+    @rate_limit("kick", 10, 60)
     async def kick(self, ctx: commands.Context, member: discord.Member, *, reason: str = "No reason provided"):
         # PERM CHECK: Native Kick OR Permit
         has_native = ctx.author.guild_permissions.kick_members if isinstance(ctx.author, discord.Member) else False
@@ -182,6 +204,7 @@ class ModCog(commands.Cog):
     @commands.hybrid_command(name="ban", description="Ban a member from the server.")
     @commands.bot_has_permissions(ban_members=True)
     @commands.guild_only()
+    @rate_limit("ban", 10, 60)
     async def ban(self, ctx: commands.Context, member: discord.Member, *, reason: str = "No reason provided"):
         # PERM CHECK: Native Ban OR Permit
         has_native = ctx.author.guild_permissions.ban_members if isinstance(ctx.author, discord.Member) else False
@@ -814,6 +837,8 @@ class ModCog(commands.Cog):
     @app_commands.describe(user_ids="User IDs to ban (space-separated)", reason="Reason for the bans")
     @commands.bot_has_permissions(ban_members=True)
     @commands.guild_only()
+    @rate_limit("massban", 2, 600)
+    @commands.max_concurrency(1, per=commands.BucketType.guild, wait=False)
     async def massban(self, ctx: commands.Context, user_ids: str, *, reason: str = "Mass ban"):
         """Ban multiple users by their IDs (Owner only)"""
         # Check if user is the bot owner
@@ -1081,19 +1106,27 @@ class ModCog(commands.Cog):
         guild = ctx.guild
         assert guild is not None  # Since we have @commands.guild_only()
         
-        # Calculate server stats
-        total_members = guild.member_count or len(guild.members)
-        online_members = sum(1 for member in guild.members if member.status != discord.Status.offline)
-        bot_count = sum(1 for member in guild.members if member.bot)
-        human_count = len([m for m in guild.members if not m.bot])
+        # Server stats come from the incrementally maintained GuildStats
+        # tracker (O(1)); fall back to a one-off count if it isn't loaded.
+        stats_cog: Any = self.bot.get_cog("GuildStats")
+        if stats_cog is not None:
+            stats = stats_cog.get(guild)
+        else:
+            from commands.guild_stats import GuildCounters
+            stats = GuildCounters.from_guild(guild)
+
+        total_members = guild.member_count or stats.members
+        online_members = stats.online
+        bot_count = stats.bots
+        human_count = stats.humans
         
         # Channel counts
-        text_channels = len(guild.text_channels)
-        voice_channels = len(guild.voice_channels)
-        categories = len(guild.categories)
+        text_channels = stats.text_channels
+        voice_channels = stats.voice_channels
+        categories = stats.categories
         
         # Role count
-        role_count = len(guild.roles) - 1  # Exclude @everyone
+        role_count = stats.roles
         
         # Boost info
         boost_level = guild.premium_tier
@@ -1243,6 +1276,10 @@ class ModCog(commands.Cog):
     async def _command_error(self, ctx: commands.Context, error):
         if isinstance(error, commands.MissingPermissions):
             await self._safe_reply(ctx, "❌ You lack permission for that command.")
+        elif isinstance(error, RateLimited):
+            await self._safe_reply(ctx, f"⏰ Rate limit: {error}")
+        elif isinstance(error, commands.MaxConcurrencyReached):
+            await self._safe_reply(ctx, "⏳ This command is already running here. Please wait for it to finish.")
         elif isinstance(error, commands.BotMissingPermissions):
             await self._safe_reply(ctx, "⚠️ I am missing required permissions.")
         elif isinstance(error, commands.BadArgument):
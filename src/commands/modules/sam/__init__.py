@@ -9,6 +9,7 @@ from .internal.database import init_db
 from .internal.logger_config import logger
 
 from .features.warnings.cogs import Warnings
+from .features.warnings import migrations  # noqa - registers schema migrations
 
 
 async def setup(bot: commands.Bot):
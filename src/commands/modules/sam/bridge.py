@@ -2,12 +2,17 @@
 SAM to CodeVerse Bot Bridge
 
 This module acts as a bridge between the SAM module and the CodeVerse bot,
-allowing SAM features to interact with the bot's core systems like logging.
+allowing SAM features to interact with the bot's core systems like logging
+and metrics.
 """
 import discord
 from discord.ext import commands
 import os
 
+from utils.dm_outbox import DMResult, Priority
+from utils.metrics import counter, gauge, register_collector, unregister_collector
+
+from .internal import database
 from .public import logging_api
 
 async def log_consumer(bot: commands.Bot, action: logging_api.LogAction):
@@ -70,3 +75,37 @@ def disconnect_log_consumer():
     if hasattr(connect_log_consumer, "consumer"):
         logging_api.disconnect(connect_log_consumer.consumer)
 
+def _database_metrics(bot):
+    stats = database.pool_stats()
+    if "size" not in stats:
+        return
+    connections = gauge("sam_db_pool_connections", "SAM database pool connections by state.")
+    connections.add(stats["checked_out"], state="checked_out").add(stats["checked_in"], state="idle")
+    yield connections
+    yield gauge("sam_db_pool_size", "Configured SAM database pool size.", stats["size"])
+    yield gauge("sam_db_pool_overflow", "SAM database connections open beyond the pool size.", max(stats["overflow"], 0))
+
+def _logging_metrics(bot):
+    yield gauge("sam_log_queue_depth", "SAM log actions waiting for delivery.", logging_api.queue_depth())
+    outcomes = counter("sam_log_actions_total", "SAM log actions by outcome.")
+    for outcome, value in logging_api.stats().items():
+        outcomes.add(value, outcome=outcome)
+    yield outcomes
+
+def connect_metrics():
+    """
+    Exports SAM's database pool and log queue statistics on /metrics.
+    """
+    register_collector("sam_database", _database_metrics)
+    register_collector("sam_logging", _logging_metrics)
+
+def disconnect_metrics():
+    unregister_collector("sam_database")
+    unregister_collector("sam_logging")
+
+async def send_moderation_dm(bot: commands.Bot, user_id: int, kind: str, **kwargs) -> DMResult:
+    """
+    Sends a DM through the bot's shared DM outbox at moderation priority
+    and waits for the result. ``kwargs`` are passed to ``User.send``.
+    """
+    return await bot.dm_outbox.send(user_id, kind=kind, priority=Priority.MODERATION, **kwargs)
@@ -20,6 +20,16 @@ class SAMConfig(BaseSettings):
     database_uri: SqliteDsn | PostgresDsn | MySQLDsn | MariaDBDsn = "sqlite+aiosqlite:///data/codeverse_bot.db"  # type: ignore
     builtin_logger_enabled: bool = True
 
+    # Connection pool (Postgres/MySQL/MariaDB and file-backed SQLite)
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800  # seconds; below MySQL's default wait_timeout
+
+    # SQLite connect-time pragmas
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 16384
+
     class Config:
         env_file = ".env"
         env_prefix = "sam_"
@@ -1,12 +1,19 @@
+import io
+import os
 import re
+import tempfile
+from datetime import datetime, timezone
 from typing import Optional
 
 import discord  # type: ignore[import-not-found]
 from discord.ext import commands  # type: ignore[import-not-found]
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
 
+from ... import bridge
 from ...internal import database, logger_config
+from . import transfer
 from .services import WarnService
+from .views import WarningsPaginator
 
 logger = logger_config.logger.getChild("warnings")
 
@@ -22,28 +29,20 @@ class Warnings(commands.Cog):
 
     async def _send_dm(self, user_id: int, embed: discord.Embed) -> tuple[bool, str]:
         """
-        Safely send a DM to a user with proper error handling.
+        Sends a DM through the bot's DM outbox (moderation priority).
         Returns: (success: bool, status: str)
         """
-        try:
-            # Try to fetch user from cache first, then from API
-            user = self.bot.get_user(user_id)
-            if user is None:
-                user = await self.bot.fetch_user(user_id)
-
-            if user is None:
-                return False, "User not found"
-
-            await user.send(embed=embed)
+        result = await bridge.send_moderation_dm(self.bot, user_id, "warning", embed=embed)
+        if result.delivered:
             return True, "✅ DM sent successfully"
-
-        except discord.Forbidden:
+        if result.outcome in ("forbidden", "closed"):
             return False, "⚠️ User has DMs disabled or blocked the bot"
-        except discord.NotFound:
+        if result.outcome == "not_found":
             return False, "❌ User not found"
-        except Exception as e:
-            logger.error(f"Failed to send DM to user {user_id}: {str(e)}")
-            return False, f"⚠️ Failed to send DM: {type(e).__name__}"
+        if result.error is not None:
+            logger.error(f"Failed to send DM to user {user_id}: {result.error}")
+            return False, f"⚠️ Failed to send DM: {type(result.error).__name__}"
+        return False, f"⚠️ Failed to send DM: {result.reason}"
 
     @commands.hybrid_command(name="warn", description="Issue a warning to a user.")
     @commands.has_permissions(kick_members=True)
@@ -233,59 +232,29 @@ class Warnings(commands.Cog):
     async def _display_user_warnings(
         self, ctx: commands.Context, user: discord.User
     ) -> None:
-        """Render a user's warning history (total, moderator, date, reason)."""
+        """Render a user's warning history (total, moderator, date, reason).
+
+        Counts come from one aggregate query; the history is shown a page at
+        a time through WarningsPaginator.
+        """
         try:
             async with database.get_session() as session:
                 svc = self.warn_service_class(session)
-                warnings_list = await svc.get_warnings_for_user(user.id, ctx.guild.id)
-
-                if not warnings_list:
-                    embed = discord.Embed(
-                        description=f"✅ {user.mention} has no warnings.",
-                        color=discord.Color.green(),
-                    )
-                    await ctx.send(embed=embed)
-                    return
-
-                active_warnings = [w for w in warnings_list if not w.revoked]
-                revoked_warnings = [w for w in warnings_list if w.revoked]
+                active, revoked = await svc.count_warnings(user.id, ctx.guild.id)
 
+            if not active and not revoked:
                 embed = discord.Embed(
-                    title=f"Warnings for {user.name}",
-                    color=discord.Color.orange()
-                    if active_warnings
-                    else discord.Color.green(),
-                )
-                embed.add_field(
-                    name="Total Warnings",
-                    value=f"**{len(active_warnings)}** active • **{len(revoked_warnings)}** revoked",
-                    inline=False,
-                )
-
-                if active_warnings:
-                    active_content = "\n".join([str(w) for w in active_warnings])
-                    if len(active_content) > 1024:
-                        active_content = active_content[:1024] + "..."
-                    embed.add_field(
-                        name=f"Active Warnings ({len(active_warnings)})",
-                        value=active_content,
-                        inline=False,
-                    )
-
-                if revoked_warnings:
-                    revoked_content = "\n".join([str(w) for w in revoked_warnings])
-                    if len(revoked_content) > 1024:
-                        revoked_content = revoked_content[:1024] + "..."
-                    embed.add_field(
-                        name=f"Revoked Warnings ({len(revoked_warnings)})",
-                        value=revoked_content,
-                        inline=False,
-                    )
-
-                embed.set_footer(
-                    text=f"Total: {len(active_warnings)} active, {len(revoked_warnings)} revoked"
+                    description=f"✅ {user.mention} has no warnings.",
+                    color=discord.Color.green(),
                 )
                 await ctx.send(embed=embed)
+                return
+
+            view = WarningsPaginator(
+                self.warn_service_class, user, ctx.guild.id, ctx.author.id, active, revoked
+            )
+            warnings_page = await view.load_page()
+            view.message = await ctx.send(embed=view.build_embed(warnings_page), view=view)
         except Exception as e:
             embed = discord.Embed(
                 title="❌ Error",
@@ -365,7 +334,7 @@ class Warnings(commands.Cog):
         try:
             async with database.get_session() as session:
                 svc = self.warn_service_class(session)
-                await svc.clear_warnings_for_user(
+                cleared = await svc.clear_warnings_for_user(
                     user.id, ctx.guild.id, ctx.author.id, reason
                 )
 
@@ -385,7 +354,7 @@ class Warnings(commands.Cog):
 
                 embed = discord.Embed(
                     title="🧹 Warnings Cleared",
-                    description=f"All warnings for {user.mention} have been cleared.",
+                    description=f"All warnings for {user.mention} have been cleared ({len(cleared)} revoked).",
                     color=discord.Color.green(),
                 )
                 embed.add_field(name="Clear Reason", value=reason, inline=False)
@@ -401,6 +370,97 @@ class Warnings(commands.Cog):
             )
             await ctx.send(embed=embed)
 
+    @commands.group(name="warndata", hidden=True, invoke_without_command=True)
+    @commands.is_owner()
+    async def warndata(self, ctx: commands.Context):
+        """Bulk warning export/import (owner only).
+
+        Prefix:
+          ?warndata export [ndjson|csv] [guild_id|all]
+          ?warndata import [guild_id]   (attach an .ndjson or .csv export)
+          ?warndata migrate-legacy [guild_id]
+        """
+        await ctx.send(
+            "Usage: `?warndata export [ndjson|csv] [guild_id|all]`, "
+            "`?warndata import [guild_id]` with an attachment, `?warndata migrate-legacy [guild_id]`"
+        )
+
+    @warndata.command(name="export")
+    @commands.is_owner()
+    async def warndata_export(
+        self, ctx: commands.Context, fmt: str = "ndjson", scope: str = "guild"
+    ):
+        """Stream warnings to an NDJSON/CSV attachment."""
+        fmt = fmt.lower()
+        if fmt not in transfer.FORMATS:
+            await ctx.send(f"❌ Format must be one of: {', '.join(transfer.FORMATS)}")
+            return
+        if scope == "all":
+            guild_id = None
+        elif scope == "guild":
+            guild_id = ctx.guild.id if ctx.guild else None
+        elif scope.isdigit():
+            guild_id = int(scope)
+        else:
+            await ctx.send("❌ Scope must be `guild`, `all` or a guild ID.")
+            return
+
+        # Stream to a temporary file so memory does not grow with the table
+        fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as out:
+                count = await transfer.export_warnings(out, fmt, guild_id)
+            size = os.path.getsize(path)
+            limit = ctx.guild.filesize_limit if ctx.guild else discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+            if size > limit:
+                await ctx.send(
+                    f"❌ Export is {size / 1048576:.1f} MiB, above the upload limit. "
+                    "Use the command line exporter instead."
+                )
+                return
+            filename = f"warnings-{guild_id or 'all'}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{fmt}"
+            await ctx.send(
+                f"📦 Exported **{count}** warnings.", file=discord.File(path, filename=filename)
+            )
+        except Exception as e:
+            logger.exception("Warnings export failed")
+            await ctx.send(f"❌ Export failed: {e}")
+        finally:
+            os.remove(path)
+
+    @warndata.command(name="import")
+    @commands.is_owner()
+    async def warndata_import(self, ctx: commands.Context, guild_id: Optional[int] = None):
+        """Import an attached NDJSON/CSV export (existing warnings are skipped)."""
+        if not ctx.message.attachments:
+            await ctx.send("❌ Attach an `.ndjson` or `.csv` export to import.")
+            return
+        attachment = ctx.message.attachments[0]
+        fmt = "csv" if attachment.filename.lower().endswith(".csv") else "ndjson"
+        try:
+            data = await attachment.read()
+            records = transfer.read_records(io.StringIO(data.decode("utf-8"), newline=""), fmt)
+            result = await transfer.import_warnings(records, guild_id)
+            await ctx.send(f"📥 Import finished: {result}.")
+        except Exception as e:
+            logger.exception("Warnings import failed")
+            await ctx.send(f"❌ Import failed: {e}")
+
+    @warndata.command(name="migrate-legacy")
+    @commands.is_owner()
+    async def warndata_migrate_legacy(self, ctx: commands.Context, guild_id: Optional[int] = None):
+        """Copy the legacy json_store warnings into SAM (safe to re-run)."""
+        target = guild_id or (ctx.guild.id if ctx.guild else None)
+        if target is None:
+            await ctx.send("❌ Specify the guild the legacy warnings belong to.")
+            return
+        try:
+            result = await transfer.migrate_legacy_warnings(target)
+            await ctx.send(f"📥 Legacy warnings migrated to `{target}`: {result}.")
+        except Exception as e:
+            logger.exception("Legacy warnings migration failed")
+            await ctx.send(f"❌ Migration failed: {e}")
+
 
 async def setup(bot: commands.Bot) -> None:
     """Set up the warnings cog."""
@@ -0,0 +1,39 @@
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection
+
+from ...internal import database, logger_config
+from .models import Warn, WarnCount
+
+logger = logger_config.logger.getChild("warnings.migrations")
+
+
+@database.migration("warnings.composite_indexes")
+def add_composite_indexes(conn: Connection) -> None:
+    """
+    Adds the (guild_id, user_id) and (guild_id, revoked) indexes to
+    databases whose ``warn`` table predates them.
+    """
+    for index in Warn.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+@database.migration("warnings.backfill_counts")
+def backfill_warn_counts(conn: Connection) -> None:
+    """
+    Fills the ``warncount`` table from existing warnings.
+
+    Only runs while the table is empty; from then on the counts are
+    maintained by the service on every issue and revoke.
+    """
+    if conn.execute(select(WarnCount.guild_id).limit(1)).first() is not None:
+        return
+    active = (
+        select(Warn.guild_id, Warn.user_id, func.count(Warn.id))
+        .where(Warn.revoked.is_(False))
+        .group_by(Warn.guild_id, Warn.user_id)
+    )
+    result = conn.execute(
+        insert(WarnCount).from_select(["guild_id", "user_id", "active"], active)
+    )
+    if result.rowcount:
+        logger.info("Backfilled active warning counts for %s members", result.rowcount)
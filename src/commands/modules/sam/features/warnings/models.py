@@ -1,9 +1,17 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Warn(SQLModel, table=True):
+    __table_args__ = (
+        # Per-user history lookups and active-warning filters
+        Index("ix_warn_guild_id_user_id", "guild_id", "user_id"),
+        Index("ix_warn_guild_id_revoked", "guild_id", "revoked"),
+        {"extend_existing": True},
+    )
+
     id: int = Field(default=None, primary_key=True)
     user_id: int = Field()
     guild_id: int = Field(index=True)
@@ -24,3 +32,21 @@ class Warn(SQLModel, table=True):
             else:
                 revoked_timestamp = f"<t:{round(self.revoked_at.timestamp())}>"
             return f"#{self.id}: `{self.revoke_reason}` revoked by <@{self.revoke_moderator_id}> @ " + revoked_timestamp + " [**REVOKED**]"
+
+
+class WarnCount(SQLModel, table=True):
+    """
+    Active (non-revoked) warning count per guild member.
+
+    Maintained in the same transaction as every issue/revoke so the
+    leaderboard is a top-N read instead of a GROUP BY over all warnings.
+    """
+
+    __table_args__ = (
+        Index("ix_warncount_guild_id_active", "guild_id", "active"),
+        {"extend_existing": True},
+    )
+
+    guild_id: int = Field(primary_key=True)
+    user_id: int = Field(primary_key=True)
+    active: int = Field(default=0)
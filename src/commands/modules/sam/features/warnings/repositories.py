@@ -1,9 +1,9 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
 
 from ...internal.abstract.abstract_repository import AbstractRepository
-from .models import Warn
+from .models import Warn, WarnCount
 
 
 class WarnRepository(AbstractRepository[Warn]):
@@ -27,9 +27,76 @@ class WarnRepository(AbstractRepository[Warn]):
         result = await self.session.execute(statement)
         return list(result.scalars().all())
 
+    async def count_by_status(self, user_id: int, guild_id: int) -> tuple[int, int]:
+        """Count a user's active and revoked warnings with one aggregate query.
+
+        Args:
+            user_id: The ID of the user to count warnings for.
+            guild_id: The guild the warnings belong to.
+
+        Returns:
+            An ``(active, revoked)`` tuple.
+        """
+        from sqlmodel import func, select  # type: ignore[import-not-found]
+        statement = (
+            select(Warn.revoked, func.count(Warn.id))
+            .where(Warn.guild_id == guild_id, Warn.user_id == user_id)
+            .group_by(Warn.revoked)
+        )
+        counts = {bool(revoked): count for revoked, count in (await self.session.execute(statement)).all()}
+        return counts.get(False, 0), counts.get(True, 0)
+
+    async def find_page(
+        self,
+        user_id: int,
+        guild_id: int,
+        *,
+        after: tuple[datetime, int] | None = None,
+        before: tuple[datetime, int] | None = None,
+        limit: int = 5,
+    ) -> list[Warn]:
+        """Fetch one page of a user's warnings, newest first, by keyset.
+
+        Pages are addressed by the ``(created_at, id)`` key of a boundary
+        row instead of an OFFSET, so every page costs the same regardless
+        of how deep into the history it is.
+
+        Args:
+            user_id: The ID of the user to find warnings for.
+            guild_id: The guild the warnings belong to.
+            after: Return the warnings older than this key (next page).
+            before: Return the warnings newer than this key (previous page).
+            limit: Maximum number of warnings to return.
+
+        Returns:
+            Up to ``limit`` warnings ordered newest first.
+        """
+        from sqlmodel import and_, or_, select  # type: ignore[import-not-found]
+        statement = select(Warn).where(Warn.guild_id == guild_id, Warn.user_id == user_id)
+        if before is not None:
+            created_at, warn_id = before
+            statement = statement.where(
+                or_(Warn.created_at > created_at, and_(Warn.created_at == created_at, Warn.id > warn_id))
+            ).order_by(Warn.created_at.asc(), Warn.id.asc())
+        else:
+            if after is not None:
+                created_at, warn_id = after
+                statement = statement.where(
+                    or_(Warn.created_at < created_at, and_(Warn.created_at == created_at, Warn.id < warn_id))
+                )
+            statement = statement.order_by(Warn.created_at.desc(), Warn.id.desc())
+        result = await self.session.execute(statement.limit(limit))
+        warnings = list(result.scalars().all())
+        if before is not None:
+            warnings.reverse()
+        return warnings
+
     async def get_leaderboard(self, guild_id: int, limit: int = 10) -> list[tuple[int, int]]:
         """Return the top users by active (non-revoked) warning count.
 
+        Reads the maintained ``WarnCount`` table (indexed on
+        ``(guild_id, active)``) instead of aggregating every warning.
+
         Args:
             guild_id: The guild to build the leaderboard for.
             limit: Maximum number of entries to return.
@@ -38,13 +105,174 @@ class WarnRepository(AbstractRepository[Warn]):
             A list of ``(user_id, active_warning_count)`` tuples ordered from
             most to fewest warnings.
         """
-        from sqlmodel import func, select  # type: ignore[import-not-found]
+        from sqlmodel import select  # type: ignore[import-not-found]
         statement = (
-            select(Warn.user_id, func.count(Warn.id))
-            .where(Warn.guild_id == guild_id, Warn.revoked.is_(False))
-            .group_by(Warn.user_id)
-            .order_by(func.count(Warn.id).desc())
+            select(WarnCount.user_id, WarnCount.active)
+            .where(WarnCount.guild_id == guild_id, WarnCount.active > 0)
+            .order_by(WarnCount.active.desc(), WarnCount.user_id)
             .limit(limit)
         )
         result = await self.session.execute(statement)
         return [(user_id, count) for user_id, count in result.all()]
+
+    async def _adjust_active_count(self, guild_id: int, user_id: int, delta: int) -> None:
+        """Add ``delta`` to a user's active warning count (no commit).
+
+        Increments are a single dialect upsert (``ON CONFLICT DO UPDATE`` on
+        SQLite/PostgreSQL, ``ON DUPLICATE KEY UPDATE`` on MySQL/MariaDB), so
+        two concurrent first warnings for the same member cannot both try to
+        insert the row. Rows that drop to zero are deleted so the table only
+        holds users with active warnings.
+        """
+        from sqlmodel import delete, update  # type: ignore[import-not-found]
+        key = (WarnCount.guild_id == guild_id, WarnCount.user_id == user_id)
+        if delta > 0:
+            await self.session.execute(self._increment_statement(guild_id, user_id, delta))
+            return
+        await self.session.execute(
+            update(WarnCount).where(*key).values(active=WarnCount.active + delta)
+        )
+        await self.session.execute(delete(WarnCount).where(*key, WarnCount.active <= 0))
+
+    def _increment_statement(self, guild_id: int, user_id: int, delta: int):
+        """Build the upsert adding ``delta`` to (or creating) a count row."""
+        values = {"guild_id": guild_id, "user_id": user_id, "active": delta}
+        dialect = self.session.get_bind().dialect.name
+        if dialect in ("mysql", "mariadb"):
+            from sqlalchemy.dialects.mysql import insert  # type: ignore[import-not-found]
+            statement = insert(WarnCount).values(**values)
+            return statement.on_duplicate_key_update(active=WarnCount.active + delta)
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert  # type: ignore[import-not-found]
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert  # type: ignore[import-not-found]
+        else:
+            raise NotImplementedError(f"No upsert for the {dialect!r} dialect")
+        statement = insert(WarnCount).values(**values)
+        return statement.on_conflict_do_update(
+            index_elements=[WarnCount.guild_id, WarnCount.user_id],
+            set_={"active": WarnCount.active + delta},
+        )
+
+    async def save_warning(self, warn: Warn, active_delta: int = 0) -> Warn:
+        """Save a warning and adjust its user's active count in one transaction.
+
+        Args:
+            warn: The new or modified warning.
+            active_delta: +1 for a new warning, -1 when revoking an active
+                one, 0 otherwise.
+
+        Returns:
+            The saved warning.
+        """
+        self.session.add(warn)
+        try:
+            if active_delta:
+                await self._adjust_active_count(warn.guild_id, warn.user_id, active_delta)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        await self.session.refresh(warn)
+        return warn
+
+    async def revoke_all_for_user(
+        self, user_id: int, guild_id: int, moderator_id: int, reason: str
+    ) -> list[Warn]:
+        """Revoke every active warning of a user in a single UPDATE.
+
+        The update and its commit run as one transaction. Where the dialect
+        supports ``UPDATE ... RETURNING`` (SQLite 3.35+, PostgreSQL, MariaDB)
+        the revoked rows come back from the same statement; otherwise their
+        IDs are selected first inside the transaction.
+
+        Args:
+            user_id: The ID of the user whose warnings are revoked.
+            guild_id: The guild the warnings belong to.
+            moderator_id: The moderator revoking the warnings.
+            reason: The revoke reason stored on every warning.
+
+        Returns:
+            The warnings that were revoked (previously revoked ones are left
+            untouched and not included).
+        """
+        from sqlmodel import select, update  # type: ignore[import-not-found]
+        values = {
+            "revoked": True,
+            "revoke_reason": reason,
+            "revoke_moderator_id": moderator_id,
+            "revoked_at": datetime.now(tz=timezone.utc),
+        }
+        active = (Warn.guild_id == guild_id, Warn.user_id == user_id, Warn.revoked.is_(False))
+        bind = self.session.get_bind()
+        try:
+            if bind.dialect.update_returning:
+                statement = update(Warn).where(*active).values(**values).returning(Warn)
+                result = await self.session.execute(statement)
+                revoked = list(result.scalars().all())
+            else:
+                ids = list((await self.session.execute(select(Warn.id).where(*active))).scalars().all())
+                if ids:
+                    await self.session.execute(
+                        update(Warn).where(Warn.id.in_(ids)).values(**values)
+                    )
+                revoked = ids
+            if revoked:
+                await self._adjust_active_count(guild_id, user_id, -len(revoked))
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        if revoked and not isinstance(revoked[0], Warn):
+            statement = select(Warn).where(Warn.id.in_(revoked)).order_by(Warn.id)
+            revoked = list((await self.session.execute(statement)).scalars().all())
+        return revoked
+
+    @staticmethod
+    def natural_key(
+        guild_id: int, user_id: int, moderator_id: int, created_at: datetime, reason: str
+    ) -> tuple[int, int, int, datetime, str]:
+        """Identity of a warning across instances (``created_at`` as naive UTC)."""
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return guild_id, user_id, moderator_id, created_at, reason
+
+    async def existing_keys(
+        self, guild_ids: set[int], user_ids: set[int]
+    ) -> set[tuple[int, int, int, datetime, str]]:
+        """Natural keys of stored warnings for the given guilds and users.
+
+        See ``natural_key``; the importer uses this to skip rows that are
+        already present.
+        """
+        from sqlmodel import select  # type: ignore[import-not-found]
+        statement = select(
+            Warn.guild_id, Warn.user_id, Warn.moderator_id, Warn.created_at, Warn.reason
+        ).where(Warn.guild_id.in_(guild_ids), Warn.user_id.in_(user_ids))
+        result = await self.session.execute(statement)
+        return {self.natural_key(*row) for row in result.all()}
+
+    async def bulk_insert(self, rows: list[dict]) -> int:
+        """Insert warnings with one executemany and update the active counts.
+
+        Does not commit; the caller owns the transaction.
+
+        Args:
+            rows: Column dictionaries for ``Warn`` (without ``id``).
+
+        Returns:
+            The number of inserted rows.
+        """
+        from sqlmodel import insert  # type: ignore[import-not-found]
+        if not rows:
+            return 0
+        await self.session.execute(insert(Warn), rows)
+        deltas: dict[tuple[int, int], int] = {}
+        for row in rows:
+            if not row.get("revoked"):
+                key = (row["guild_id"], row["user_id"])
+                deltas[key] = deltas.get(key, 0) + 1
+        for (guild_id, user_id), delta in deltas.items():
+            await self._adjust_active_count(guild_id, user_id, delta)
+        return len(rows)
+
@@ -57,12 +57,13 @@ class WarnService:
                 reason,
             )
         )
-        return await self.repo.save(warn)
+        return await self.repo.save_warning(warn, active_delta=1)
 
     async def recall_warning(
         self, case_id: int, guild_id: int, moderator_id: int, reason: str
     ) -> Warn:
         warn = await self.get_warning(case_id, guild_id)
+        was_active = not warn.revoked
         warn.revoked = True
         warn.revoke_reason = reason
         warn.revoke_moderator_id = moderator_id
@@ -76,11 +77,29 @@ class WarnService:
                 reason,
             )
         )
-        return await self.repo.save(warn)
+        return await self.repo.save_warning(warn, active_delta=-1 if was_active else 0)
 
     async def get_warnings_for_user(self, user_id: int, guild_id: int) -> list[Warn]:
         return await self.repo.find_by_user_id_and_guild_id(user_id, guild_id)
 
+    async def count_warnings(self, user_id: int, guild_id: int) -> tuple[int, int]:
+        """Return ``(active, revoked)`` warning counts for a user."""
+        return await self.repo.count_by_status(user_id, guild_id)
+
+    async def get_warnings_page(
+        self,
+        user_id: int,
+        guild_id: int,
+        *,
+        after: tuple[datetime, int] | None = None,
+        before: tuple[datetime, int] | None = None,
+        limit: int = 5,
+    ) -> list[Warn]:
+        """Return one keyset page of a user's warnings, newest first."""
+        return await self.repo.find_page(
+            user_id, guild_id, after=after, before=before, limit=limit
+        )
+
     async def get_leaderboard(self, guild_id: int, limit: int = 10) -> list[tuple[int, int]]:
         """Return the top users by active (non-revoked) warning count."""
         return await self.repo.get_leaderboard(guild_id, limit)
@@ -88,23 +107,26 @@ class WarnService:
     async def clear_warnings_for_user(
         self, user_id: int, guild_id: int, moderator_id: int, reason: str
     ) -> list[Warn]:
-        warnings = await self.repo.find_by_user_id_and_guild_id(user_id, guild_id)
-        result_warnings = []
-        for warning in warnings:
-            revoked = await self.recall_warning(
-                warning.id, guild_id, moderator_id, reason
-            )
-            result_warnings.append(revoked)
-        await logging_api.log(
-            get_log_action(
-                "Member Warnings Cleared",
-                "A member's warnings have been cleared.",
-                user_id,
-                moderator_id,
-                reason,
-            )
+        revoked = await self.repo.revoke_all_for_user(
+            user_id, guild_id, moderator_id, reason
+        )
+        action = get_log_action(
+            "Member Warnings Cleared",
+            f"{len(revoked)} active warning(s) of a member have been revoked.",
+            user_id,
+            moderator_id,
+            reason,
         )
-        return result_warnings
+        if revoked:
+            action.fields.append(
+                logging_api.LogField(
+                    "Cases",
+                    ", ".join(f"#{warn.id}" for warn in revoked)[:1024],
+                    inline=False,
+                )
+            )
+        await logging_api.log(action)
+        return revoked
 
     async def get_warning(self, case_id: int, guild_id: int) -> Warn:
         warn = await self.repo.get(case_id)
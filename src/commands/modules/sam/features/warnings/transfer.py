@@ -0,0 +1,362 @@
+"""
+Bulk export and import of warnings.
+
+Exports stream rows from a server-side cursor (``AsyncConnection.stream``)
+in batches, so memory stays constant regardless of table size. Two formats
+are supported:
+
+* ``ndjson``: one JSON object per line.
+* ``csv``: header row plus one row per warning.
+
+Imports read records lazily, insert them in chunks with one transaction per
+chunk, and skip rows that already exist. A warning is identified by
+``(guild_id, user_id, moderator_id, created_at, reason)``, so running the
+same import twice (or importing an export back into the instance it came
+from) is a no-op. Records without a ``created_at`` cannot be identified that
+way and are counted as invalid rather than given a new timestamp. The legacy ``json_store`` file (``data/warnings.json``) can
+be imported the same way; it has no guild, so a target guild is required.
+
+Command line (run from the repository root):
+
+    PYTHONPATH=src python -m commands.modules.sam.features.warnings.transfer export -o warns.ndjson
+    PYTHONPATH=src python -m commands.modules.sam.features.warnings.transfer import warns.csv --guild 123
+    PYTHONPATH=src python -m commands.modules.sam.features.warnings.transfer migrate-legacy --guild 123
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import sys
+from collections.abc import AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, TextIO
+
+from sqlmodel import select  # type: ignore[import-not-found]
+
+from ...internal import database, logger_config
+from .models import Warn
+from .repositories import WarnRepository
+
+logger = logger_config.logger.getChild("warnings.transfer")
+
+FORMATS = ("ndjson", "csv")
+BATCH_SIZE = 500
+LEGACY_WARNINGS_PATH = os.path.join("data", "warnings.json")
+
+EXPORT_COLUMNS = (
+    "id",
+    "guild_id",
+    "user_id",
+    "moderator_id",
+    "reason",
+    "created_at",
+    "revoked",
+    "revoke_reason",
+    "revoke_moderator_id",
+    "revoked_at",
+)
+_INT_COLUMNS = ("guild_id", "user_id", "moderator_id", "revoke_moderator_id")
+
+
+@dataclass(slots=True)
+class ImportResult:
+    inserted: int = 0
+    skipped: int = 0  # already present
+    invalid: int = 0  # malformed records (including a missing created_at)
+
+    def __str__(self) -> str:
+        return f"{self.inserted} imported, {self.skipped} already present, {self.invalid} invalid"
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+def _to_text(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    return value
+
+
+async def iter_warnings(
+    guild_id: int | None = None, batch_size: int = BATCH_SIZE
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Yields batches of warnings (as plain dicts) ordered by id.
+
+    Rows come from a streaming cursor, so only one batch is held at a time.
+    """
+    table = Warn.__table__
+    statement = select(*(table.c[name] for name in EXPORT_COLUMNS)).order_by(table.c.id)
+    if guild_id is not None:
+        statement = statement.where(table.c.guild_id == guild_id)
+    async with database.engine.connect() as conn:
+        result = await conn.stream(statement.execution_options(yield_per=batch_size))
+        async for partition in result.partitions(batch_size):
+            yield [
+                {name: _to_text(value) for name, value in zip(EXPORT_COLUMNS, row)}
+                for row in partition
+            ]
+
+
+def _encode(batch: list[dict[str, Any]], fmt: str, header: bool) -> str:
+    if fmt == "ndjson":
+        return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in batch)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    if header:
+        writer.writeheader()
+    writer.writerows(batch)
+    return buffer.getvalue()
+
+
+async def export_warnings(out: TextIO, fmt: str = "ndjson", guild_id: int | None = None) -> int:
+    """
+    Streams warnings to ``out`` as NDJSON or CSV.
+
+    Args:
+        out: A text file opened for writing.
+        fmt: ``"ndjson"`` or ``"csv"``.
+        guild_id: Only export this guild (all guilds when None).
+
+    Returns:
+        The number of exported warnings.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    count = 0
+    if fmt == "csv":
+        await asyncio.to_thread(out.write, _encode([], fmt, header=True))
+    async for batch in iter_warnings(guild_id):
+        # File writes happen off the event loop, one batch at a time
+        await asyncio.to_thread(out.write, _encode(batch, fmt, header=False))
+        count += len(batch)
+    await asyncio.to_thread(out.flush)
+    return count
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+def read_records(source: Iterable[str], fmt: str) -> Iterator[dict[str, Any]]:
+    """
+    Lazily parses NDJSON or CSV lines into records.
+
+    Malformed NDJSON lines are yielded as ``None`` so they can be counted.
+    """
+    if fmt == "ndjson":
+        for line in source:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield None  # type: ignore[misc]
+    elif fmt == "csv":
+        yield from csv.DictReader(source)
+    else:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def read_legacy_records(path: str = LEGACY_WARNINGS_PATH) -> Iterator[dict[str, Any]]:
+    """
+    Yields the warnings from the legacy ``json_store`` file.
+
+    Format: ``{user_id: [{"moderator": id, "reason": str, "ts": iso}, ...]}``.
+    The records have no guild; pass a target guild to ``import_warnings``.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for user_id, entries in data.items():
+        for entry in entries:
+            yield {
+                "user_id": user_id,
+                "moderator_id": entry.get("moderator"),
+                "reason": entry.get("reason"),
+                "created_at": entry.get("ts"),
+                "revoked": False,
+            }
+
+
+def _parse_datetime(value: Any) -> datetime | None:
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def _normalize(record: dict[str, Any] | None, guild_id: int | None) -> dict[str, Any] | None:
+    """Converts a parsed record into ``Warn`` columns, or None if invalid."""
+    if not isinstance(record, dict):
+        return None
+    try:
+        row: dict[str, Any] = {}
+        for name in _INT_COLUMNS:
+            value = record.get(name)
+            row[name] = int(value) if value not in (None, "") else None
+        if guild_id is not None:
+            row["guild_id"] = guild_id
+        row["reason"] = str(record.get("reason") or "")[:512]
+        # Part of the natural key: a made-up timestamp would re-insert the
+        # record on every run, so records without one are rejected
+        row["created_at"] = _parse_datetime(record.get("created_at"))
+        row["revoked"] = _parse_bool(record.get("revoked", False))
+        revoke_reason = record.get("revoke_reason")
+        row["revoke_reason"] = str(revoke_reason)[:512] if revoke_reason not in (None, "") else None
+        row["revoked_at"] = _parse_datetime(record.get("revoked_at"))
+    except (TypeError, ValueError):
+        return None
+    if row["guild_id"] is None or row["user_id"] is None or row["moderator_id"] is None or row["created_at"] is None:
+        return None
+    return row
+
+
+def _key(row: dict[str, Any]) -> tuple[int, int, int, datetime, str]:
+    return WarnRepository.natural_key(
+        row["guild_id"], row["user_id"], row["moderator_id"], row["created_at"], row["reason"]
+    )
+
+
+async def _import_chunk(rows: list[dict[str, Any]], result: ImportResult) -> None:
+    async with database.get_session() as session:
+        repo = WarnRepository(session)
+        existing = await repo.existing_keys(
+            {row["guild_id"] for row in rows}, {row["user_id"] for row in rows}
+        )
+        fresh = []
+        for row in rows:
+            key = _key(row)
+            if key in existing:
+                result.skipped += 1
+                continue
+            existing.add(key)  # also dedupes within the chunk
+            fresh.append(row)
+        try:
+            result.inserted += await repo.bulk_insert(fresh)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def import_warnings(
+    records: Iterable[dict[str, Any] | None],
+    guild_id: int | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> ImportResult:
+    """
+    Imports records in chunks, one transaction per chunk.
+
+    Args:
+        records: Parsed records (see ``read_records``/``read_legacy_records``).
+        guild_id: Assign every warning to this guild (required for legacy
+            records, optional to remap an export to another guild).
+        batch_size: Records per chunk/transaction.
+
+    Returns:
+        Counts of inserted, skipped and invalid records.
+    """
+    result = ImportResult()
+    chunk: list[dict[str, Any]] = []
+    for record in records:
+        row = _normalize(record, guild_id)
+        if row is None:
+            result.invalid += 1
+            continue
+        chunk.append(row)
+        if len(chunk) >= batch_size:
+            await _import_chunk(chunk, result)
+            chunk = []
+    if chunk:
+        await _import_chunk(chunk, result)
+    logger.info("Warnings import finished: %s", result)
+    return result
+
+
+async def migrate_legacy_warnings(guild_id: int, path: str = LEGACY_WARNINGS_PATH) -> ImportResult:
+    """
+    Copies the legacy ``json_store`` warnings into SAM (idempotent).
+    """
+    # The legacy format is a single JSON document, so it is parsed in full
+    # (off the event loop) before the chunked insert.
+    records = await asyncio.to_thread(lambda: list(read_legacy_records(path)))
+    return await import_warnings(records, guild_id=guild_id)
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+def _format_for(path: str, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+async def _main(args: argparse.Namespace) -> int:
+    from . import migrations  # noqa - registers schema migrations
+
+    await database.init_db()
+    try:
+        if args.command == "export":
+            fmt = _format_for(args.output or "", args.format)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8", newline="") as out:
+                    count = await export_warnings(out, fmt, args.guild)
+            else:
+                count = await export_warnings(sys.stdout, fmt, args.guild)
+            print(f"Exported {count} warnings", file=sys.stderr)
+        elif args.command == "import":
+            fmt = _format_for(args.input, args.format)
+            with open(args.input, "r", encoding="utf-8", newline="") as source:
+                result = await import_warnings(read_records(source, fmt), args.guild, args.batch_size)
+            print(result, file=sys.stderr)
+        else:
+            result = await migrate_legacy_warnings(args.guild, args.path)
+            print(result, file=sys.stderr)
+    finally:
+        await database.dispose_engine()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export and import SAM warnings.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Stream warnings to NDJSON or CSV")
+    export.add_argument("-o", "--output", help="Output file (default: stdout)")
+    export.add_argument("-f", "--format", choices=FORMATS, help="Default: from the file extension, else ndjson")
+    export.add_argument("-g", "--guild", type=int, help="Only export this guild")
+
+    imp = sub.add_parser("import", help="Import an NDJSON or CSV export")
+    imp.add_argument("input", help="File to import")
+    imp.add_argument("-f", "--format", choices=FORMATS, help="Default: from the file extension, else ndjson")
+    imp.add_argument("-g", "--guild", type=int, help="Assign every warning to this guild")
+    imp.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    legacy = sub.add_parser("migrate-legacy", help="Copy json_store warnings into SAM")
+    legacy.add_argument("-g", "--guild", type=int, required=True, help="Guild the legacy warnings belong to")
+    legacy.add_argument("--path", default=LEGACY_WARNINGS_PATH)
+
+    return asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
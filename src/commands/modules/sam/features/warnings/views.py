@@ -0,0 +1,117 @@
+import math
+from datetime import datetime
+
+import discord  # type: ignore[import-not-found]
+
+from ...internal import database, logger_config
+from .models import Warn
+from .services import WarnService
+
+logger = logger_config.logger.getChild("warnings.views")
+
+PAGE_SIZE = 5
+
+
+class WarningsPaginator(discord.ui.View):
+    """
+    Browses a user's warning history one page at a time.
+
+    Only the boundary keys of the current page are kept; each button press
+    opens a session and fetches the neighbouring page by keyset, so the full
+    history is never loaded.
+    """
+
+    def __init__(
+        self,
+        service_class: type[WarnService],
+        user: discord.abc.User,
+        guild_id: int,
+        author_id: int,
+        active: int,
+        revoked: int,
+    ):
+        super().__init__(timeout=180)
+        self.service_class = service_class
+        self.user = user
+        self.guild_id = guild_id
+        self.author_id = author_id
+        self.active = active
+        self.revoked = revoked
+        self.page = 0
+        self.pages = max(1, math.ceil((active + revoked) / PAGE_SIZE))
+        self.first_key: tuple[datetime, int] | None = None
+        self.last_key: tuple[datetime, int] | None = None
+        self.message: discord.Message | None = None
+
+    async def load_page(
+        self,
+        *,
+        after: tuple[datetime, int] | None = None,
+        before: tuple[datetime, int] | None = None,
+    ) -> list[Warn]:
+        async with database.get_session() as session:
+            svc = self.service_class(session)
+            warnings = await svc.get_warnings_page(
+                self.user.id, self.guild_id, after=after, before=before, limit=PAGE_SIZE
+            )
+        if warnings:
+            self.first_key = (warnings[0].created_at, warnings[0].id)
+            self.last_key = (warnings[-1].created_at, warnings[-1].id)
+        self._update_buttons(bool(warnings))
+        return warnings
+
+    def _update_buttons(self, has_rows: bool) -> None:
+        self.newer_page.disabled = self.page == 0
+        self.older_page.disabled = not has_rows or self.page >= self.pages - 1
+
+    def build_embed(self, warnings: list[Warn]) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"Warnings for {self.user.name}",
+            description="\n".join(str(w) for w in warnings)[:4096] or "No warnings on this page.",
+            color=discord.Color.orange() if self.active else discord.Color.green(),
+        )
+        embed.add_field(
+            name="Total Warnings",
+            value=f"**{self.active}** active • **{self.revoked}** revoked",
+            inline=False,
+        )
+        embed.set_footer(text=f"Page {self.page + 1}/{self.pages} • Newest first")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "Only the moderator who ran this command can change pages.", ephemeral=True
+            )
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction, warnings: list[Warn]) -> None:
+        try:
+            await interaction.response.edit_message(embed=self.build_embed(warnings), view=self)
+        except (discord.NotFound, discord.HTTPException) as e:
+            logger.warning(f"Could not edit warnings page: {e}")
+
+    @discord.ui.button(label="◀ Newer", style=discord.ButtonStyle.primary)
+    async def newer_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(self.page - 1, 0)
+        if self.page == 0 or self.first_key is None:
+            warnings = await self.load_page()
+        else:
+            warnings = await self.load_page(before=self.first_key)
+        await self._show(interaction, warnings)
+
+    @discord.ui.button(label="Older ▶", style=discord.ButtonStyle.primary)
+    async def older_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = min(self.page + 1, self.pages - 1)
+        warnings = await self.load_page(after=self.last_key)
+        await self._show(interaction, warnings)
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except Exception:
+                pass
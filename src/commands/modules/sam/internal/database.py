@@ -1,9 +1,13 @@
+from collections.abc import Callable
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, make_url
 from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
                                     create_async_engine)
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlmodel import SQLModel
 
 from ..config import config
@@ -11,27 +15,133 @@ from ..internal import logger_config
 
 logger = logger_config.logger.getChild("database")
 
+
+def _engine_options(uri: str) -> dict[str, Any]:
+    """
+    Pool settings for the configured backend.
+
+    In-memory SQLite needs a single shared connection (every new connection
+    would be a new, empty database). File-backed SQLite and the network
+    databases use a bounded queue pool so sessions reuse connections instead
+    of reconnecting; network connections are also pre-pinged and recycled
+    so idle ones dropped by the server are not handed out.
+    """
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return {"poolclass": StaticPool}
+        return {
+            "pool_size": config.pool_size,
+            "max_overflow": config.max_overflow,
+            "pool_timeout": config.pool_timeout,
+            # Seconds the driver waits on a locked database before raising
+            "connect_args": {"timeout": config.sqlite_busy_timeout_ms / 1000},
+        }
+    return {
+        "pool_size": config.pool_size,
+        "max_overflow": config.max_overflow,
+        "pool_timeout": config.pool_timeout,
+        "pool_recycle": config.pool_recycle,
+        "pool_pre_ping": True,
+    }
+
+
 engine: AsyncEngine = create_async_engine(
-    str(config.database_uri), echo=False, future=True
+    str(config.database_uri), echo=False, future=True, **_engine_options(str(config.database_uri))
 )
 
 if ":memory:" in str(config.database_uri):
     logger.warning("Database is in-memory, data will be lost on restart!")
 
+
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        Configures every new SQLite connection.
+
+        WAL lets readers run alongside the single writer, synchronous=NORMAL
+        is durable under WAL while avoiding an fsync on every commit, and
+        busy_timeout makes concurrent writers wait instead of failing with
+        "database is locked".
+        """
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}")
+            # Negative cache_size is in KiB rather than pages
+            cursor.execute(f"PRAGMA cache_size=-{int(config.sqlite_cache_size_kib)}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        finally:
+            cursor.close()
+
 # Create sessionmaker globally
 async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 # Allow hot-reloading of the extension (cog reload via ?load)
 SQLModel.__table_args__ = {"extend_existing": True}  # type: ignore
 
+# Schema upgrades for existing databases, run in registration order by init_db
+_migrations: dict[str, Callable[[Connection], None]] = {}
+
+
+def migration(name: str):
+    """
+    Registers a schema migration.
+
+    ``create_all`` only creates missing tables, so changes to existing tables
+    (new indexes, backfills) are registered here. Migrations receive a sync
+    connection inside init_db's transaction and must be idempotent.
+    """
+    def decorator(func: Callable[[Connection], None]) -> Callable[[Connection], None]:
+        _migrations[name] = func
+        return func
+    return decorator
+
+
 async def init_db():
     """
-    Initializes the database by creating all tables.
+    Initializes the database by creating all tables and running migrations.
 
     This is an idempotent operation, and can be safely called multiple times.
     """
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        for name, func in _migrations.items():
+            await conn.run_sync(func)
+            logger.debug("Applied migration %s", name)
+
+
+def pool_stats() -> dict[str, Any]:
+    """
+    Returns a snapshot of the connection pool.
+
+    ``size``, ``checked_out``, ``checked_in`` and ``overflow`` are only
+    available for queue pools; every pool reports its class name.
+    """
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool": type(pool).__name__, "dialect": engine.dialect.name}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=config.max_overflow,
+        )
+    return stats
+
+
+async def dispose_engine():
+    """
+    Closes every pooled connection (call on shutdown).
+
+    For SQLite this lets the last connection checkpoint and truncate the
+    WAL file.
+    """
+    await engine.dispose()
 
 
 @asynccontextmanager
@@ -28,41 +28,46 @@ Example log consumer deregistration:
 ```py
 logging_api.disconnect(my_consumer)
 ```
+
+``log`` only enqueues the action into a bounded queue and returns; a
+background worker delivers it to every callback concurrently, so a slow
+consumer never delays the command that logged. A failing callback is logged
+and does not affect the others. When the queue is full new actions are
+dropped (and counted) rather than blocking the caller. Call ``shutdown`` (or
+``flush``) before the bot closes to deliver what is still queued.
 """
 
-from datetime import datetime, timezone
+import asyncio
 from collections.abc import Awaitable, Callable
-from typing import Any
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from ..internal import logger_config
 
+logger = logger_config.logger.getChild("logging_api")
 
+MAX_QUEUE_SIZE = 1000
+
+
+@dataclass(slots=True)
 class LogField:
     name: str
     value: str
-    inline: bool
-
-    def __init__(self, name: str, value: str, inline: bool = False) -> None:
-        self.name = name
-        self.value = value
-        self.inline = inline
+    inline: bool = False
 
 
+@dataclass(slots=True)
 class LogAction:
     title: str
     description: str
-    fields: list[LogField]
-    timestamp: datetime
-
-    def __init__(
-        self,
-        title: str,
-        description: str,
-        fields: list[LogField] | None = None,
-        timestamp: datetime | None = None,
-    ) -> None:
-        self.title = title
-        self.description = description
-        self.fields = fields or []
-        self.timestamp = timestamp or datetime.now(tz=timezone.utc)
+    fields: list[LogField] | None = None
+    timestamp: datetime | None = None
+
+    def __post_init__(self) -> None:
+        if self.fields is None:
+            self.fields = []
+        if self.timestamp is None:
+            self.timestamp = datetime.now(tz=timezone.utc)
 
     def add_field(self, field: LogField) -> "LogAction":
         self.fields.append(field)
@@ -71,16 +76,96 @@ class LogAction:
 
 callbacks: list[Callable[[LogAction], Awaitable[None]]] = []
 
+_queue: asyncio.Queue[LogAction] | None = None
+_worker: asyncio.Task | None = None
+_stats = {"queued": 0, "delivered": 0, "dropped": 0, "failed": 0}
+
 
 async def log(action: LogAction) -> None:
     """
     Logs the given action to the logging system.
 
+    The action is queued for delivery and this returns immediately.
+
     Args:
         action: The action to log.
     """
-    for callback in callbacks:
+    global _queue, _worker
+    if not callbacks:
+        return
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
+    if _worker is None or _worker.done():
+        _worker = asyncio.get_running_loop().create_task(_drain())
+    try:
+        _queue.put_nowait(action)
+        _stats["queued"] += 1
+    except asyncio.QueueFull:
+        _stats["dropped"] += 1
+        logger.warning("Log queue full, dropped action: %s", action.title)
+
+
+async def _deliver(callback: Callable[[LogAction], Awaitable[None]], action: LogAction) -> None:
+    try:
         await callback(action)
+        _stats["delivered"] += 1
+    except Exception:
+        _stats["failed"] += 1
+        logger.exception("Log callback %r failed for action: %s", callback, action.title)
+
+
+async def _drain() -> None:
+    assert _queue is not None
+    while True:
+        action = await _queue.get()
+        try:
+            await asyncio.gather(*(_deliver(callback, action) for callback in list(callbacks)))
+        finally:
+            _queue.task_done()
+
+
+async def flush(timeout: float = 5.0) -> bool:
+    """
+    Waits until every queued action has been delivered.
+
+    Args:
+        timeout: Maximum seconds to wait.
+
+    Returns:
+        True if the queue was drained, False on timeout.
+    """
+    if _queue is None or _worker is None or _worker.done():
+        return _queue is None or _queue.empty()
+    try:
+        await asyncio.wait_for(_queue.join(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def shutdown(timeout: float = 5.0) -> None:
+    """
+    Flushes the queue and stops the background worker.
+
+    Args:
+        timeout: Maximum seconds to wait for queued actions.
+    """
+    global _worker
+    if not await flush(timeout):
+        logger.warning("Log queue not drained on shutdown (%s pending)", _queue.qsize() if _queue else 0)
+    if _worker is not None:
+        _worker.cancel()
+        _worker = None
+
+
+def queue_depth() -> int:
+    """Returns the number of actions waiting for delivery."""
+    return _queue.qsize() if _queue is not None else 0
+
+
+def stats() -> dict[str, int]:
+    """Returns queued/delivered/dropped/failed counters."""
+    return dict(_stats)
 
 
 def connect(callback: Callable[[LogAction], Awaitable[None]]) -> None:
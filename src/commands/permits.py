@@ -1,3 +1,4 @@
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -180,7 +181,10 @@ class PermitListPaginator(discord.ui.View):
 class PermitSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self._init_db()
+
+    async def cog_load(self):
+        # Blocking SQLite setup runs off the event loop during startup.
+        await asyncio.to_thread(self._init_db)
 
     def _init_db(self):
         conn = sqlite3.connect(DATABASE_NAME)
@@ -1,3 +1,4 @@
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -8,6 +9,8 @@ import logging
 import sqlite3
 from datetime import datetime, timezone
 
+from utils.memory_diagnostics import register_cache, unregister_cache
+
 logger = logging.getLogger(__name__)
 
 class ReactionRoles(commands.Cog):
@@ -20,9 +23,16 @@ class ReactionRoles(commands.Cog):
         # src/commands -> src -> root
         self.root_dir = os.path.dirname(os.path.dirname(current_dir))
         self.data_file = os.path.join(self.root_dir, "data", "reaction_roles.db")
-        
-        self.init_db()
-        self.reaction_roles = self.load_reaction_roles()
+        self.reaction_roles = {}
+        register_cache("reaction_roles.messages", lambda: self.reaction_roles)
+
+    async def cog_load(self):
+        # Blocking SQLite setup runs off the event loop during startup.
+        await asyncio.to_thread(self.init_db)
+        self.reaction_roles = await asyncio.to_thread(self.load_reaction_roles)
+
+    def cog_unload(self):
+        unregister_cache("reaction_roles.messages")
     
     def init_db(self):
         """Initialize the SQLite database and migrate if needed"""
@@ -1,9 +1,21 @@
 
-"""Auto-timeout channel protection cog.
+"""Auto-timeout channel protection and spam detection cog.
 
-This module applies a timeout to users who send messages in a protected channel.
+This module applies a timeout to users who send messages in a protected channel,
+and to users whose recent messages look like spam in any authorized guild.
 We log extensively so the bot owner can see a clear audit trail and debug info
 when events occur.
+
+Spam detection keeps one ``UserActivity`` record per (guild, user) with three
+sliding windows: message timestamps, mention counts and content fingerprints.
+Every window has a fixed maximum length, so checking a message costs O(1)
+regardless of guild size. Fingerprints are hashes of the normalized text
+(exact duplicates) and of its set of words (near duplicates: reordered,
+re-cased, or with different numbers/punctuation). Only messages with at least
+``NEAR_DUPLICATE_MIN_WORDS`` distinct words get a near fingerprint, so short
+progress chatter ("step 1 done", "step 2 done") is never counted as copies.
+Records of users who have been quiet for ``ACTIVITY_TTL`` seconds are evicted
+oldest first.
 """
 import traceback
 import logging
@@ -12,36 +24,214 @@ try:
     import discord
     from discord.ext import commands
     from datetime import timedelta
+    import re
+    import time
+    import unicodedata
+    from collections import Counter, OrderedDict, deque
 
     # Configure a logger for this module - the bot's main app should configure handlers.
     logger = logging.getLogger("codeverse.spam_catch")
 
-    from config import PROTECTED_CHANNEL_ID
+    from config import AUTHORIZED_GUILD_IDS, PROTECTED_CHANNEL_ID
+    from utils.memory_diagnostics import register_cache, unregister_prefix
+    from utils.metrics import counter, gauge, register_collector, unregister_collector
     TIMEOUT_DAYS = 10  # Use a 10-day timeout instead of a ban
 
+    # Spam detection thresholds
+    SPAM_TIMEOUT = timedelta(hours=1)
+    RATE_LIMIT = 8           # more messages than this ...
+    RATE_WINDOW = 10.0       # ... within this many seconds
+    MENTION_LIMIT = 10       # user/role/everyone mentions ...
+    MENTION_WINDOW = 30.0    # ... within this many seconds
+    DUPLICATE_LIMIT = 4      # copies of the same (or nearly the same) message ...
+    DUPLICATE_WINDOW = 60.0  # ... within this many seconds
+    DUPLICATE_MIN_LENGTH = 10  # shorter messages ("ok", "lol") are never duplicates
+    NEAR_DUPLICATE_MIN_WORDS = 4  # fewer distinct words: exact copies only
+    DUPLICATE_HISTORY = 8    # fingerprints kept per member
+    FINGERPRINT_CHARS = 512  # only the start of long messages is fingerprinted
+    ACTIVITY_TTL = 120.0     # forget users idle this long
+    MAX_TRACKED = 50000
+
+    _ZERO_WIDTH = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff"))
+    _WORD_RE = re.compile(r"[^\W\d_]{2,}")
+
+    def fingerprint(content: str) -> tuple[int, int | None] | None:
+        """``(exact, near)`` hashes of a message, or None if it is too short.
+
+        ``exact`` covers the case-folded text with whitespace collapsed;
+        ``near`` the set of its words (letters only), so reordering, digits
+        and punctuation do not change it. ``near`` is None for messages with
+        fewer than ``NEAR_DUPLICATE_MIN_WORDS`` distinct words, whose word
+        sets are too small to tell spam from ordinary repetition.
+        """
+        text = unicodedata.normalize("NFKC", content[:FINGERPRINT_CHARS]).casefold()
+        text = " ".join(text.translate(_ZERO_WIDTH).split())
+        if len(text) < DUPLICATE_MIN_LENGTH:
+            return None
+        words = frozenset(_WORD_RE.findall(text))
+        return hash(text), hash(words) if len(words) >= NEAR_DUPLICATE_MIN_WORDS else None
+
+    class UserActivity:
+        """Sliding windows for one member (fixed-size ring buffers, O(1) per message)."""
+
+        __slots__ = ("last_seen", "times", "pos", "mentions", "mention_total", "fingerprints", "fp_pos", "flagged_until")
+
+        def __init__(self) -> None:
+            self.last_seen = 0.0
+            # Last RATE_LIMIT message times; pos is the oldest slot
+            self.times = [float("-inf")] * RATE_LIMIT
+            self.pos = 0
+            # (time, count) of recent mentioning messages; created on first mention
+            self.mentions: deque[tuple[float, int]] | None = None
+            self.mention_total = 0
+            # (time, exact, near) of the last few fingerprinted messages
+            self.fingerprints: list[tuple[float, int, int | None] | None] = [None] * DUPLICATE_HISTORY
+            self.fp_pos = 0
+            self.flagged_until = 0.0
+
+        def reset(self) -> None:
+            self.times = [float("-inf")] * RATE_LIMIT
+            self.mentions = None
+            self.mention_total = 0
+            self.fingerprints = [None] * DUPLICATE_HISTORY
+
+        def observe(self, now: float, mentions: int, fp: tuple[int, int | None] | None) -> str | None:
+            """Record a message; returns the rule it broke, if any."""
+            self.last_seen = now
+
+            # Message rate: the slot being replaced held the message RATE_LIMIT
+            # messages ago; if that is inside the window, this one is over the limit
+            oldest = self.times[self.pos]
+            self.times[self.pos] = now
+            self.pos = (self.pos + 1) % RATE_LIMIT
+            if now - oldest <= RATE_WINDOW:
+                return "rate"
+
+            # Mentions: running total over the window
+            if mentions:
+                if self.mentions is None:
+                    self.mentions = deque(maxlen=MENTION_LIMIT)
+                elif len(self.mentions) == MENTION_LIMIT:
+                    self.mention_total -= self.mentions[0][1]
+                self.mentions.append((now, mentions))
+                self.mention_total += mentions
+            if self.mentions:
+                while self.mentions and now - self.mentions[0][0] > MENTION_WINDOW:
+                    self.mention_total -= self.mentions.popleft()[1]
+                if self.mention_total >= MENTION_LIMIT:
+                    return "mentions"
+
+            # Duplicates: compare against the last few fingerprints
+            if fp is not None:
+                exact, near = fp
+                copies = 1
+                for entry in self.fingerprints:
+                    if entry is None or now - entry[0] > DUPLICATE_WINDOW:
+                        continue
+                    if entry[1] == exact or (near is not None and entry[2] == near):
+                        copies += 1
+                self.fingerprints[self.fp_pos] = (now, exact, near)
+                self.fp_pos = (self.fp_pos + 1) % DUPLICATE_HISTORY
+                if copies >= DUPLICATE_LIMIT:
+                    return "duplicates"
+            return None
+
+    class SpamDetector:
+        """Per-(guild, user) activity records with TTL eviction."""
+
+        def __init__(self) -> None:
+            # Least recently active first (OrderedDict: O(1) move_to_end/popitem)
+            self.activity: OrderedDict[tuple[int, int], UserActivity] = OrderedDict()
+            self.inspected = 0
+            self.detections: Counter = Counter()
+
+        def check(self, guild_id: int, user_id: int, mentions: int, content: str, now: float | None = None) -> str | None:
+            now = time.monotonic() if now is None else now
+            self.inspected += 1
+            key = (guild_id, user_id)
+            record = self.activity.get(key)
+            if record is None:
+                record = self.activity[key] = UserActivity()
+            else:
+                self.activity.move_to_end(key)
+            record.last_seen = now
+            self._evict(now)
+
+            if record.flagged_until > now:
+                return None  # already being handled
+            reason = record.observe(now, mentions, fingerprint(content) if content else None)
+            if reason is not None:
+                self.detections[reason] += 1
+                record.flagged_until = now + RATE_WINDOW
+                record.reset()
+            return reason
+
+        def _evict(self, now: float) -> None:
+            # Oldest records sit at the front; stop at the first fresh one
+            activity = self.activity
+            while activity:
+                key = next(iter(activity))
+                if len(activity) <= MAX_TRACKED and now - activity[key].last_seen < ACTIVITY_TTL:
+                    break
+                activity.popitem(last=False)
+
     class AutoBanChannel(commands.Cog):
         def __init__(self, bot):
             self.bot = bot
+            self.detector = SpamDetector()
+            register_cache("spam_catch.activity", self.detector.activity)
 
-        @commands.Cog.listener()
-        async def on_message(self, message: discord.Message):
-            """If a non-bot user posts in the protected channel, apply a timeout.
+        async def cog_load(self):
+            router = self.bot.message_router
+            # Only messages in the protected channel are routed here
+            router.subscribe_channel(PROTECTED_CHANNEL_ID, "spam_catch", self.on_protected_message)
+            # Every message in the authorized guilds goes through the spam detector
+            for guild_id in AUTHORIZED_GUILD_IDS:
+                router.subscribe_guild(guild_id, "spam_detector", self.on_guild_message)
+            register_collector("spam_detector", self._metrics)
 
-            Extensive logging is included for debugging and auditing purposes.
-            """
-            # Ignore bot messages
-            if message.author.bot:
-                return
+        async def cog_unload(self):
+            self.bot.message_router.unsubscribe("spam_catch")
+            self.bot.message_router.unsubscribe("spam_detector")
+            unregister_collector("spam_detector")
+            unregister_prefix("spam_catch.")
+
+        def _metrics(self, bot):
+            detector = self.detector
+            yield counter("spam_messages_inspected_total", "Messages checked by the spam detector.", detector.inspected)
+            yield gauge("spam_tracked_users", "Members with live spam-detection windows.", len(detector.activity))
+            detections = counter("spam_detections_total", "Spam detections by rule.")
+            for reason in ("rate", "mentions", "duplicates"):
+                detections.add(detector.detections[reason], reason=reason)
+            yield detections
 
-            # Safely get channel id (DMs may not have id)
-            channel = getattr(message, 'channel', None)
-            channel_id = getattr(channel, 'id', None)
-            if channel_id is None:
-                logger.debug("Received message with no channel id; ignoring")
+        async def on_guild_message(self, message: discord.Message):
+            """Run the spam detector on a guild message (O(1) per message)."""
+            if message.channel.id == PROTECTED_CHANNEL_ID:
+                return  # the honeypot handler already times these users out
+            mentions = len(message.mentions) + len(message.role_mentions) + int(message.mention_everyone)
+            reason = self.detector.check(message.guild.id, message.author.id, mentions, message.content)
+            if reason is None:
                 return
 
-            if channel_id != PROTECTED_CHANNEL_ID:
+            member = message.author
+            perms = getattr(member, "guild_permissions", None)
+            if perms is not None and (perms.manage_messages or perms.moderate_members):
+                logger.debug("Spam rule %s tripped by staff user_id=%s; ignoring", reason, member.id)
                 return
+            logger.info(
+                "Spam detected (%s): user=%s user_id=%s guild_id=%s channel_id=%s",
+                reason, getattr(member, 'name', None), member.id, message.guild.id, message.channel.id,
+            )
+            await self._timeout_author(message, SPAM_TIMEOUT, f"Automatic spam detection ({reason})")
+
+        async def on_protected_message(self, message: discord.Message):
+            """If a non-bot user posts in the protected channel, apply a timeout.
+
+            The message router has already filtered out bots and DMs.
+            Extensive logging is included for debugging and auditing purposes.
+            """
+            channel_id = message.channel.id
 
             # Prepare context for logging
             guild = message.guild
@@ -58,19 +248,20 @@ try:
                 content_preview,
             )
 
-            if guild is None:
-                logger.warning("Message in protected channel came from outside a guild; skipping timeout")
-                return
+            await self._timeout_author(message, timedelta(days=TIMEOUT_DAYS), "Message sent in protected channel")
 
+        async def _timeout_author(self, message: discord.Message, duration: timedelta, reason: str):
+            """Time out the message author and delete the message (shared by both rules)."""
+            guild = message.guild
+            user = message.author
             try:
                 member = guild.get_member(user.id)
                 if member is None:
                     logger.warning("Could not resolve Member for user_id=%s in guild_id=%s", user.id, guild.id)
                     return
 
-                duration = timedelta(days=TIMEOUT_DAYS)
                 logger.debug("Attempting to apply timeout: user_id=%s duration=%s", member.id, duration)
-                await member.timeout(duration, reason="Message sent in protected channel")
+                await member.timeout(duration, reason=reason)
 
                 try:
                     await message.delete()
@@ -84,7 +275,7 @@ try:
             except discord.Forbidden:
                 logger.exception("Missing permissions to timeout/delete in guild_id=%s", getattr(guild, 'id', None))
             except Exception:
-                logger.exception("Unexpected error while processing protected-channel event for guild_id=%s", getattr(guild, 'id', None))
+                logger.exception("Unexpected error while applying timeout (%s) for guild_id=%s", reason, getattr(guild, 'id', None))
 
     async def setup(bot):
         await bot.add_cog(AutoBanChannel(bot))
@@ -8,6 +8,7 @@ import time
 from typing import Optional
 
 from utils.helpers import safe_interaction_reply, sanitize_mentions
+from utils.memory_diagnostics import register_cache, unregister_prefix
 
 logger = logging.getLogger("codeverse.sticky_message")
 
@@ -87,12 +88,8 @@ class StickyMessageModal(discord.ui.Modal):
             conn.commit()
             conn.close()
 
-            # Update cache
-            self.cog._message_cache[self.channel.id] = {
-                'content': text,
-                'message_id': sticky_msg.id,
-                'last_repost': time.monotonic()
-            }
+            # Update cache and start routing this channel's messages
+            self.cog._track_sticky(self.channel.id, text, sticky_msg.id, time.monotonic())
 
             # Send confirmation
             embed = discord.Embed(
@@ -134,6 +131,8 @@ class StickyMessage(commands.Cog):
         init_sticky_db()
         self._message_cache = {}  # Cache to prevent spam
         self._cooldowns = {}  # Per-channel cooldowns
+        register_cache("sticky.messages", lambda: self._message_cache)
+        register_cache("sticky.cooldowns", lambda: self._cooldowns)
         
         # Load all sticky messages on startup
         self.bot.loop.create_task(self._load_sticky_messages())
@@ -155,17 +154,26 @@ class StickyMessage(commands.Cog):
             conn.close()
             
             for channel_id, content, message_id in results:
-                self._message_cache[channel_id] = {
-                    'content': content,
-                    'message_id': message_id,
-                    'last_repost': 0
-                }
+                self._track_sticky(channel_id, content, message_id)
             
             print(f"[StickyMessage] Loaded {len(results)} sticky messages into cache")
             
         except Exception as e:
             print(f"[StickyMessage] Error loading sticky messages: {e}")
 
+    def _track_sticky(self, channel_id: int, content: str, message_id: Optional[int], last_repost: float = 0):
+        """Cache a sticky message and subscribe to its channel's messages"""
+        self._message_cache[channel_id] = {
+            'content': content,
+            'message_id': message_id,
+            'last_repost': last_repost
+        }
+        self.bot.message_router.subscribe_channel(channel_id, "sticky", self._on_channel_message)
+
+    def _untrack_sticky(self, channel_id: int):
+        self._message_cache.pop(channel_id, None)
+        self.bot.message_router.unsubscribe_channel(channel_id, "sticky")
+
     @commands.hybrid_command(name="stickymessage")
     @commands.has_permissions(manage_messages=True)
     @commands.guild_only()
@@ -287,9 +295,8 @@ class StickyMessage(commands.Cog):
             conn.commit()
             conn.close()
             
-            # Remove from cache
-            if target_channel.id in self._message_cache:
-                del self._message_cache[target_channel.id]
+            # Remove from cache and stop routing the channel here
+            self._untrack_sticky(target_channel.id)
             
             # Try to delete the actual message
             try:
@@ -377,40 +384,16 @@ class StickyMessage(commands.Cog):
             )
             await ctx.send(embed=embed)
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Handle message events to repost sticky messages"""
-        
-        # Ignore bot messages and DMs
-        if message.author.bot or not message.guild:
-            return
-        
-        # Check if this channel has a sticky message
+    async def _on_channel_message(self, message):
+        """Repost the sticky message after a user message in a sticky channel.
+
+        Only channels with a sticky message are routed here, and the router
+        has already dropped bot messages and DMs.
+        """
         channel_id = message.channel.id
-        
-        # Check cache first
         if channel_id not in self._message_cache:
-            # Load from database
-            conn = sqlite3.connect(DATABASE_NAME)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT message_content, message_id 
-                FROM sticky_messages 
-                WHERE guild_id = ? AND channel_id = ?
-            ''', (message.guild.id, channel_id))
-            result = cursor.fetchone()
-            conn.close()
-            
-            if not result:
-                return
-            
-            # Cache the result
-            self._message_cache[channel_id] = {
-                'content': result[0],
-                'message_id': result[1],
-                'last_repost': 0
-            }
-        
+            return
+
         sticky_data = self._message_cache[channel_id]
         
         # Don't repost if this message IS the sticky message
@@ -468,6 +451,8 @@ class StickyMessage(commands.Cog):
 
     async def cog_unload(self):
         """Clean up when cog is unloaded"""
+        unregister_prefix("sticky.")
+        self.bot.message_router.unsubscribe("sticky")
         self._message_cache.clear()
         self._cooldowns.clear()
 
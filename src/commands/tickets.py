@@ -12,10 +12,14 @@ from discord.ext import commands
 from utils.database import DATABASE_NAME
 from utils.embeds import create_error_embed, create_info_embed, create_success_embed
 from utils.helpers import safe_interaction_reply
+from utils.rate_limit import get_rate_limiter
 from config import STAFF_ROLE_ID, ADMIN_BYPASS_ROLE_ID, TICKET_LOGS_CHANNEL_ID
 
 logger = logging.getLogger("codeverse.tickets")
 
+# Ticket creation is button-driven, so the shared limiter is applied directly.
+TICKET_CREATE_LIMITER = get_rate_limiter("ticket_create", 3, 600)
+
 # Named colors accepted by the ticket panel command. Each maps to a hex value;
 # users can also pass any raw hex code like #00ff00 or 00ff00.
 TICKET_NAMED_COLORS: dict[str, int] = {
@@ -227,7 +231,6 @@ class Tickets(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self._pending_deletion_tasks: dict[int, asyncio.Task] = {}
-        self._init_database()
 
         # Configuration
         self.ticket_channel_id: Optional[int] = (
@@ -236,11 +239,16 @@ class Tickets(commands.Cog):
         self.staff_role_id: int = STAFF_ROLE_ID
         self.admin_bypass_role_id: int = ADMIN_BYPASS_ROLE_ID
 
-        self.ticket_counter = self._get_ticket_counter()
+        self.ticket_counter = 1
 
         self.bot.loop.create_task(self._restore_persistent_views())
         self.bot.loop.create_task(self._restore_pending_ticket_deletions())
 
+    async def cog_load(self):
+        # Blocking SQLite setup runs off the event loop during startup.
+        await asyncio.to_thread(self._init_database)
+        self.ticket_counter = await asyncio.to_thread(self._get_ticket_counter)
+
     def cog_unload(self):
         for task in self._pending_deletion_tasks.values():
             if not task.done():
@@ -763,6 +771,17 @@ class Tickets(commands.Cog):
         guild = interaction.guild
         user = interaction.user
 
+        retry_after = TICKET_CREATE_LIMITER.hit((guild.id, user.id))
+        if retry_after:
+            await interaction.followup.send(
+                embed=create_error_embed(
+                    "Slow Down",
+                    f"You are creating tickets too quickly. Try again in {retry_after:.0f}s.",
+                ),
+                ephemeral=True,
+            )
+            return
+
         category_info = {
             "partnership": ("", "Partnership"),
             "support": ("", "General Support"),
@@ -7,6 +7,8 @@ import re
 from datetime import datetime, timezone
 
 from utils.helpers import safe_interaction_reply, sanitize_mentions
+from utils.memory_diagnostics import register_cache, unregister_cache
+from utils.permission_index import PermissionIndexCache, match_permission, permission_candidates, resolve_permission
 
 class EmbedEditModal(discord.ui.Modal):
     """Interactive modal for editing existing embeds"""
@@ -306,6 +308,12 @@ class EmbedBuilder(commands.Cog):
             "teal": discord.Color.teal(),
             "magenta": discord.Color.magenta(),
         }
+        # Channel × role permission matrix for the ?ls audit commands
+        self.permission_index = PermissionIndexCache()
+        register_cache("embed_builder.permission_index", self.permission_index)
+
+    def cog_unload(self):
+        unregister_cache("embed_builder.permission_index")
 
     @app_commands.command(
         name="embed",
@@ -460,6 +468,71 @@ class EmbedBuilder(commands.Cog):
 
     # embedrules command has been removed
 
+    # ------------------------------------------------------------------
+    # Permission audit index (?ls) - kept current from channel/role events
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _resolve_roles(guild: discord.Guild, role_ids) -> list[discord.Role]:
+        roles = (guild.get_role(role_id) for role_id in role_ids)
+        return [role for role in roles if role is not None]
+
+    def _channels_where(self, guild: discord.Guild, target, perm_attr: str, *, categories: bool) -> list:
+        """Channels (or categories) where ``target`` has ``perm_attr``, by position."""
+        if isinstance(target, discord.Role):
+            index = self.permission_index.get(guild)
+            channels = (guild.get_channel(cid) for cid in index.channels_with(target.id, perm_attr, categories=categories))
+            matched = [c for c in channels if c is not None]
+        else:
+            # Members depend on member overwrites and role combinations; resolve directly.
+            pool = guild.categories if categories else [
+                c for c in guild.channels if not isinstance(c, discord.CategoryChannel)
+            ]
+            matched = [c for c in pool if getattr(c.permissions_for(target), perm_attr, False)]
+        matched.sort(key=lambda c: c.position)
+        return matched
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        index = self.permission_index.peek(channel.guild.id)
+        if index is not None:
+            index.update_channel(channel.guild, channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        index = self.permission_index.peek(after.guild.id)
+        if index is not None:
+            index.update_channel(after.guild, after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        index = self.permission_index.peek(channel.guild.id)
+        if index is not None:
+            index.remove_channel(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        index = self.permission_index.peek(role.guild.id)
+        if index is not None:
+            index.update_role(role.guild, role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        if before.permissions == after.permissions:
+            return  # Name/colour/position changes don't affect the matrix
+        index = self.permission_index.peek(after.guild.id)
+        if index is not None:
+            index.update_role(after.guild, after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        index = self.permission_index.peek(role.guild.id)
+        if index is not None:
+            index.remove_role(role.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.permission_index.invalidate(guild.id)
+
     @commands.group(name="ls", invoke_without_command=True)
     async def ls_command(self, ctx):
         """List utilities for the server"""
@@ -557,37 +630,28 @@ class EmbedBuilder(commands.Cog):
     @ls_command.command(name="perm")
     async def ls_perm(self, ctx, *, perm_query: str):
         """List roles that have a specific permission"""
-        # Normalize query
-        query = perm_query.lower().replace(" ", "_")
+        # Find match (snake_case or squashed permission name)
+        matched_perm = match_permission(perm_query, aliases=False)
         
-        # Valid permissions map
-        valid_perms = dir(discord.Permissions.none())
-        
-        # Find match
-        matched_perm = None
-        for p in valid_perms:
-            if p.startswith("_") or callable(getattr(discord.Permissions, p, None)):
-                continue
-            if p == query or p.replace("_", "") == query.replace("_", ""):
-                matched_perm = p
-                break
+        if not matched_perm:
+            # Fuzzy-ish fallback: a partial match is only used when it is unambiguous
+            matches = permission_candidates(perm_query)
+            if len(matches) == 1:
+                matched_perm = matches[0]
+            elif not matches:
+                # Shorthand aliases that are not part of any name ("image", "embeds")
+                matched_perm = match_permission(perm_query)
         
         if not matched_perm:
-            # Fuzzy-ish fallback
-            matches = [p for p in valid_perms if not p.startswith("_") and query in p]
             if matches:
                  await ctx.send(f"Permission `{perm_query}` not found. Did you mean: {', '.join(matches[:5])}?")
             else:
                  await ctx.send(f"Permission `{perm_query}` not found.")
             return
 
-        # Find roles
-        roles_with_perm = []
-        for role in ctx.guild.roles:
-            if role.is_default(): continue
-            # Administrator implies all permissions
-            if role.permissions.administrator or getattr(role.permissions, matched_perm):
-                roles_with_perm.append(role)
+        # Find roles (bitmask scan; Administrator implies all permissions)
+        index = self.permission_index.get(ctx.guild)
+        roles_with_perm = self._resolve_roles(ctx.guild, index.roles_with(matched_perm))
         
         roles_with_perm.sort(key=lambda r: r.position, reverse=True)
         
@@ -620,12 +684,9 @@ class EmbedBuilder(commands.Cog):
     @ls_command.command(name="noperms")
     async def ls_noperms(self, ctx):
         """List cosmetic roles (no permissions at all)"""
-        roles = []
-        for role in ctx.guild.roles:
-            if role.is_default(): continue # Skip @everyone
-            # Check if role has NO permissions
-            if role.permissions.value == 0:
-                roles.append(role)
+        # Roles with a zero permission value (@everyone skipped)
+        index = self.permission_index.get(ctx.guild)
+        roles = self._resolve_roles(ctx.guild, index.roles_without_permissions())
         
         # Sort by position (reverse = highest first)
         roles.sort(key=lambda r: r.position, reverse=True)
@@ -691,11 +752,8 @@ class EmbedBuilder(commands.Cog):
             return
 
         # List all roles with permissions
-        roles = []
-        for r in ctx.guild.roles:
-            if r.is_default(): continue
-            if r.permissions.value != 0:
-                roles.append(r)
+        index = self.permission_index.get(ctx.guild)
+        roles = self._resolve_roles(ctx.guild, index.roles_with_any_permission())
         
         roles.sort(key=lambda r: r.position, reverse=True)
         
@@ -766,91 +824,14 @@ class EmbedBuilder(commands.Cog):
                             await ctx.send(f"❌ Could not find Role or Member named `{target_str}`.")
                             return
                 
-                # Resolve Permission
-                # Map common aliases
-                perm_map = {
-                    'sendmessage': 'send_messages',
-                    'sendmessages': 'send_messages',
-                    'sendingmessages': 'send_messages',
-                    'send': 'send_messages',
-                    'view': 'view_channel',
-                    'viewchannel': 'view_channel',
-                    'viewchannels': 'view_channel',
-                    'read': 'view_channel',
-                    'readmessage': 'view_channel',
-                    'readmessages': 'view_channel',
-                    'connect': 'connect',
-                    'speak': 'speak',
-                    'manage': 'manage_channels',
-                    'admin': 'administrator',
-                    'embed': 'embed_links',
-                    'embeds': 'embed_links',
-                    'embedlink': 'embed_links',
-                    'attach': 'attach_files',
-                    'files': 'attach_files',
-                    'file': 'attach_files',
-                    'image': 'attach_files',
-                    'addreaction': 'add_reactions',
-                    'addreactions': 'add_reactions',
-                    'reaction': 'add_reactions',
-                    'history': 'read_message_history',
-                    'managemessage': 'manage_messages',
-                    'managemessages': 'manage_messages'
-                }
-                
-                # Normalize input
-                clean_input = perm_str.lower().replace(" ", "").replace("_", "")
-                
-                # Get all real permissions using standard iteration
-                valid_perms = [name for name, value in discord.Permissions()]
-                
-                perm_attr = None
-                
-                # 1. Map Check (Trust the map)
-                if clean_input in perm_map:
-                    perm_attr = perm_map[clean_input]
-                
-                # 2. Direct name check (snake case normalized)
-                # This covers "manage_channels" -> "manage_channels"
-                if not perm_attr:
-                     snake_input = perm_str.lower().replace(" ", "_")
-                     if snake_input in valid_perms:
-                         perm_attr = snake_input
-
-                # 3. Stripped check (ignore underscores in real permissions)
-                # This covers "managechannels" -> matches "manage_channels"
-                if not perm_attr:
-                    for vp in valid_perms:
-                        if vp.replace("_", "") == clean_input:
-                            perm_attr = vp
-                            break
-                            
-                # 4. Fuzzy / Substring match (DANGEROUS but helpful)
+                # Resolve Permission (aliases, snake_case, squashed or substring)
+                perm_attr = resolve_permission(perm_str)
                 if not perm_attr:
-                    # Finds "manage" -> "manage_channels" (first match)
-                    # Use a priority list if multiple match?
-                    matches = [p for p in valid_perms if clean_input in p.replace("_", "")]
-                    if matches:
-                        # Prefer shorter matches or exact start matches
-                        # e.g. "ban" matches "ban_members"
-                        perm_attr = matches[0] 
-                    else:
-                        await ctx.send(f"❌ Invalid permission `{perm_str}`.")
-                        return
+                    await ctx.send(f"❌ Invalid permission `{perm_str}`.")
+                    return
 
-                # Filter Channels
-                matched = []
-                for channel in ctx.guild.channels:
-                    # Exclude categories
-                    if isinstance(channel, discord.CategoryChannel):
-                        continue
-                        
-                    # channel.permissions_for handles overwrites, roles, admin implications
-                    perms = channel.permissions_for(target)
-                    if getattr(perms, perm_attr, False):
-                        matched.append(channel)
-                
-                matched.sort(key=lambda c: c.position)
+                # Filter Channels (categories excluded)
+                matched = self._channels_where(ctx.guild, target, perm_attr, categories=False)
                 
                 if not matched:
                     await ctx.send(f"🚫 No channels found where {target.mention} has `{perm_attr}` permission.")
@@ -964,70 +945,13 @@ class EmbedBuilder(commands.Cog):
                             return
                 
                 # Resolve Permission
-                perm_map = {
-                    'sendmessage': 'send_messages',
-                    'sendmessages': 'send_messages',
-                    'sendingmessages': 'send_messages',
-                    'send': 'send_messages',
-                    'view': 'view_channel',
-                    'viewchannel': 'view_channel',
-                    'viewchannels': 'view_channel',
-                    'read': 'view_channel',
-                    'readmessage': 'view_channel',
-                    'readmessages': 'view_channel',
-                    'connect': 'connect',
-                    'speak': 'speak',
-                    'manage': 'manage_channels',
-                    'admin': 'administrator',
-                    'embed': 'embed_links',
-                    'embeds': 'embed_links',
-                    'embedlink': 'embed_links',
-                    'attach': 'attach_files',
-                    'files': 'attach_files',
-                    'file': 'attach_files',
-                    'image': 'attach_files',
-                    'addreaction': 'add_reactions',
-                    'addreactions': 'add_reactions',
-                    'reaction': 'add_reactions',
-                    'history': 'read_message_history',
-                    'managemessage': 'manage_messages',
-                    'managemessages': 'manage_messages'
-                }
-                
-                clean_input = perm_str.lower().replace(" ", "").replace("_", "")
-                valid_perms = [name for name, value in discord.Permissions()]
-                
-                perm_attr = None
-                if clean_input in perm_map:
-                    perm_attr = perm_map[clean_input]
-                
-                if not perm_attr:
-                     snake_input = perm_str.lower().replace(" ", "_")
-                     if snake_input in valid_perms:
-                         perm_attr = snake_input
-
+                perm_attr = resolve_permission(perm_str)
                 if not perm_attr:
-                    for vp in valid_perms:
-                        if vp.replace("_", "") == clean_input:
-                            perm_attr = vp
-                            break
-                            
-                if not perm_attr:
-                    matches = [p for p in valid_perms if clean_input in p.replace("_", "")]
-                    if matches:
-                        perm_attr = matches[0] 
-                    else:
-                        await ctx.send(f"❌ Invalid permission `{perm_str}`.")
-                        return
+                    await ctx.send(f"❌ Invalid permission `{perm_str}`.")
+                    return
 
                 # Filter Categories
-                matched = []
-                for channel in ctx.guild.categories:
-                    perms = channel.permissions_for(target)
-                    if getattr(perms, perm_attr, False):
-                        matched.append(channel)
-                
-                matched.sort(key=lambda c: c.position)
+                matched = self._channels_where(ctx.guild, target, perm_attr, categories=True)
                 
                 if not matched:
                     await ctx.send(f"🚫 No categories found where {target.mention} has `{perm_attr}` permission.")
@@ -1,6 +1,8 @@
 import discord
 from discord.ext import commands
 
+from utils.dm_outbox import Priority
+
 from config import (
     INTRODUCTION_CHANNEL_ID,
     WELCOME_ROLES_CHANNEL_ID,
@@ -16,8 +18,7 @@ class MemberEvents(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
-        """Handle member join: track user and send welcome DM."""
-        # Send welcome DM
+        """Handle member join: track user and queue the welcome DM."""
         try:
             # Create a personalized welcome message (channels configured in .env)
             welcome_text = (
@@ -43,13 +44,17 @@ class MemberEvents(commands.Cog):
             if member.guild.icon:
                 embed.set_thumbnail(url=member.guild.icon.url)
                 
-            await member.send(embed=embed)
-            
-        except discord.Forbidden:
-            # User has DMs disabled
-            pass
+            # Queued behind moderation DMs; closed DMs are tracked by the outbox
+            self.bot.dm_outbox.submit(
+                member,
+                kind="welcome",
+                priority=Priority.WELCOME,
+                dedupe_key=("welcome", member.id),
+                embed=embed,
+            )
+
         except Exception as e:
-            print(f"Error sending welcome DM: {e}")
+            print(f"Error queueing welcome DM: {e}")
         
 async def setup(bot):
     await bot.add_cog(MemberEvents(bot))
\ No newline at end of file
@@ -4,6 +4,13 @@ import logging, discord, os, re
 from datetime import datetime, timezone
 
 from config import INTRODUCTION_CHANNEL_ID
+from utils.intro_backfill import (
+    IntroBackfill,
+    clear_checkpoint,
+    init_backfill_db,
+    load_checkpoint,
+)
+from utils.rate_limit import RateLimited
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +21,8 @@ class MessageHandler(commands.Cog):
     """Simplified message handler with auto-thanks points."""
     def __init__(self, bot):
         self.bot = bot
+        # guild_id -> running or last finished intro backfill job
+        self._backfills: dict[int, IntroBackfill] = {}
 
     async def _add_intro_reactions(self, message: discord.Message) -> None:
         if getattr(message, 'reference', None) and getattr(message.reference, 'message_id', None):
@@ -33,26 +42,72 @@ class MessageHandler(commands.Cog):
                 # Non-fatal (rate limit / already reacted / transient API issue)
                 continue
 
-    @commands.command(name="introreact", hidden=True)
+    async def _intro_channel(self, guild: discord.Guild):
+        channel = guild.get_channel(INTRODUCTION_CHANNEL_ID)
+        if channel is None:
+            try:
+                channel = await guild.fetch_channel(INTRODUCTION_CHANNEL_ID)
+            except (discord.Forbidden, discord.NotFound) as e:
+                logger.warning("Could not fetch intro channel: %s", e)
+                channel = None
+        return channel
+
+    @commands.group(name="introreact", hidden=True, invoke_without_command=True)
     @commands.has_permissions(manage_messages=True)
     async def introreact(self, ctx: commands.Context, limit: str = "all"):
         """Backfill intro reactions in the introductions channel.
 
+        Runs in the background and resumes from its last checkpoint.
+
         Usage:
-          `?introreact` (all messages; can take a long time)
-          `?introreact 500` (only last 500 messages)
+          `?introreact` (all remaining messages)
+          `?introreact 500` (at most the next 500 messages)
+          `?introreact status` / `?introreact stop` / `?introreact restart`
         """
+        await self._start_backfill(ctx, limit, resume=True)
+
+    @introreact.command(name="restart")
+    @commands.has_permissions(manage_messages=True)
+    async def introreact_restart(self, ctx: commands.Context, limit: str = "all"):
+        """Discard the checkpoint and backfill from the first message."""
+        await self._start_backfill(ctx, limit, resume=False)
+
+    @introreact.command(name="status")
+    @commands.has_permissions(manage_messages=True)
+    async def introreact_status(self, ctx: commands.Context):
+        """Show progress of the running (or last) backfill."""
         if not ctx.guild:
             return
+        job = self._backfills.get(ctx.guild.id)
+        if job is not None:
+            status = job.status
+        else:
+            status = await asyncio.to_thread(load_checkpoint, ctx.guild.id, INTRODUCTION_CHANNEL_ID)
+        await ctx.reply(f"Intro reaction backfill: {status.summary()}", mention_author=False)
 
-        channel = ctx.guild.get_channel(INTRODUCTION_CHANNEL_ID)
-        if channel is None:
-            try:
-                channel = await ctx.guild.fetch_channel(INTRODUCTION_CHANNEL_ID)
-            except (discord.Forbidden, discord.NotFound) as e:
-                logger.warning("Could not fetch intro channel: %s", e)
-                channel = None
+    @introreact.command(name="stop")
+    @commands.has_permissions(manage_messages=True)
+    async def introreact_stop(self, ctx: commands.Context):
+        """Stop the running backfill; it can be resumed later."""
+        if not ctx.guild:
+            return
+        job = self._backfills.get(ctx.guild.id)
+        if job is None or not job.running:
+            await ctx.reply("No intro reaction backfill is running.", mention_author=False)
+            return
+        job.stop()
+        await ctx.reply("⏹️ Stopping; progress is saved. Run `?introreact` to resume.", mention_author=False)
 
+    async def _start_backfill(self, ctx: commands.Context, limit: str, *, resume: bool) -> None:
+        if not ctx.guild:
+            return
+
+        job = self._backfills.get(ctx.guild.id)
+        if job is not None and job.running:
+            await ctx.reply(f"⏳ Already running: {job.status.summary()}", mention_author=False)
+            return
+
+        channel = await self._intro_channel(ctx.guild)
         if channel is None:
             await ctx.reply("❌ I can't access the introductions channel in this server.", mention_author=False)
             return
@@ -65,45 +120,41 @@ class MessageHandler(commands.Cog):
                 await ctx.reply("❌ Invalid limit. Use `all` or a number (e.g. `?introreact 500`).", mention_author=False)
                 return
 
-        status = await ctx.reply(
-            f"⏳ Adding reactions in {channel.mention} (limit={history_limit or 'all'})...",
+        if not resume:
+            await asyncio.to_thread(clear_checkpoint, ctx.guild.id)
+        status = await asyncio.to_thread(load_checkpoint, ctx.guild.id, channel.id)
+
+        where = f"after message `{status.last_message_id}`" if status.last_message_id else "from the first message"
+        reply = await ctx.reply(
+            f"⏳ Adding reactions in {channel.mention} {where} (limit={history_limit or 'all'}). "
+            f"Check progress with `?introreact status`.",
             mention_author=False,
         )
 
-        scanned = 0
-        processed = 0
-        try:
-            async for msg in channel.history(limit=history_limit, oldest_first=True):
-                scanned += 1
-                if msg.author.bot:
-                    continue
+        async def on_finish(status):
+            icon = "✅" if status.state == "done" else "⏹️" if status.state == "stopped" else "❌"
+            await reply.edit(content=f"{icon} Intro reaction backfill in {channel.mention}: {status.summary()}")
 
-                await self._add_intro_reactions(msg)
-                processed += 1
+        job = IntroBackfill(channel, status, INTRO_REACTIONS, history_limit)
+        job.on_finish = on_finish
+        self._backfills[ctx.guild.id] = job
+        job.start()
 
-                # Conservative pacing to avoid long bursts hitting global rate limits
-                if processed % 25 == 0:
-                    await asyncio.sleep(1)
-
-            await status.edit(content=f"✅ Done. Scanned {scanned} messages; reacted to {processed}.")
-        except discord.Forbidden:
-            await status.edit(content="❌ Missing permissions to read history and/or add reactions.")
-        except Exception as e:
-            await status.edit(content=f"❌ Stopped due to error: {e}")
-
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Handle messages for auto-thanks detection"""
-        # Ignore bot messages or DMs
-        if message.author.bot or not message.guild:
-            return
+    async def cog_load(self):
+        await asyncio.to_thread(init_backfill_db)
+        # Only messages in the introductions channel are routed here
+        self.bot.message_router.subscribe_channel(
+            INTRODUCTION_CHANNEL_ID, "intro_reactions", self._add_intro_reactions
+        )
 
-        # Auto-react in introductions channel
-        if getattr(message.channel, 'id', None) == INTRODUCTION_CHANNEL_ID:
-            await self._add_intro_reactions(message)
+    async def cog_unload(self):
+        self.bot.message_router.unsubscribe("intro_reactions")
+        # Running backfills save their checkpoint when cancelled
+        for job in self._backfills.values():
+            job.stop()
 
-        # NOTE: Don't call process_commands here - the bot already does this automatically
-        # Calling it here would cause duplicate responses for prefix commands
+    # NOTE: No on_message listener here. The bot's on_message already calls
+    # process_commands, and intro messages arrive through the message router.
 
     # Staff points/aura system removed per request.
 
@@ -165,6 +216,22 @@ class MessageHandler(commands.Cog):
             )
             await ctx.send(embed=embed, delete_after=10)
 
+        elif isinstance(error, RateLimited):
+            embed = discord.Embed(
+                title="⏰ Rate Limited",
+                description=str(error),
+                color=discord.Color.orange()
+            )
+            await ctx.send(embed=embed, delete_after=10)
+
+        elif isinstance(error, commands.MaxConcurrencyReached):
+            embed = discord.Embed(
+                title="⏳ Already Running",
+                description="This command is already running. Please wait for it to finish.",
+                color=discord.Color.orange()
+            )
+            await ctx.send(embed=embed, delete_after=10)
+
         elif isinstance(error, commands.MemberNotFound):
             embed = discord.Embed(
                 title="❌ Member Not Found",
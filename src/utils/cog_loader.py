@@ -0,0 +1,146 @@
+"""Parallel, dependency-aware extension loader with a startup timing profile.
+
+``setup_hook`` used to load every entry of ``COGS_TO_LOAD`` one after the
+other, so a cog doing slow setup held up everything behind it. The loader
+starts every extension at once; an extension only waits for the extensions
+it declares as dependencies (e.g. anything that logs through ``LoggingCog``
+waits for ``commands.logging``). Cogs push their blocking SQLite setup into
+``cog_load`` via ``asyncio.to_thread`` so that work overlaps with the rest.
+
+A failed dependency does not block its dependents: they load afterwards as
+they did before, and the failure is logged and recorded.
+
+Per-extension timings are kept on the loader so ``?startup`` can show where
+cold-start time goes:
+
+* ``import``: executing the extension module and its ``setup()`` up to
+  ``add_cog``.
+* ``setup``: ``add_cog`` itself, including ``cog_load`` (reported by the bot's
+  ``add_cog`` override through :func:`record_add_cog`).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Optional
+
+from discord.ext import commands  # type: ignore[import-not-found]
+
+logger = logging.getLogger("codeverse.cog_loader")
+
+
+@dataclass(slots=True)
+class ExtensionTiming:
+    """Load timings for one extension (all values in seconds)."""
+
+    name: str
+    started: float = 0.0  # offset from the start of the loader run
+    import_time: float = 0.0
+    setup_time: float = 0.0
+    waited: float = 0.0  # time spent waiting on dependencies
+    ok: bool = True
+    error: Optional[str] = None
+
+    @property
+    def total(self) -> float:
+        return self.import_time + self.setup_time
+
+
+# Extension being loaded by the current task, so ``add_cog`` can attribute
+# its time even while several extensions load concurrently.
+_current: contextvars.ContextVar[Optional[ExtensionTiming]] = contextvars.ContextVar(
+    "cog_loader_current", default=None
+)
+
+
+def record_add_cog(elapsed: float) -> None:
+    """Attribute ``add_cog`` time to the extension currently loading (if any)."""
+    timing = _current.get()
+    if timing is not None:
+        timing.setup_time += elapsed
+
+
+class CogLoader:
+    """Load ``extensions`` concurrently, respecting ``dependencies``."""
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        extensions: Iterable[str],
+        dependencies: Optional[Mapping[str, Iterable[str]]] = None,
+    ) -> None:
+        self.bot = bot
+        self.extensions = list(dict.fromkeys(extensions))
+        self.dependencies: dict[str, tuple[str, ...]] = {}
+        for name, deps in (dependencies or {}).items():
+            if name not in self.extensions:
+                continue  # Constraint for a disabled cog
+            # Dependencies on cogs that aren't being loaded are ignored.
+            self.dependencies[name] = tuple(d for d in deps if d in self.extensions and d != name)
+        self._check_cycles()
+        self.timings: dict[str, ExtensionTiming] = {}
+        self.wall_time = 0.0
+
+    def _check_cycles(self) -> None:
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cog dependency cycle: {' -> '.join(path + (name,))}")
+            visiting.add(name)
+            for dep in self.dependencies.get(name, ()):
+                visit(dep, path + (name,))
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.extensions:
+            visit(name, ())
+
+    async def load_all(self) -> dict[str, ExtensionTiming]:
+        """Load every extension; returns the timings keyed by extension name."""
+        loaded = {name: asyncio.Event() for name in self.extensions}
+        run_start = time.perf_counter()
+
+        async def load_one(name: str) -> None:
+            timing = ExtensionTiming(name)
+            self.timings[name] = timing
+            wait_start = time.perf_counter()
+            for dep in self.dependencies.get(name, ()):
+                await loaded[dep].wait()
+            start = time.perf_counter()
+            timing.waited = start - wait_start
+            timing.started = start - run_start
+            _current.set(timing)
+            try:
+                await self.bot.load_extension(name)
+            except Exception as e:
+                timing.ok = False
+                timing.error = str(e)
+                logger.warning("Failed to load cog %s: %s", name, e)
+            finally:
+                timing.import_time = max(time.perf_counter() - start - timing.setup_time, 0.0)
+                loaded[name].set()
+            if timing.ok:
+                logger.info("Loaded cog: %s (%.0f ms)", name, timing.total * 1000)
+
+        await asyncio.gather(*(load_one(name) for name in self.extensions))
+        self.wall_time = time.perf_counter() - run_start
+        failed = sum(1 for t in self.timings.values() if not t.ok)
+        logger.info(
+            "Loaded %s/%s cogs in %.0f ms (sequential sum %.0f ms)",
+            len(self.extensions) - failed,
+            len(self.extensions),
+            self.wall_time * 1000,
+            sum(t.total for t in self.timings.values()) * 1000,
+        )
+        return self.timings
+
+
+__all__ = ["CogLoader", "ExtensionTiming", "record_add_cog"]
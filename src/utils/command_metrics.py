@@ -0,0 +1,252 @@
+"""Per-command latency, error and interaction-acknowledgement metrics.
+
+Every command gets one :class:`CommandStats` record with two fixed-size
+:class:`LatencyHistogram` instances: one for execution time and one for
+how long slash invocations take to acknowledge their interaction (Discord
+drops interactions that are not acknowledged within 3 seconds). Each
+histogram keeps cumulative bucket counts (exported to ``/metrics``) plus a
+ring buffer of the most recent samples for exact p50/p95/p99 in
+``?diag perf``. Memory is bounded by ``RECENT_SAMPLES`` per command.
+
+Hooks (installed by :func:`install` in ``CodeVerseBot.__init__``):
+
+* Prefix and hybrid commands: the bot's global ``before_invoke`` /
+  ``after_invoke`` hooks.
+* Slash-only commands: :class:`InstrumentedCommandTree` starts a timer in
+  ``interaction_check``, and the ``app_command_completion`` event or
+  ``on_error`` stop it.
+* Acknowledgement time (any slash or hybrid slash invocation): a watcher
+  started in ``interaction_check`` polls ``interaction.response.is_done()``
+  until the response is sent or the 3-second deadline passes.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import math
+import time
+from collections import deque
+from typing import Optional
+
+import discord  # type: ignore[import-not-found]
+from discord import app_commands  # type: ignore[import-not-found]
+from discord.ext import commands  # type: ignore[import-not-found]
+
+from utils.memory_diagnostics import register_cache
+from utils.metrics import Metric, register_collector
+
+logger = logging.getLogger("codeverse.command_metrics")
+
+# Histogram upper bounds in seconds (+Inf is implicit)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0)
+RECENT_SAMPLES = 512
+MAX_COMMANDS = 1024
+
+INTERACTION_DEADLINE = 3.0
+ACK_POLL_INTERVAL = 0.025
+
+_START_KEY = "command_metrics_start"
+
+
+class LatencyHistogram:
+    """Cumulative buckets plus a ring buffer of recent samples (seconds)."""
+
+    __slots__ = ("buckets", "count", "total", "recent")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile (0-100) over the recent samples."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        rank = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+        return ordered[min(rank, len(ordered) - 1)]
+
+
+class CommandStats:
+    """Latency and outcome counters for one command."""
+
+    __slots__ = ("name", "kind", "latency", "errors", "ack", "ack_missed")
+
+    def __init__(self, name: str, kind: str) -> None:
+        self.name = name
+        self.kind = kind  # "prefix", "hybrid" or "slash"
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.ack = LatencyHistogram()
+        self.ack_missed = 0
+
+
+_STATS: dict[str, CommandStats] = {}
+# Strong references to running acknowledgement watchers
+_ack_watchers: set[asyncio.Task] = set()
+register_cache("command_metrics.commands", _STATS)
+
+
+def _stats_for(name: str, kind: str) -> Optional[CommandStats]:
+    stats = _STATS.get(name)
+    if stats is None:
+        if len(_STATS) >= MAX_COMMANDS:
+            return None
+        stats = _STATS[name] = CommandStats(name, kind)
+    return stats
+
+
+def command_stats() -> dict[str, CommandStats]:
+    """All recorded commands, keyed by qualified name."""
+    return dict(_STATS)
+
+
+def reset() -> None:
+    _STATS.clear()
+
+
+def record(name: str, kind: str, seconds: float, *, failed: bool = False) -> None:
+    stats = _stats_for(name, kind)
+    if stats is None:
+        return
+    stats.latency.observe(seconds)
+    if failed:
+        stats.errors += 1
+
+
+# ---------------------------------------------------------------------------
+# Prefix / hybrid hooks
+# ---------------------------------------------------------------------------
+def _ctx_kind(ctx: commands.Context) -> str:
+    return "hybrid" if isinstance(ctx.command, (commands.HybridCommand, commands.HybridGroup)) else "prefix"
+
+
+async def _before_invoke(ctx: commands.Context) -> None:
+    ctx.command_metrics_start = time.perf_counter()  # type: ignore[attr-defined]
+
+
+async def _after_invoke(ctx: commands.Context) -> None:
+    started = getattr(ctx, "command_metrics_start", None)
+    if started is None or ctx.command is None:
+        return
+    record(
+        ctx.command.qualified_name,
+        _ctx_kind(ctx),
+        time.perf_counter() - started,
+        failed=ctx.command_failed,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Slash commands
+# ---------------------------------------------------------------------------
+def _is_hybrid(command) -> bool:
+    # Hybrid app commands are timed by the prefix hooks via their Context.
+    return getattr(command, "wrapped", None) is not None
+
+
+async def _watch_ack(interaction: discord.Interaction, name: str, kind: str, started: float) -> None:
+    deadline = started + INTERACTION_DEADLINE
+    while not interaction.response.is_done():
+        if time.perf_counter() >= deadline:
+            stats = _stats_for(name, kind)
+            if stats is not None:
+                stats.ack_missed += 1
+            logger.warning("Interaction for /%s was not acknowledged within %.0fs", name, INTERACTION_DEADLINE)
+            return
+        await asyncio.sleep(ACK_POLL_INTERVAL)
+    stats = _stats_for(name, kind)
+    if stats is not None:
+        stats.ack.observe(time.perf_counter() - started)
+
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """Command tree that times slash commands and their acknowledgements."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        command = interaction.command
+        if command is not None and interaction.type is discord.InteractionType.application_command:
+            started = time.perf_counter()
+            interaction.extras[_START_KEY] = started
+            kind = "hybrid" if _is_hybrid(command) else "slash"
+            task = asyncio.create_task(_watch_ack(interaction, command.qualified_name, kind, started))
+            _ack_watchers.add(task)
+            task.add_done_callback(_ack_watchers.discard)
+        return await super().interaction_check(interaction)
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        command = interaction.command
+        started = interaction.extras.get(_START_KEY)
+        if command is not None and started is not None and not _is_hybrid(command):
+            record(command.qualified_name, "slash", time.perf_counter() - started, failed=True)
+        await super().on_error(interaction, error)
+
+
+async def _on_app_command_completion(interaction: discord.Interaction, command) -> None:
+    started = interaction.extras.get(_START_KEY)
+    if started is None or _is_hybrid(command):
+        return
+    record(command.qualified_name, "slash", time.perf_counter() - started)
+
+
+def install(bot: commands.Bot) -> None:
+    """Register the global invoke hooks and completion listener on ``bot``."""
+    bot.before_invoke(_before_invoke)
+    bot.after_invoke(_after_invoke)
+    bot.add_listener(_on_app_command_completion, "on_app_command_completion")
+
+
+# ---------------------------------------------------------------------------
+# /metrics
+# ---------------------------------------------------------------------------
+def _histogram_metric(name: str, help: str, attr: str) -> Metric:
+    metric = Metric(name, "histogram", help)
+    for stats in _STATS.values():
+        hist: LatencyHistogram = getattr(stats, attr)
+        if not hist.count:
+            continue
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), hist.buckets):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            metric.add(cumulative, suffix="_bucket", command=stats.name, le=le)
+        metric.add(hist.total, suffix="_sum", command=stats.name)
+        metric.add(hist.count, suffix="_count", command=stats.name)
+    return metric
+
+
+def _collect(bot):
+    if not _STATS:
+        return
+    yield _histogram_metric("command_duration_seconds", "Command execution time.", "latency")
+    yield _histogram_metric("interaction_ack_seconds", "Time to acknowledge slash invocations.", "ack")
+    errors = Metric("command_errors_total", "counter", "Failed command invocations.")
+    missed = Metric("interaction_ack_missed_total", "counter", "Interactions not acknowledged within 3 seconds.")
+    for stats in _STATS.values():
+        errors.add(stats.errors, command=stats.name)
+        if stats.ack.count or stats.ack_missed:
+            missed.add(stats.ack_missed, command=stats.name)
+    yield errors
+    yield missed
+
+
+register_collector("commands", _collect)
+
+
+__all__ = [
+    "CommandStats",
+    "InstrumentedCommandTree",
+    "LatencyHistogram",
+    "command_stats",
+    "install",
+    "record",
+    "reset",
+]
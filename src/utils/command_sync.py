@@ -0,0 +1,102 @@
+"""Hash-gated slash command sync.
+
+Syncing the command tree costs a rate-limited API call per guild, and the
+payload is identical unless a deploy changed the commands. Before syncing a
+guild we serialize its tree (exactly as ``CommandTree.sync`` would), hash it
+and compare with the hash stored in SQLite from the last successful sync.
+Unchanged trees are skipped.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from typing import Optional
+
+import discord
+from discord.ext import commands
+
+from config import DATABASE_NAME
+
+logger = logging.getLogger("codeverse.command_sync")
+
+
+def _ensure_table(conn: sqlite3.Connection) -> None:
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS command_sync_hashes (
+            guild_id INTEGER PRIMARY KEY,
+            tree_hash TEXT NOT NULL,
+            synced_at TEXT NOT NULL
+        )
+    ''')
+
+
+def _load_hash(guild_id: int) -> Optional[str]:
+    conn = sqlite3.connect(DATABASE_NAME)
+    try:
+        _ensure_table(conn)
+        row = conn.execute(
+            "SELECT tree_hash FROM command_sync_hashes WHERE guild_id = ?", (guild_id,)
+        ).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def _store_hash(guild_id: int, tree_hash: str) -> None:
+    conn = sqlite3.connect(DATABASE_NAME)
+    try:
+        _ensure_table(conn)
+        conn.execute(
+            "INSERT OR REPLACE INTO command_sync_hashes (guild_id, tree_hash, synced_at) VALUES (?, ?, ?)",
+            (guild_id, tree_hash, datetime.now(timezone.utc).isoformat()),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def clear_hashes() -> None:
+    """Forget every stored hash so the next sync of each guild goes through (``?sync``)."""
+    conn = sqlite3.connect(DATABASE_NAME)
+    try:
+        _ensure_table(conn)
+        conn.execute("DELETE FROM command_sync_hashes")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def tree_hash(bot: commands.Bot, guild: discord.abc.Snowflake) -> str:
+    """Stable SHA-256 of the payload ``tree.sync(guild=guild)`` would send."""
+    tree = bot.tree
+    payload = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    payload.sort(key=lambda c: (c.get("type", 1), c["name"]))
+    blob = json.dumps(
+        {"application_id": bot.application_id, "commands": payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+async def sync_guild_if_changed(bot: commands.Bot, guild_id: int) -> Optional[int]:
+    """Copy global commands to ``guild_id`` and sync only if the tree changed.
+
+    Returns the number of synced commands, or ``None`` when the sync was
+    skipped because the stored hash matches.
+    """
+    guild = discord.Object(id=guild_id)
+    bot.tree.copy_global_to(guild=guild)
+    current = tree_hash(bot, guild)
+    if await asyncio.to_thread(_load_hash, guild_id) == current:
+        return None
+    synced = await bot.tree.sync(guild=guild)
+    # Stored only after a successful sync, so failures are retried next start.
+    await asyncio.to_thread(_store_hash, guild_id, current)
+    return len(synced)
+
+
+__all__ = ["clear_hashes", "sync_guild_if_changed", "tree_hash"]
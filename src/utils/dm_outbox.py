@@ -0,0 +1,317 @@
+"""Shared, rate-limited delivery of direct messages.
+
+Welcome DMs, warning notices and appeal forms used to be sent inline by the
+handler that produced them. During a join raid hundreds of welcome DMs then
+compete with moderation traffic for the global rate limit. All of them now go
+through one :class:`DMOutbox` (``bot.dm_outbox``):
+
+* A priority queue serves moderation notices before appeal/other notices, and
+  both before welcomes. ``WORKERS`` tasks deliver concurrently; discord.py's
+  HTTP client still paces each request against the rate-limit headers.
+* ``dedupe_key``: while a DM with the same key is queued or in flight, another
+  submit returns the same result instead of sending twice.
+* Users whose DMs are closed (``Forbidden``) are remembered for
+  ``CLOSED_TTL`` seconds; DMs to them are skipped without an API call.
+* The queue holds at most ``MAX_QUEUE_SIZE`` DMs. When it is full, the
+  newest queued DM of a lower priority is dropped to make room; a new DM is
+  only refused when everything queued has the same or a higher priority. A
+  raid's worth of welcomes can therefore never crowd out warnings or appeal
+  forms.
+
+:meth:`DMOutbox.send` waits for the :class:`DMResult`; :meth:`DMOutbox.submit`
+returns a future for fire-and-forget callers. Counts per kind and outcome,
+queue depth and delivery time are exported on ``/metrics``.
+"""
+from __future__ import annotations
+
+import asyncio
+import enum
+import itertools
+import logging
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Optional, Union
+
+import discord  # type: ignore[import-not-found]
+
+from utils.memory_diagnostics import register_cache
+from utils.metrics import Metric, counter, gauge, register_collector
+
+logger = logging.getLogger("codeverse.dm_outbox")
+
+WORKERS = 3
+MAX_QUEUE_SIZE = 2000
+CLOSED_TTL = 3600.0  # seconds a "DMs closed" failure is remembered
+MAX_CLOSED = 10000
+SHUTDOWN_TIMEOUT = 5.0
+
+
+class Priority(enum.IntEnum):
+    """Lower values are delivered first."""
+
+    MODERATION = 0  # warnings, appeal forms and decisions
+    NOTICE = 1
+    WELCOME = 2
+
+
+@dataclass(slots=True)
+class DMResult:
+    delivered: bool
+    outcome: str  # delivered, forbidden, not_found, failed, closed, dropped, cancelled
+    error: Optional[BaseException] = None
+    message: Optional[discord.Message] = None
+
+    @property
+    def reason(self) -> str:
+        if self.delivered:
+            return "Delivered"
+        if self.outcome == "closed":
+            return "DMs closed (recent failure, not retried)"
+        if self.outcome == "dropped":
+            return "DM queue full"
+        if self.outcome == "cancelled":
+            return "Bot shutting down"
+        if self.error is not None:
+            return f"{type(self.error).__name__} ({self.error})"
+        return self.outcome
+
+
+@dataclass(slots=True)
+class _Job:
+    recipient: Union[discord.abc.User, int]
+    kind: str
+    kwargs: dict[str, Any]
+    future: asyncio.Future
+    dedupe_key: Optional[Hashable] = None
+    queued_at: float = field(default_factory=time.perf_counter)
+    evicted: bool = False  # dropped for a higher-priority DM; left in the heap
+
+
+class DMOutbox:
+    """Priority queue plus worker pool that delivers DMs for one bot."""
+
+    def __init__(self, bot: discord.Client, workers: int = WORKERS) -> None:
+        self.bot = bot
+        self.worker_count = workers
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: list[asyncio.Task] = []
+        self._seq = itertools.count()
+        # priority -> queued jobs in submission order (evicted ones removed)
+        self._waiting: dict[int, deque[_Job]] = {int(p): deque() for p in Priority}
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        self._closed: dict[int, float] = {}  # user_id -> expiry (monotonic)
+        self.outcomes: Counter = Counter()  # (kind, outcome) -> count
+        self.delivery_seconds: dict[str, list[float]] = {}  # kind -> [sum, count]
+        register_cache("dm_outbox.closed", self._closed)
+        register_cache("dm_outbox.pending", self._pending)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @property
+    def queue_depth(self) -> int:
+        return sum(map(len, self._waiting.values()))
+
+    def dms_closed(self, user_id: int) -> bool:
+        """True if a DM to ``user_id`` failed with Forbidden within ``CLOSED_TTL``."""
+        expiry = self._closed.get(user_id)
+        if expiry is None:
+            return False
+        if expiry <= time.monotonic():
+            del self._closed[user_id]
+            return False
+        return True
+
+    def submit(
+        self,
+        recipient: Union[discord.abc.User, int],
+        *,
+        kind: str,
+        priority: Priority = Priority.NOTICE,
+        dedupe_key: Optional[Hashable] = None,
+        **kwargs: Any,
+    ) -> asyncio.Future:
+        """Queue a DM; returns a future resolving to a :class:`DMResult`.
+
+        ``kwargs`` are passed to ``User.send`` (``content``, ``embed``, ``view``...).
+        """
+        loop = asyncio.get_running_loop()
+        if dedupe_key is not None:
+            existing = self._pending.get(dedupe_key)
+            if existing is not None and not existing.done():
+                self.outcomes[(kind, "deduplicated")] += 1
+                return existing
+
+        future = loop.create_future()
+        user_id = recipient if isinstance(recipient, int) else recipient.id
+        if self.dms_closed(user_id):
+            self._finish(kind, future, DMResult(False, "closed"))
+            return future
+
+        if self.queue_depth >= MAX_QUEUE_SIZE and not self._evict_below(priority):
+            logger.warning("DM outbox full; dropping %s DM to user_id=%s", kind, user_id)
+            self._finish(kind, future, DMResult(False, "dropped"))
+            return future
+
+        self._ensure_workers()
+        job = _Job(recipient, kind, kwargs, future, dedupe_key)
+        self._waiting[int(priority)].append(job)
+        self._queue.put_nowait((int(priority), next(self._seq), job))
+        if dedupe_key is not None:
+            self._pending[dedupe_key] = future
+        return future
+
+    async def send(
+        self,
+        recipient: Union[discord.abc.User, int],
+        *,
+        kind: str,
+        priority: Priority = Priority.NOTICE,
+        dedupe_key: Optional[Hashable] = None,
+        **kwargs: Any,
+    ) -> DMResult:
+        """Queue a DM and wait for the delivery result."""
+        future = self.submit(recipient, kind=kind, priority=priority, dedupe_key=dedupe_key, **kwargs)
+        # shield: a cancelled caller must not cancel a DM shared via dedupe
+        return await asyncio.shield(future)
+
+    async def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Deliver what is queued (up to ``timeout``), then stop the workers."""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("DM outbox shutdown: %s DMs not delivered", self._queue.qsize())
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        while not self._queue.empty():
+            _, _, job = self._queue.get_nowait()
+            if not job.evicted:
+                self._finish(job.kind, job.future, DMResult(False, "cancelled"))
+            self._queue.task_done()
+        for waiting in self._waiting.values():
+            waiting.clear()
+        self._pending.clear()
+        self._queue = None
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+    def _evict_below(self, priority: Priority) -> bool:
+        """Drop the newest queued DM with a lower priority than ``priority``.
+
+        The job stays in the heap marked ``evicted`` (workers skip it), so
+        eviction is O(1). Returns False if there was nothing to evict.
+        """
+        for level in sorted(self._waiting, reverse=True):
+            if level <= priority:
+                break
+            if self._waiting[level]:
+                job = self._waiting[level].pop()
+                job.evicted = True
+                if job.dedupe_key is not None and self._pending.get(job.dedupe_key) is job.future:
+                    del self._pending[job.dedupe_key]
+                logger.warning("DM outbox full; dropping queued %s DM for a higher-priority one", job.kind)
+                self._finish(job.kind, job.future, DMResult(False, "dropped"))
+                return True
+        return False
+
+    def _ensure_workers(self) -> None:
+        if self._queue is None:
+            # Unbounded: MAX_QUEUE_SIZE is enforced on live jobs in submit,
+            # evicted jobs only occupy the heap until a worker skips them.
+            self._queue = asyncio.PriorityQueue()
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"dm_outbox:{i}")
+                for i in range(self.worker_count)
+            ]
+
+    async def _worker(self) -> None:
+        while True:
+            priority, _, job = await self._queue.get()
+            if job.evicted:
+                self._queue.task_done()
+                continue
+            # Jobs of one priority leave the heap in submission order
+            self._waiting[priority].popleft()
+            try:
+                result = await self._deliver(job)
+            except asyncio.CancelledError:
+                self._finish(job.kind, job.future, DMResult(False, "cancelled"))
+                self._queue.task_done()
+                raise
+            except Exception as e:
+                logger.exception("DM outbox worker failed on a %s DM", job.kind)
+                result = DMResult(False, "failed", e)
+            if job.dedupe_key is not None and self._pending.get(job.dedupe_key) is job.future:
+                del self._pending[job.dedupe_key]
+            self._finish(job.kind, job.future, result)
+            if result.delivered:
+                sums = self.delivery_seconds.setdefault(job.kind, [0.0, 0])
+                sums[0] += time.perf_counter() - job.queued_at
+                sums[1] += 1
+            self._queue.task_done()
+
+    async def _deliver(self, job: _Job) -> DMResult:
+        user = job.recipient
+        user_id = user if isinstance(user, int) else user.id
+        if self.dms_closed(user_id):
+            return DMResult(False, "closed")
+        try:
+            if isinstance(user, int):
+                user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+            message = await user.send(**job.kwargs)
+        except discord.Forbidden as e:
+            self._remember_closed(user_id)
+            return DMResult(False, "forbidden", e)
+        except discord.NotFound as e:
+            return DMResult(False, "not_found", e)
+        except discord.HTTPException as e:
+            logger.warning("Failed to send %s DM to user_id=%s: %s", job.kind, user_id, e)
+            return DMResult(False, "failed", e)
+        return DMResult(True, "delivered", message=message)
+
+    def _remember_closed(self, user_id: int) -> None:
+        now = time.monotonic()
+        if len(self._closed) >= MAX_CLOSED:
+            for uid in [uid for uid, expiry in self._closed.items() if expiry <= now]:
+                del self._closed[uid]
+            if len(self._closed) >= MAX_CLOSED:
+                # Still full: forget the entry closest to expiring
+                del self._closed[min(self._closed, key=self._closed.__getitem__)]
+        self._closed[user_id] = now + CLOSED_TTL
+
+    def _finish(self, kind: str, future: asyncio.Future, result: DMResult) -> None:
+        self.outcomes[(kind, result.outcome)] += 1
+        if not future.done():
+            future.set_result(result)
+
+
+def _collect(bot):
+    outbox: DMOutbox | None = getattr(bot, "dm_outbox", None)
+    if outbox is None:
+        return
+    yield gauge("dm_outbox_queue_depth", "DMs waiting in the outbox.", outbox.queue_depth)
+    yield gauge("dm_outbox_closed_users", "Users remembered as having DMs closed.", len(outbox._closed))
+    if outbox.outcomes:
+        outcomes = counter("dm_outbox_total", "DMs handled by the outbox, by kind and outcome.")
+        for (kind, outcome), value in sorted(outbox.outcomes.items()):
+            outcomes.add(value, kind=kind, outcome=outcome)
+        yield outcomes
+    if outbox.delivery_seconds:
+        seconds = Metric("dm_outbox_delivery_seconds", "summary", "Time from submit to delivery.")
+        for kind, (total, count) in sorted(outbox.delivery_seconds.items()):
+            seconds.add(total, suffix="_sum", kind=kind)
+            seconds.add(count, suffix="_count", kind=kind)
+        yield seconds
+
+
+register_collector("dm_outbox", _collect)
+
+
+__all__ = ["DMOutbox", "DMResult", "Priority"]
@@ -0,0 +1,210 @@
+"""Health and metrics HTTP server for hosting platforms and monitoring.
+
+Runs on the bot's own event loop with ``aiohttp.web`` (replacing the old
+Flask keep-alive thread) and reads the bot's live state:
+
+* ``/``, ``/ping``: plain liveness responses for uptime pingers.
+* ``/health``: JSON report of gateway connection, heartbeat latency, log
+  queue depth, database reachability and event-loop lag. Returns 200 for
+  ``ok``/``degraded`` and 503 for ``down`` (gateway disconnected or the
+  database unreachable), so platform health checks only restart us when
+  something is actually broken.
+* ``/metrics``: Prometheus text format from the :mod:`utils.metrics` registry.
+"""
+import asyncio
+import logging
+import math
+import os
+import sqlite3
+import time
+from typing import Any, Optional
+
+from aiohttp import web
+
+from config import DATABASE_NAME
+from utils.loop_monitor import get_loop_monitor
+from utils.metrics import counter, gauge, register_collector, render
+from utils.rate_limit import rate_limiters
+
+logger = logging.getLogger("codeverse.health_server")
+
+# /health thresholds (seconds / items)
+MAX_HEARTBEAT_LATENCY = 5.0
+MAX_LOOP_LAG = 1.0
+MAX_LOG_QUEUE = 500
+DB_CHECK_TIMEOUT = 2.0
+
+
+def _ping_database() -> None:
+    conn = sqlite3.connect(DATABASE_NAME, timeout=DB_CHECK_TIMEOUT)
+    try:
+        conn.execute("SELECT 1").fetchone()
+    finally:
+        conn.close()
+
+
+def _log_queue_depth(bot) -> Optional[int]:
+    logging_cog = bot.get_cog("LoggingCog")
+    queue = getattr(logging_cog, "log_queue", None)
+    return queue.qsize() if queue is not None else None
+
+
+def _gateway_connected(bot) -> bool:
+    ws = getattr(bot, "ws", None)
+    return bot.is_ready() and not bot.is_closed() and ws is not None and ws.open
+
+
+class HealthServer:
+    """aiohttp server exposing ``/health`` and ``/metrics`` for ``bot``."""
+
+    def __init__(self, bot, host: str = "0.0.0.0", port: Optional[int] = None) -> None:
+        self.bot = bot
+        self.host = host
+        self.port = port if port is not None else int(os.getenv("PORT", 8080))
+        self.started_at = time.time()
+        self._runner: Optional[web.AppRunner] = None
+
+        app = web.Application()
+        app.router.add_get("/", self.home)
+        app.router.add_get("/ping", self.ping)
+        app.router.add_get("/health", self.health)
+        app.router.add_get("/metrics", self.metrics)
+        self.app = app
+
+    async def start(self) -> None:
+        get_loop_monitor().start()
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info("Health server started on port %s", self.port)
+
+    async def stop(self) -> None:
+        get_loop_monitor().stop()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ------------------------------------------------------------------
+    # Handlers
+    # ------------------------------------------------------------------
+    async def home(self, request: web.Request) -> web.Response:
+        return web.Response(text="CodeVerse Bot is running! 🤖")
+
+    async def ping(self, request: web.Request) -> web.Response:
+        return web.Response(text="pong")
+
+    async def health(self, request: web.Request) -> web.Response:
+        report = await self.health_report()
+        status = 503 if report["status"] == "down" else 200
+        return web.json_response(report, status=status)
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=render(self.bot),
+            content_type="text/plain",
+            charset="utf-8",
+            headers={"X-Prometheus-Format": "0.0.4"},
+        )
+
+    # ------------------------------------------------------------------
+    # Health evaluation
+    # ------------------------------------------------------------------
+    async def health_report(self) -> dict[str, Any]:
+        bot = self.bot
+        problems: list[str] = []
+        down = False
+
+        connected = _gateway_connected(bot)
+        if not connected:
+            down = True
+            problems.append("gateway disconnected")
+
+        latency = bot.latency
+        latency_ms = None if math.isinf(latency) or math.isnan(latency) else round(latency * 1000)
+        if connected and (latency_ms is None or latency > MAX_HEARTBEAT_LATENCY):
+            problems.append("heartbeat latency high")
+
+        db_ok = True
+        try:
+            await asyncio.wait_for(asyncio.to_thread(_ping_database), DB_CHECK_TIMEOUT + 1)
+        except Exception as e:
+            db_ok = False
+            down = True
+            problems.append(f"database unreachable: {e}")
+
+        monitor = get_loop_monitor()
+        if monitor.last_lag > MAX_LOOP_LAG:
+            problems.append("event loop lagging")
+
+        queue_depth = _log_queue_depth(bot)
+        if queue_depth is not None and queue_depth > MAX_LOG_QUEUE:
+            problems.append("log queue backlog")
+
+        return {
+            "status": "down" if down else ("degraded" if problems else "ok"),
+            "problems": problems,
+            "gateway_connected": connected,
+            "heartbeat_latency_ms": latency_ms,
+            "log_queue_depth": queue_depth,
+            "database_ok": db_ok,
+            "loop_lag_ms": round(monitor.last_lag * 1000, 1),
+            "loop_lag_max_ms": round(monitor.max_lag * 1000, 1),
+            "guilds": len(bot.guilds),
+            "uptime_seconds": round(time.time() - self.started_at),
+            "instance": getattr(bot, "instance_id", None),
+            "platform": os.getenv("HOSTING_PLATFORM", "local"),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Built-in collectors
+# ---------------------------------------------------------------------------
+def _bot_metrics(bot):
+    latency = bot.latency
+    yield gauge("gateway_connected", "1 if the gateway websocket is connected and ready.", int(_gateway_connected(bot)))
+    yield gauge(
+        "heartbeat_latency_seconds",
+        "Gateway heartbeat latency.",
+        latency if not math.isinf(latency) else float("nan"),
+    )
+    yield gauge("guilds", "Guilds the bot is in.", len(bot.guilds))
+    start_time = getattr(bot, "start_time", None)
+    if start_time is not None:
+        yield gauge("start_time_seconds", "Process start time (unix).", start_time.timestamp())
+    depth = _log_queue_depth(bot)
+    if depth is not None:
+        yield gauge("log_queue_depth", "Pending entries in the logging queue.", depth)
+
+    monitor = get_loop_monitor()
+    yield gauge("event_loop_lag_seconds", "Most recent event-loop scheduling lag.", monitor.last_lag)
+    yield gauge("event_loop_lag_max_seconds", "Largest event-loop lag seen since start.", monitor.max_lag)
+    yield counter("event_loop_slow_samples_total", "Lag samples above the warning threshold.", monitor.slow_samples)
+
+    stats_cog = bot.get_cog("GuildStats")
+    if stats_cog is not None:
+        totals = stats_cog.totals()
+        members = gauge("members", "Cached members across guilds.")
+        members.add(totals.humans, kind="human").add(totals.bots, kind="bot")
+        yield members
+
+
+def _rate_limit_metrics(bot):
+    limiters = sorted(rate_limiters().items())
+    if not limiters:
+        return
+    allowed = counter("rate_limit_allowed_total", "Hits allowed by each rate limiter.")
+    denied = counter("rate_limit_denied_total", "Hits denied by each rate limiter.")
+    keys = gauge("rate_limit_keys", "Keys tracked by each rate limiter.")
+    for name, limiter in limiters:
+        allowed.add(limiter.allowed, limiter=name)
+        denied.add(limiter.denied, limiter=name)
+        keys.add(len(limiter), limiter=name)
+    yield from (allowed, denied, keys)
+
+
+register_collector("bot", _bot_metrics)
+register_collector("rate_limits", _rate_limit_metrics)
+
+
+__all__ = ["HealthServer"]
@@ -0,0 +1,128 @@
+"""Import-time profiling and background preloading of heavy dependencies.
+
+``enable()`` installs a meta path finder that times every module executed
+from then on, much like ``python -X importtime``: each record has the time
+spent in the module body itself and the cumulative time including the
+modules it imported. It is opt-in (``IMPORT_PROFILE=1``) because it wraps
+every loader; ``report()`` / ``format_report()`` expose the results to the
+logs and ``?startup``.
+
+``preload()`` imports modules in a daemon thread so third-party packages
+(SQLAlchemy, SQLModel, pydantic-settings) are compiled and executed
+while the main thread is busy logging in, instead of on the critical path.
+"""
+from __future__ import annotations
+
+import importlib
+import importlib.abc
+import logging
+import sys
+import threading
+import time
+from typing import Iterable, Optional
+
+logger = logging.getLogger("codeverse.import_profile")
+
+# module name -> [self seconds, cumulative seconds]
+_timings: dict[str, list[float]] = {}
+_stack = threading.local()
+_finder: Optional["_TimingFinder"] = None
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Wraps a loader so ``exec_module`` is timed."""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        children = getattr(_stack, "children", None)
+        if children is None:
+            children = _stack.children = [0.0]
+        children.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - start
+            nested = children.pop()
+            children[-1] += cumulative
+            _timings[module.__name__] = [cumulative - nested, cumulative]
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Delegates to the remaining finders and wraps the loader they return."""
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            # Only source/bytecode/extension loaders with exec_module can be timed.
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader)
+            return spec
+        return None
+
+
+def enable() -> None:
+    """Start timing module imports (idempotent)."""
+    global _finder
+    if _finder is None:
+        _finder = _TimingFinder()
+        sys.meta_path.insert(0, _finder)
+
+
+def disable() -> None:
+    global _finder
+    if _finder is not None:
+        sys.meta_path.remove(_finder)
+        _finder = None
+
+
+def is_enabled() -> bool:
+    return _finder is not None
+
+
+def report(limit: int = 15, *, by: str = "cumulative") -> list[tuple[str, float, float]]:
+    """Slowest imports as ``(module, self_seconds, cumulative_seconds)``."""
+    index = 1 if by == "cumulative" else 0
+    rows = sorted(_timings.items(), key=lambda item: item[1][index], reverse=True)
+    return [(name, own, cumulative) for name, (own, cumulative) in rows[:limit]]
+
+
+def format_report(limit: int = 15) -> str:
+    """``-X importtime``-style table (microseconds) of the slowest imports."""
+    lines = ["import time:       self [us] |  cumulative | imported package"]
+    for name, own, cumulative in report(limit):
+        lines.append(f"import time: {own * 1e6:>15.0f} | {cumulative * 1e6:>11.0f} | {name}")
+    return "\n".join(lines)
+
+
+def preload(modules: Iterable[str]) -> threading.Thread:
+    """Import ``modules`` in a daemon thread; failures are only logged."""
+    modules = tuple(modules)
+
+    def _run():
+        start = time.perf_counter()
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                logger.debug("Preload of %s failed: %s", name, e)
+        logger.info("Preloaded %s in %.0f ms", ", ".join(modules), (time.perf_counter() - start) * 1000)
+
+    thread = threading.Thread(target=_run, name="import-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+__all__ = ["enable", "disable", "is_enabled", "report", "format_report", "preload"]
@@ -0,0 +1,265 @@
+"""Resumable backfill of intro reactions in the introductions channel.
+
+``?introreact`` starts an :class:`IntroBackfill` job in the background and
+returns immediately. The job walks the channel history oldest first and
+adds whichever of ``INTRO_REACTIONS`` the bot has not added yet:
+
+* Reaction state comes from the history payload (``Message.reactions`` with
+  ``me``), so messages that already carry every reaction are skipped without
+  another request.
+* A few messages are reacted to at a time. Pacing is left to discord.py's
+  HTTP client, which waits on each route's bucket using the
+  ``X-RateLimit-Remaining``/``Reset-After`` headers, so there are no fixed
+  sleeps.
+* Progress is checkpointed to SQLite (``intro_reaction_backfill``) every
+  ``CHECKPOINT_EVERY`` messages and when the job stops, so a failed or
+  interrupted run resumes after the last processed message.
+
+``?introreact status`` reads the live counters (or the stored checkpoint when
+no job is running).
+"""
+import asyncio
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+
+import discord  # type: ignore[import-not-found]
+
+from config import DATABASE_NAME
+
+logger = logging.getLogger("codeverse.intro_backfill")
+
+CONCURRENCY = 4
+CHECKPOINT_EVERY = 25
+
+
+@dataclass(slots=True)
+class BackfillStatus:
+    guild_id: int
+    channel_id: int
+    state: str = "idle"  # idle, running, done, stopped, interrupted, failed
+    last_message_id: Optional[int] = None
+    scanned: int = 0
+    reacted: int = 0
+    skipped: int = 0  # already had every reaction
+    error: Optional[str] = None
+    started: Optional[float] = None  # monotonic, this run only
+    scanned_at_start: int = 0
+    updated_at: Optional[str] = None
+
+    @property
+    def rate(self) -> float:
+        """Messages scanned per second in the current run."""
+        if self.started is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started
+        return (self.scanned - self.scanned_at_start) / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        text = (
+            f"**{self.state}** • scanned {self.scanned} • reacted {self.reacted} "
+            f"• already done {self.skipped}"
+        )
+        if self.state == "running":
+            text += f" • {self.rate:.1f} msg/s"
+        if self.last_message_id:
+            text += f"\nCheckpoint: message `{self.last_message_id}`"
+        if self.error:
+            text += f"\nError: {self.error}"
+        return text
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint storage
+# ---------------------------------------------------------------------------
+def init_backfill_db() -> None:
+    with sqlite3.connect(DATABASE_NAME) as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS intro_reaction_backfill (
+                guild_id INTEGER PRIMARY KEY,
+                channel_id INTEGER NOT NULL,
+                last_message_id INTEGER,
+                scanned INTEGER DEFAULT 0,
+                reacted INTEGER DEFAULT 0,
+                skipped INTEGER DEFAULT 0,
+                state TEXT DEFAULT 'idle',
+                error TEXT,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+
+def load_checkpoint(guild_id: int, channel_id: int) -> BackfillStatus:
+    """Stored progress for ``guild_id`` (a fresh status if none, or if the channel changed)."""
+    with sqlite3.connect(DATABASE_NAME) as conn:
+        row = conn.execute(
+            '''SELECT channel_id, last_message_id, scanned, reacted, skipped, state, error, updated_at
+               FROM intro_reaction_backfill WHERE guild_id = ?''',
+            (guild_id,),
+        ).fetchone()
+    if row is None or row[0] != channel_id:
+        return BackfillStatus(guild_id, channel_id)
+    return BackfillStatus(
+        guild_id,
+        channel_id,
+        # A run that was still "running" when the bot stopped
+        state="interrupted" if row[5] == "running" else row[5],
+        last_message_id=row[1],
+        scanned=row[2],
+        reacted=row[3],
+        skipped=row[4],
+        error=row[6],
+        updated_at=row[7],
+    )
+
+
+def save_checkpoint(status: BackfillStatus) -> None:
+    status.updated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with sqlite3.connect(DATABASE_NAME) as conn:
+        conn.execute(
+            '''INSERT OR REPLACE INTO intro_reaction_backfill
+               (guild_id, channel_id, last_message_id, scanned, reacted, skipped, state, error, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+            (
+                status.guild_id,
+                status.channel_id,
+                status.last_message_id,
+                status.scanned,
+                status.reacted,
+                status.skipped,
+                status.state,
+                status.error,
+                status.updated_at,
+            ),
+        )
+
+
+def clear_checkpoint(guild_id: int) -> None:
+    with sqlite3.connect(DATABASE_NAME) as conn:
+        conn.execute('DELETE FROM intro_reaction_backfill WHERE guild_id = ?', (guild_id,))
+
+
+# ---------------------------------------------------------------------------
+# Job
+# ---------------------------------------------------------------------------
+def missing_reactions(message: discord.Message, emojis: Sequence[str]) -> list[str]:
+    """The emojis in ``emojis`` the bot has not added to ``message`` yet."""
+    mine = {str(reaction.emoji) for reaction in message.reactions if reaction.me}
+    return [emoji for emoji in emojis if emoji not in mine]
+
+
+class IntroBackfill:
+    """One backfill run over a channel, resuming from ``status.last_message_id``."""
+
+    def __init__(
+        self,
+        channel: discord.TextChannel,
+        status: BackfillStatus,
+        emojis: Sequence[str],
+        limit: Optional[int] = None,
+    ):
+        self.channel = channel
+        self.status = status
+        self.emojis = list(emojis)
+        self.limit = limit
+        self.task: Optional[asyncio.Task] = None
+        self.on_finish = None  # optional coroutine function(status)
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self) -> asyncio.Task:
+        self.task = asyncio.create_task(self._run(), name=f"intro_backfill:{self.status.guild_id}")
+        return self.task
+
+    def stop(self) -> None:
+        if self.running:
+            self.task.cancel()
+
+    async def _react(self, message: discord.Message, emojis: list[str]) -> None:
+        for emoji in emojis:
+            try:
+                await message.add_reaction(emoji)
+            except discord.Forbidden:
+                raise
+            except discord.HTTPException:
+                # Non-fatal (message deleted / transient API issue)
+                continue
+
+    async def _process(self, batch: list[tuple[discord.Message, list[str]]]) -> None:
+        if batch:
+            await asyncio.gather(*(self._react(message, emojis) for message, emojis in batch))
+            self.status.reacted += len(batch)
+
+    async def _run(self) -> None:
+        status = self.status
+        status.state = "running"
+        status.error = None
+        status.started = time.monotonic()
+        status.scanned_at_start = status.scanned
+        after = discord.Object(id=status.last_message_id) if status.last_message_id else None
+        since_checkpoint = 0
+        batch: list[tuple[discord.Message, list[str]]] = []
+        try:
+            async for message in self.channel.history(limit=self.limit, after=after, oldest_first=True):
+                status.scanned += 1
+                is_reply = getattr(message.reference, 'message_id', None) is not None
+                if not message.author.bot and not is_reply:
+                    emojis = missing_reactions(message, self.emojis)
+                    if emojis:
+                        batch.append((message, emojis))
+                    else:
+                        status.skipped += 1
+                if len(batch) >= CONCURRENCY:
+                    await self._process(batch)
+                    batch = []
+                if not batch:
+                    # Everything up to here is done; safe to resume after it
+                    status.last_message_id = message.id
+                    since_checkpoint += 1
+                    if since_checkpoint >= CHECKPOINT_EVERY:
+                        since_checkpoint = 0
+                        await asyncio.to_thread(save_checkpoint, status)
+            await self._process(batch)
+            if batch:
+                status.last_message_id = batch[-1][0].id
+            status.state = "done"
+        except asyncio.CancelledError:
+            status.state = "stopped"
+            raise
+        except discord.Forbidden:
+            status.state = "failed"
+            status.error = "Missing permissions to read history and/or add reactions."
+        except Exception as e:
+            status.state = "failed"
+            status.error = str(e)[:200]
+            logger.exception("Intro reaction backfill failed in channel_id=%s", self.channel.id)
+        finally:
+            try:
+                await asyncio.to_thread(save_checkpoint, status)
+            except Exception as e:
+                logger.warning("Could not save intro backfill checkpoint: %s", e)
+            logger.info(
+                "Intro reaction backfill %s: channel_id=%s scanned=%s reacted=%s skipped=%s",
+                status.state, self.channel.id, status.scanned, status.reacted, status.skipped,
+            )
+            if self.on_finish is not None:
+                try:
+                    await self.on_finish(status)
+                except Exception as e:
+                    logger.debug("Intro backfill finish callback failed: %s", e)
+
+
+__all__ = [
+    "BackfillStatus",
+    "IntroBackfill",
+    "clear_checkpoint",
+    "init_backfill_db",
+    "load_checkpoint",
+    "missing_reactions",
+    "save_checkpoint",
+]
@@ -17,6 +17,8 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 _LOCKS: Dict[str, asyncio.Lock] = {}
+# guild_id -> configured prefix (None = no override); filled on first read
+_PREFIXES: Dict[int, Optional[str]] = {}
 _BASE = os.path.join('data')
 
 def _path(name: str) -> str:
@@ -110,14 +112,38 @@ async def health_snapshot() -> Dict[str, int]:
 
 # Guild settings ------------------------------------------------------------
 async def get_guild_prefix(guild_id: int) -> Optional[str]:
-    """Return the configured prefix for a guild, or None if not set."""
+    """Return the configured prefix for a guild, or None if not set.
+
+    The file is only read the first time a guild is looked up; after that the
+    cached value is returned (``set_guild_prefix`` keeps it current).
+    """
+    if guild_id in _PREFIXES:
+        return _PREFIXES[guild_id]
     path = _path('guild_settings.json')
     data = await _load(path)
     settings = data.get(str(guild_id), {})
-    prefix = settings.get('prefix')
-    if isinstance(prefix, str) and prefix:
-        return prefix
-    return None
+    prefix = settings.get('prefix') if isinstance(settings, dict) else None
+    if not (isinstance(prefix, str) and prefix):
+        prefix = None
+    _PREFIXES[guild_id] = prefix
+    return prefix
+
+def cached_guild_prefix(guild_id: int) -> tuple[bool, Optional[str]]:
+    """Synchronous cache lookup: ``(known, prefix)``.
+
+    ``known`` is False until the guild's prefix has been read once with
+    ``get_guild_prefix``.
+    """
+    if guild_id in _PREFIXES:
+        return True, _PREFIXES[guild_id]
+    return False, None
+
+def invalidate_guild_prefix(guild_id: Optional[int] = None) -> None:
+    """Forget the cached prefix of one guild (or all), e.g. after editing the file by hand."""
+    if guild_id is None:
+        _PREFIXES.clear()
+    else:
+        _PREFIXES.pop(guild_id, None)
 
 async def set_guild_prefix(guild_id: int, prefix: str) -> None:
     """Set (or overwrite) the configured prefix for a guild."""
@@ -130,6 +156,7 @@ async def set_guild_prefix(guild_id: int, prefix: str) -> None:
     settings['prefix'] = prefix
     data[key] = settings
     await _save(path, data)
+    _PREFIXES[guild_id] = prefix
 
 __all__ = [
     'add_warning',
@@ -140,5 +167,7 @@ __all__ = [
     'get_qotd_submissions',
     'health_snapshot',
     'get_guild_prefix',
+    'cached_guild_prefix',
+    'invalidate_guild_prefix',
     'set_guild_prefix',
 ]
@@ -0,0 +1,222 @@
+"""Event-loop scheduling lag sampler and blocking-call detector.
+
+A background task sleeps for ``interval`` seconds and measures how late it
+wakes up. The overshoot is time the loop spent running other callbacks
+instead of servicing timers, i.e. how long a blocked loop delays heartbeats
+and interaction acknowledgements.
+
+To find *what* blocked it, the loop also bumps a tick timestamp every
+``TICK_INTERVAL`` and a watchdog thread checks it. When the loop has not
+ticked for ``block_threshold`` seconds the watchdog grabs the loop thread's
+current stack (``sys._current_frames``), which is the code that is blocking
+right now, e.g. a synchronous ``sqlite3`` query or ``json_store`` write.
+Each blocking episode is attributed to a *site*: the innermost frame from
+this project (falling back to the innermost frame), logged with its stack
+and counted for ``/metrics`` and ``?diag perf``. While the watchdog runs, the
+sampler logs lag it has already reported at debug level, so each stall is
+warned about once.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from utils.metrics import counter, register_collector
+
+logger = logging.getLogger("codeverse.loop_monitor")
+
+TICK_INTERVAL = 0.05
+WATCHDOG_POLL = 0.05
+MAX_SITES = 200
+STACK_LIMIT = 12
+
+# Project source root (src/); frames under it are preferred as blocking sites
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+
+class BlockingSite:
+    """Aggregated blocking episodes attributed to one code location."""
+
+    __slots__ = ("site", "count", "total", "max", "stack")
+
+    def __init__(self, site: str, stack: str) -> None:
+        self.site = site
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.stack = stack  # most recent captured stack
+
+
+def _blocking_site(frames: list[traceback.FrameSummary]) -> str:
+    for frame in reversed(frames):
+        if frame.filename.startswith(_SOURCE_ROOT):
+            return f"{os.path.relpath(frame.filename, _SOURCE_ROOT)}:{frame.lineno} ({frame.name})"
+    frame = frames[-1]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno} ({frame.name})"
+
+
+class LoopLagMonitor:
+    """Continuously samples event-loop lag (seconds)."""
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        *,
+        warn_threshold: float = 0.25,
+        block_threshold: float = 0.25,
+        detect_blocking: bool = True,
+    ) -> None:
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.block_threshold = block_threshold
+        self.detect_blocking = detect_blocking
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.slow_samples = 0  # samples at or above warn_threshold
+        self._task: Optional[asyncio.Task] = None
+
+        # Blocking-call detector state (shared with the watchdog thread)
+        self.blocking_sites: dict[str, BlockingSite] = {}
+        self.blocked_episodes = 0
+        self._last_tick = time.perf_counter()
+        self._tick_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_watchdog = threading.Event()
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        if self.detect_blocking and (self._watchdog is None or not self._watchdog.is_alive()):
+            self._loop = loop
+            self._loop_thread_id = threading.get_ident()
+            self._last_tick = time.perf_counter()
+            self._tick_handle = loop.call_later(TICK_INTERVAL, self._tick)
+            self._stop_watchdog.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._tick_handle is not None:
+            self._tick_handle.cancel()
+            self._tick_handle = None
+        self._stop_watchdog.set()
+        self._watchdog = None
+
+    # ------------------------------------------------------------------
+    # Blocking-call detection
+    # ------------------------------------------------------------------
+    def _tick(self) -> None:
+        self._last_tick = time.perf_counter()
+        self._tick_handle = self._loop.call_later(TICK_INTERVAL, self._tick)
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop thread's stack while it is stuck."""
+        episode_tick: Optional[float] = None
+        episode_site: Optional[BlockingSite] = None
+        while not self._stop_watchdog.wait(WATCHDOG_POLL):
+            last_tick = self._last_tick
+            stalled = time.perf_counter() - last_tick - TICK_INTERVAL
+
+            if episode_tick is not None and last_tick != episode_tick:
+                # Loop recovered: the gap between ticks is the blocked time.
+                blocked = max(last_tick - episode_tick - TICK_INTERVAL, 0.0)
+                if episode_site is not None:
+                    episode_site.total += blocked
+                    episode_site.max = max(episode_site.max, blocked)
+                episode_tick = episode_site = None
+
+            if stalled < self.block_threshold or episode_tick is not None:
+                continue
+
+            episode_tick = last_tick
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            frames = traceback.extract_stack(frame)
+            del frame
+            if not frames:
+                continue
+            stack = "".join(traceback.format_list(frames[-STACK_LIMIT:]))
+            episode_site = self._record_block(_blocking_site(frames), stack)
+            logger.warning(
+                "Event loop blocked for %.0f ms+ at %s\n%s",
+                stalled * 1000,
+                episode_site.site if episode_site else "?",
+                stack,
+            )
+
+    def _record_block(self, site: str, stack: str) -> Optional[BlockingSite]:
+        self.blocked_episodes += 1
+        record = self.blocking_sites.get(site)
+        if record is None:
+            if len(self.blocking_sites) >= MAX_SITES:
+                return None
+            record = self.blocking_sites[site] = BlockingSite(site, stack)
+        record.count += 1
+        record.stack = stack
+        return record
+
+    def top_blocking_sites(self, limit: int = 10) -> list[BlockingSite]:
+        sites = list(self.blocking_sites.values())
+        sites.sort(key=lambda s: s.total, reverse=True)
+        return sites[:limit]
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - expected, 0.0)
+            self.last_lag = lag
+            self.samples += 1
+            if lag > self.max_lag:
+                self.max_lag = lag
+            if lag >= self.warn_threshold:
+                self.slow_samples += 1
+                # A stall this long was already logged (with its stack) by the watchdog
+                reported = lag >= self.block_threshold and self._watchdog is not None and self._watchdog.is_alive()
+                logger.log(logging.DEBUG if reported else logging.WARNING, "Event loop lagged %.0f ms", lag * 1000)
+
+
+_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Process-wide monitor (created on first use, started by the caller)."""
+    global _monitor
+    if _monitor is None:
+        _monitor = LoopLagMonitor()
+    return _monitor
+
+
+def _collect(bot):
+    monitor = _monitor
+    if monitor is None or not monitor.blocking_sites:
+        return
+    episodes = counter("event_loop_blocked_total", "Blocking episodes detected per code site.")
+    seconds = counter("event_loop_blocked_seconds_total", "Time the loop was blocked per code site.")
+    for record in monitor.top_blocking_sites(20):
+        episodes.add(record.count, site=record.site)
+        seconds.add(record.total, site=record.site)
+    yield episodes
+    yield seconds
+
+
+register_collector("loop_blocking", _collect)
+
+
+__all__ = ["BlockingSite", "LoopLagMonitor", "get_loop_monitor"]
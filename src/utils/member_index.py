@@ -0,0 +1,127 @@
+"""User -> guild membership index.
+
+Finding the guilds a user shares with the bot normally means asking every
+guild for the member (``User.mutual_guilds`` does the same), which makes
+user-level events such as ``on_user_update`` O(guilds). This index keeps
+``user_id -> guild IDs`` up to date from gateway events so that lookup is a
+single dict access.
+
+Values are tuples rather than sets: nearly every user shares one or two
+guilds with the bot, and a small tuple is a fraction of a set's size. They
+are rebuilt on the (rare) join/leave.
+
+Maintained by listeners that :func:`install` adds in ``CodeVerseBot.__init__``:
+
+* ``on_guild_available`` / ``on_guild_join``: index the guild's members (the
+  guild is already chunked when these fire).
+* ``on_guild_remove`` / ``on_guild_unavailable``: drop the guild.
+* ``on_member_join`` / ``on_raw_member_remove``: add or remove one entry.
+
+Until the bot is ready, guilds that have not been indexed yet are checked
+the slow way, so lookups stay correct while the bot is starting.
+"""
+from __future__ import annotations
+
+import logging
+
+import discord  # type: ignore[import-not-found]
+from discord.ext import commands  # type: ignore[import-not-found]
+
+from utils.memory_diagnostics import register_cache
+
+logger = logging.getLogger("codeverse.member_index")
+
+
+class MutualGuildIndex:
+    """Maintained ``user_id -> guild IDs`` map for one bot."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._guilds_by_user: dict[int, tuple[int, ...]] = {}
+        self._indexed: set[int] = set()
+        register_cache("member_index.users", self._guilds_by_user)
+
+    def __len__(self) -> int:
+        return len(self._guilds_by_user)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def add(self, user_id: int, guild_id: int) -> None:
+        current = self._guilds_by_user.get(user_id, ())
+        if guild_id not in current:
+            self._guilds_by_user[user_id] = current + (guild_id,)
+
+    def discard(self, user_id: int, guild_id: int) -> None:
+        current = self._guilds_by_user.get(user_id)
+        if current is None or guild_id not in current:
+            return
+        remaining = tuple(g for g in current if g != guild_id)
+        if remaining:
+            self._guilds_by_user[user_id] = remaining
+        else:
+            del self._guilds_by_user[user_id]
+
+    def index_guild(self, guild: discord.Guild) -> None:
+        for member in guild.members:
+            self.add(member.id, guild.id)
+        self._indexed.add(guild.id)
+        logger.debug("Indexed %s members of guild_id=%s", guild.member_count, guild.id)
+
+    def drop_guild(self, guild: discord.Guild) -> None:
+        self._indexed.discard(guild.id)
+        for member in guild.members:
+            self.discard(member.id, guild.id)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def guild_ids(self, user_id: int) -> tuple[int, ...]:
+        """IDs of the guilds ``user_id`` shares with the bot."""
+        found = self._guilds_by_user.get(user_id, ())
+        if not self.bot.is_ready():
+            # Startup: fall back to a member lookup for guilds not indexed yet
+            extra = tuple(
+                guild.id
+                for guild in self.bot.guilds
+                if guild.id not in self._indexed and guild.get_member(user_id) is not None
+            )
+            found += extra
+        return found
+
+    def mutual_guilds(self, user_id: int) -> list[discord.Guild]:
+        """Guilds ``user_id`` shares with the bot, confirmed against the member cache."""
+        guilds = []
+        for guild_id in self.guild_ids(user_id):
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None and guild.get_member(user_id) is not None:
+                guilds.append(guild)
+        return guilds
+
+
+def install(bot: commands.Bot) -> MutualGuildIndex:
+    """Create the index for ``bot`` and register the listeners that maintain it."""
+    index = MutualGuildIndex(bot)
+
+    async def on_guild_available(guild: discord.Guild) -> None:
+        index.index_guild(guild)
+
+    async def on_guild_unavailable(guild: discord.Guild) -> None:
+        index.drop_guild(guild)
+
+    async def on_member_join(member: discord.Member) -> None:
+        index.add(member.id, member.guild.id)
+
+    async def on_raw_member_remove(payload: discord.RawMemberRemoveEvent) -> None:
+        index.discard(payload.user.id, payload.guild_id)
+
+    bot.add_listener(on_guild_available, "on_guild_available")
+    bot.add_listener(on_guild_available, "on_guild_join")
+    bot.add_listener(on_guild_unavailable, "on_guild_unavailable")
+    bot.add_listener(on_guild_unavailable, "on_guild_remove")
+    bot.add_listener(on_member_join, "on_member_join")
+    bot.add_listener(on_raw_member_remove, "on_raw_member_remove")
+    return index
+
+
+__all__ = ["MutualGuildIndex", "install"]
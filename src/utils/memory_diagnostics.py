@@ -0,0 +1,182 @@
+"""In-memory cache registry and tracemalloc helpers for memory diagnostics.
+
+Cogs register the long-lived dicts/sets they grow at runtime with
+:func:`register_cache` so ``?diag memory`` and ``/metrics`` can report how
+many entries each holds. The source is either the container itself or a
+zero-argument callable returning it; use a callable when the attribute is
+rebound (e.g. pruned by building a new dict), so the registry never reports a
+stale object. Cogs unregister their caches in ``cog_unload``.
+
+The tracemalloc helpers back ``?diag tracemalloc``: ``start`` begins
+tracing, ``snapshot`` stores a baseline, and ``diff`` compares the current
+heap against it, grouped by allocation site. Tracing slows allocations
+down, so it is only on while an owner is investigating.
+"""
+from __future__ import annotations
+
+import linecache
+import logging
+import os
+import sys
+import tracemalloc
+from collections.abc import Callable, Sized
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from utils.metrics import gauge, register_collector
+
+logger = logging.getLogger("codeverse.memory")
+
+TRACE_FRAMES = 10
+
+CacheSource = Union[Sized, Callable[[], Sized]]
+
+_CACHES: dict[str, CacheSource] = {}
+_baseline: Optional[tracemalloc.Snapshot] = None
+
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+# ---------------------------------------------------------------------------
+# Cache registry
+# ---------------------------------------------------------------------------
+@dataclass(slots=True)
+class CacheSize:
+    name: str
+    entries: int
+    shallow_bytes: int  # container only, not its keys/values
+
+
+def register_cache(name: str, source: CacheSource) -> None:
+    """Track ``source`` under ``name`` (re-registering replaces it)."""
+    _CACHES[name] = source
+
+
+def unregister_cache(name: str) -> None:
+    _CACHES.pop(name, None)
+
+
+def unregister_prefix(prefix: str) -> None:
+    """Drop every cache whose name starts with ``prefix`` (used on cog unload)."""
+    for name in [n for n in _CACHES if n.startswith(prefix)]:
+        del _CACHES[name]
+
+
+def cache_sizes() -> list[CacheSize]:
+    """Current size of every registered cache, largest first."""
+    sizes = []
+    for name, source in list(_CACHES.items()):
+        try:
+            container = source() if callable(source) and not isinstance(source, Sized) else source
+            sizes.append(CacheSize(name, len(container), sys.getsizeof(container)))
+        except Exception as e:
+            logger.debug("Cache %s could not be measured: %s", name, e)
+    sizes.sort(key=lambda c: c.entries, reverse=True)
+    return sizes
+
+
+# ---------------------------------------------------------------------------
+# tracemalloc
+# ---------------------------------------------------------------------------
+def _relative(filename: str) -> str:
+    if filename.startswith(_SOURCE_ROOT):
+        return os.path.relpath(filename, _SOURCE_ROOT)
+    return "/".join(filename.rsplit(os.sep, 2)[-2:])
+
+
+def start_tracing(frames: int = TRACE_FRAMES) -> bool:
+    """Start tracemalloc; returns False if it was already running."""
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(frames)
+    return True
+
+
+def stop_tracing() -> None:
+    global _baseline
+    _baseline = None
+    tracemalloc.stop()
+
+
+def is_tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+
+def has_baseline() -> bool:
+    return _baseline is not None
+
+
+def traced_memory() -> tuple[int, int]:
+    """``(current, peak)`` bytes allocated since tracing started."""
+    return tracemalloc.get_traced_memory()
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+def take_baseline() -> list[tuple[str, int, int]]:
+    """Store a baseline snapshot and return its top allocation sites.
+
+    Blocking (walks every traced block); call it via ``asyncio.to_thread``.
+    """
+    global _baseline
+    _baseline = _snapshot()
+    return [
+        (f"{_relative(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", stat.size, stat.count)
+        for stat in _baseline.statistics("lineno")
+    ]
+
+
+def diff_baseline(limit: int = 10) -> list[tuple[str, int, int, int]]:
+    """Growth since the baseline as ``(site, size_diff, size, count_diff)``.
+
+    Blocking; call it via ``asyncio.to_thread``.
+    """
+    if _baseline is None:
+        raise RuntimeError("No baseline snapshot; run snapshot first")
+    stats = _snapshot().compare_to(_baseline, "lineno")
+    return [
+        (f"{_relative(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", stat.size_diff, stat.size, stat.count_diff)
+        for stat in stats[:limit]
+    ]
+
+
+def _collect(bot):
+    sizes = cache_sizes()
+    if not sizes:
+        return
+    entries = gauge("cache_entries", "Entries held by each registered in-memory cache.")
+    for cache in sizes:
+        entries.add(cache.entries, cache=cache.name)
+    yield entries
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        yield gauge("tracemalloc_current_bytes", "Memory traced by tracemalloc.", current)
+        yield gauge("tracemalloc_peak_bytes", "Peak memory traced by tracemalloc.", peak)
+
+
+register_collector("caches", _collect)
+
+
+__all__ = [
+    "CacheSize",
+    "cache_sizes",
+    "diff_baseline",
+    "has_baseline",
+    "is_tracing",
+    "register_cache",
+    "start_tracing",
+    "stop_tracing",
+    "take_baseline",
+    "traced_memory",
+    "unregister_cache",
+    "unregister_prefix",
+]
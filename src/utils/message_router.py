@@ -0,0 +1,185 @@
+"""Channel- and guild-keyed dispatch for guild messages.
+
+Instead of every cog registering an ``on_message`` listener that re-checks
+``author.bot`` and the channel on each message, cogs subscribe a handler to
+the channels (or guilds) they care about. ``bot.on_message`` calls
+:meth:`MessageRouter.dispatch` once per message: bot authors and DMs are
+filtered there, then two dict lookups find the subscribers for the message's
+channel and guild. Messages nobody subscribed to cost nothing beyond those
+lookups, so per-message work is proportional to the number of subscribers of
+that channel, not to the number of cogs.
+
+Handlers run as their own tasks (like discord.py listeners), so a slow
+handler such as the sticky repost never delays command processing. Each
+subscriber name gets a :class:`SubscriberStats` record with call, error and
+timing totals, exported to ``/metrics`` and shown in ``?diag perf``.
+
+Subscriptions are keyed by a subscriber name; a cog subscribes in
+``cog_load`` (or whenever its channel set changes) and calls
+:meth:`MessageRouter.unsubscribe` with its name in ``cog_unload``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+import discord  # type: ignore[import-not-found]
+
+from utils.metrics import counter, gauge, register_collector
+
+logger = logging.getLogger("codeverse.message_router")
+
+Handler = Callable[[discord.Message], Awaitable[None]]
+
+
+class SubscriberStats:
+    """Call count and timing for one subscriber."""
+
+    __slots__ = ("name", "calls", "errors", "total", "max")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class MessageRouter:
+    """Routes guild messages to the handlers subscribed to their channel or guild."""
+
+    def __init__(self) -> None:
+        # key -> {subscriber name: handler}
+        self._by_channel: dict[int, dict[str, Handler]] = {}
+        self._by_guild: dict[int, dict[str, Handler]] = {}
+        self._stats: dict[str, SubscriberStats] = {}
+        # Strong references to running handler tasks
+        self._tasks: set[asyncio.Task] = set()
+        self.received = 0
+        self.routed = 0
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+    def subscribe_channel(self, channel_id: int, name: str, handler: Handler) -> None:
+        """Deliver messages sent in ``channel_id`` to ``handler``."""
+        self._by_channel.setdefault(channel_id, {})[name] = handler
+        self._stats.setdefault(name, SubscriberStats(name))
+
+    def unsubscribe_channel(self, channel_id: int, name: str) -> None:
+        self._remove(self._by_channel, channel_id, name)
+
+    def subscribe_guild(self, guild_id: int, name: str, handler: Handler) -> None:
+        """Deliver every message sent in ``guild_id`` to ``handler``."""
+        self._by_guild.setdefault(guild_id, {})[name] = handler
+        self._stats.setdefault(name, SubscriberStats(name))
+
+    def unsubscribe_guild(self, guild_id: int, name: str) -> None:
+        self._remove(self._by_guild, guild_id, name)
+
+    def unsubscribe(self, name: str) -> None:
+        """Drop every subscription held by ``name`` (used on cog unload)."""
+        for table in (self._by_channel, self._by_guild):
+            for key in [k for k, handlers in table.items() if name in handlers]:
+                self._remove(table, key, name)
+
+    @staticmethod
+    def _remove(table: dict[int, dict[str, Handler]], key: int, name: str) -> None:
+        handlers = table.get(key)
+        if handlers is None:
+            return
+        handlers.pop(name, None)
+        if not handlers:
+            del table[key]
+
+    def channels_for(self, name: str) -> list[int]:
+        return [channel_id for channel_id, handlers in self._by_channel.items() if name in handlers]
+
+    @property
+    def subscription_count(self) -> int:
+        return sum(map(len, self._by_channel.values())) + sum(map(len, self._by_guild.values()))
+
+    def subscriber_stats(self) -> list[SubscriberStats]:
+        """Stats for every subscriber, most time spent first."""
+        return sorted(self._stats.values(), key=lambda s: s.total, reverse=True)
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def dispatch(self, message: discord.Message) -> int:
+        """Schedule the subscribers for ``message``; returns how many matched."""
+        if message.author.bot or message.guild is None:
+            return 0
+        self.received += 1
+        matched = 0
+        handlers = self._by_channel.get(message.channel.id)
+        if handlers:
+            for name, handler in handlers.items():
+                self._schedule(name, handler, message)
+            matched += len(handlers)
+        handlers = self._by_guild.get(message.guild.id)
+        if handlers:
+            for name, handler in handlers.items():
+                self._schedule(name, handler, message)
+            matched += len(handlers)
+        if matched:
+            self.routed += 1
+        return matched
+
+    def _schedule(self, name: str, handler: Handler, message: discord.Message) -> None:
+        task = asyncio.create_task(self._run(name, handler, message), name=f"message_router:{name}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, name: str, handler: Handler, message: discord.Message) -> None:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = SubscriberStats(name)
+        started = time.perf_counter()
+        try:
+            await handler(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.errors += 1
+            logger.exception("Message subscriber %s failed on message_id=%s", name, message.id)
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.calls += 1
+            stats.total += elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+
+
+def _collect(bot):
+    router: MessageRouter | None = getattr(bot, "message_router", None)
+    if router is None:
+        return
+    yield counter("message_router_messages_total", "Guild messages from users seen by the router.", router.received)
+    yield counter("message_router_routed_total", "Messages delivered to at least one subscriber.", router.routed)
+    yield gauge("message_router_subscriptions", "Active channel and guild subscriptions.", router.subscription_count)
+    stats = router.subscriber_stats()
+    if not stats:
+        return
+    calls = counter("message_router_handler_calls_total", "Handler invocations per subscriber.")
+    errors = counter("message_router_handler_errors_total", "Handler failures per subscriber.")
+    seconds = counter("message_router_handler_seconds_total", "Time spent in each subscriber's handler.")
+    for s in stats:
+        calls.add(s.calls, subscriber=s.name)
+        errors.add(s.errors, subscriber=s.name)
+        seconds.add(s.total, subscriber=s.name)
+    yield calls
+    yield errors
+    yield seconds
+
+
+register_collector("message_router", _collect)
+
+
+__all__ = ["Handler", "MessageRouter", "SubscriberStats"]
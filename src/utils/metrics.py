@@ -0,0 +1,106 @@
+"""Prometheus text-format metrics registry.
+
+Subsystems register a *collector* (a callable taking the bot and yielding
+:class:`Metric` objects) under a unique name; ``render()`` calls every
+collector when ``/metrics`` is scraped, so values are always read live from
+the structures that own them instead of being copied into a second store.
+Registering the same name again (e.g. after a cog reload) replaces the old
+collector.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger("codeverse.metrics")
+
+METRIC_PREFIX = "codeverse_"
+
+
+@dataclass(slots=True)
+class Metric:
+    """One metric family and its samples."""
+
+    name: str
+    kind: str  # "gauge", "counter", "summary" or "untyped"
+    help: str
+    # (name suffix such as "_sum"/"_count", labels, value)
+    samples: list[tuple[str, dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float, *, suffix: str = "", **labels: Any) -> "Metric":
+        self.samples.append((suffix, {k: str(v) for k, v in labels.items()}, float(value)))
+        return self
+
+
+Collector = Callable[[Any], Iterable[Metric]]
+
+_COLLECTORS: dict[str, Collector] = {}
+
+
+def register_collector(name: str, collector: Collector) -> None:
+    _COLLECTORS[name] = collector
+
+
+def unregister_collector(name: str) -> None:
+    _COLLECTORS.pop(name, None)
+
+
+def gauge(name: str, help: str, value: float | None = None, **labels: Any) -> Metric:
+    metric = Metric(name, "gauge", help)
+    return metric.add(value, **labels) if value is not None else metric
+
+
+def counter(name: str, help: str, value: float | None = None, **labels: Any) -> Metric:
+    metric = Metric(name, "counter", help)
+    return metric.add(value, **labels) if value is not None else metric
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def render(bot: Any) -> str:
+    """Render every registered collector in the Prometheus text format."""
+    lines: list[str] = []
+    for collector_name, collector in list(_COLLECTORS.items()):
+        try:
+            metrics = list(collector(bot))
+        except Exception as e:
+            # One broken collector must not take the whole scrape down.
+            logger.warning("Metrics collector %s failed: %s", collector_name, e)
+            continue
+        for metric in metrics:
+            name = METRIC_PREFIX + metric.name
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for suffix, labels, value in metric.samples:
+                sample_name = name + suffix
+                if labels:
+                    label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                    lines.append(f"{sample_name}{{{label_str}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{sample_name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "Metric",
+    "counter",
+    "gauge",
+    "register_collector",
+    "render",
+    "unregister_collector",
+]
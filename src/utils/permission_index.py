@@ -0,0 +1,243 @@
+"""Precomputed channel × role permission matrix for the ``?ls`` audit tools.
+
+A :class:`GuildPermissionIndex` resolves every channel's effective
+permissions for every role once and stores them as 64-bit bitfields
+(``array('Q')``, one row per role, one column per channel). Audit queries
+such as "which channels can @everyone send in" then become a bitmask scan
+over a single row instead of per-call overwrite resolution.
+
+Rows and columns are patched incrementally from channel/role events
+(see ``EmbedBuilder``'s listeners); changes to ``@everyone`` affect every
+cell, so they trigger a full rebuild of that guild's index.
+
+Member targets are not stored (their permissions depend on member-specific
+overwrites and role combinations) and keep using ``permissions_for``.
+"""
+from __future__ import annotations
+
+import logging
+from array import array
+from typing import Iterator, Optional
+
+import discord  # type: ignore[import-not-found]
+
+logger = logging.getLogger("codeverse.permission_index")
+
+# Common aliases accepted by the ``?w <target> <permission>`` filters.
+PERMISSION_ALIASES: dict[str, str] = {
+    'sendmessage': 'send_messages',
+    'sendmessages': 'send_messages',
+    'sendingmessages': 'send_messages',
+    'send': 'send_messages',
+    'view': 'view_channel',
+    'viewchannel': 'view_channel',
+    'viewchannels': 'view_channel',
+    'read': 'view_channel',
+    'readmessage': 'view_channel',
+    'readmessages': 'view_channel',
+    'connect': 'connect',
+    'speak': 'speak',
+    'manage': 'manage_channels',
+    'admin': 'administrator',
+    'embed': 'embed_links',
+    'embeds': 'embed_links',
+    'embedlink': 'embed_links',
+    'attach': 'attach_files',
+    'files': 'attach_files',
+    'file': 'attach_files',
+    'image': 'attach_files',
+    'addreaction': 'add_reactions',
+    'addreactions': 'add_reactions',
+    'reaction': 'add_reactions',
+    'history': 'read_message_history',
+    'managemessage': 'manage_messages',
+    'managemessages': 'manage_messages',
+}
+
+# Includes the alias flags (view_channel, manage_emojis, ...) admins usually type
+VALID_PERMISSIONS: tuple[str, ...] = tuple(discord.Permissions.VALID_FLAGS)
+_STRIPPED_PERMISSIONS: dict[str, str] = {name.replace("_", ""): name for name in VALID_PERMISSIONS}
+
+
+def match_permission(text: str, aliases: bool = True) -> Optional[str]:
+    """Resolve user input (alias, snake_case or squashed) to a permission name, exact matches only."""
+    clean_input = text.lower().replace(" ", "").replace("_", "")
+    # 1. Alias map
+    if aliases and clean_input in PERMISSION_ALIASES:
+        return PERMISSION_ALIASES[clean_input]
+    # 2. Direct snake_case name ("manage_channels")
+    snake_input = text.lower().replace(" ", "_")
+    if snake_input in VALID_PERMISSIONS:
+        return snake_input
+    # 3. Underscores ignored ("managechannels")
+    return _STRIPPED_PERMISSIONS.get(clean_input)
+
+
+def permission_candidates(text: str) -> list[str]:
+    """Every permission name containing the input, underscores ignored ("manage" -> manage_*)."""
+    clean_input = text.lower().replace(" ", "").replace("_", "")
+    if not clean_input:
+        return []
+    return [name for stripped, name in _STRIPPED_PERMISSIONS.items() if clean_input in stripped]
+
+
+def resolve_permission(text: str) -> Optional[str]:
+    """Resolve user input (alias, snake_case, squashed or substring) to a permission name."""
+    matched = match_permission(text)
+    if matched is not None:
+        return matched
+    # 4. Substring match, first wins ("ban" -> "ban_members")
+    candidates = permission_candidates(text)
+    return candidates[0] if candidates else None
+
+
+def permission_bit(name: str) -> int:
+    """Bit value of a single permission flag."""
+    return getattr(discord.Permissions, name).flag
+
+
+class GuildPermissionIndex:
+    """Effective-permission matrix (channels × roles) for one guild."""
+
+    __slots__ = ("guild_id", "channel_ids", "is_category", "_positions", "rows", "role_bits")
+
+    def __init__(self, guild: discord.Guild) -> None:
+        self.guild_id = guild.id
+        self.channel_ids: list[int] = []
+        self.is_category: list[bool] = []
+        self._positions: dict[int, int] = {}
+        # role_id -> effective bits per channel (parallel to channel_ids)
+        self.rows: dict[int, array] = {}
+        # role_id -> guild-level permission bits
+        self.role_bits: dict[int, int] = {}
+        self.rebuild(guild)
+
+    # ------------------------------------------------------------------
+    # Build / incremental updates
+    # ------------------------------------------------------------------
+    def rebuild(self, guild: discord.Guild) -> None:
+        channels = sorted(guild.channels, key=lambda c: c.position)
+        self.channel_ids = [c.id for c in channels]
+        self.is_category = [isinstance(c, discord.CategoryChannel) for c in channels]
+        self._positions = {cid: i for i, cid in enumerate(self.channel_ids)}
+        self.rows = {
+            role.id: array("Q", (c.permissions_for(role).value for c in channels))
+            for role in guild.roles
+        }
+        self.role_bits = {role.id: role.permissions.value for role in guild.roles}
+
+    def update_role(self, guild: discord.Guild, role: discord.Role) -> None:
+        """Recompute one role's row (or everything for ``@everyone``)."""
+        if role.is_default():
+            self.rebuild(guild)
+            return
+        self.role_bits[role.id] = role.permissions.value
+        row = array("Q", bytes(8 * len(self.channel_ids)))
+        for i, cid in enumerate(self.channel_ids):
+            channel = guild.get_channel(cid)
+            if channel is not None:
+                row[i] = channel.permissions_for(role).value
+        self.rows[role.id] = row
+
+    def remove_role(self, role_id: int) -> None:
+        self.rows.pop(role_id, None)
+        self.role_bits.pop(role_id, None)
+
+    def update_channel(self, guild: discord.Guild, channel: discord.abc.GuildChannel) -> None:
+        """Recompute one channel's column for every role, appending it if new."""
+        index = self._positions.get(channel.id)
+        if index is None:
+            index = len(self.channel_ids)
+            self.channel_ids.append(channel.id)
+            self.is_category.append(isinstance(channel, discord.CategoryChannel))
+            self._positions[channel.id] = index
+            for row in self.rows.values():
+                row.append(0)
+        for role_id, row in self.rows.items():
+            role = guild.get_role(role_id)
+            if role is not None:
+                row[index] = channel.permissions_for(role).value
+
+    def remove_channel(self, channel_id: int) -> None:
+        index = self._positions.pop(channel_id, None)
+        if index is None:
+            return
+        del self.channel_ids[index]
+        del self.is_category[index]
+        for row in self.rows.values():
+            del row[index]
+        for cid in self.channel_ids[index:]:
+            self._positions[cid] -= 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def channels_with(self, role_id: int, permission: str, *, categories: bool = False) -> Iterator[int]:
+        """Channel IDs where ``role_id`` has ``permission`` (categories or non-categories)."""
+        row = self.rows.get(role_id)
+        if row is None:
+            return iter(())
+        bit = permission_bit(permission)
+        return (
+            cid
+            for cid, bits, is_cat in zip(self.channel_ids, row, self.is_category)
+            if is_cat == categories and bits & bit
+        )
+
+    def roles_with(self, permission: str) -> Iterator[int]:
+        """Role IDs (excluding @everyone) whose guild permissions grant ``permission``."""
+        mask = permission_bit(permission) | permission_bit("administrator")
+        return (
+            role_id for role_id, bits in self.role_bits.items()
+            if role_id != self.guild_id and bits & mask
+        )
+
+    def roles_without_permissions(self) -> Iterator[int]:
+        """Role IDs (excluding @everyone) with a zero permission value."""
+        return (
+            role_id for role_id, bits in self.role_bits.items()
+            if role_id != self.guild_id and bits == 0
+        )
+
+    def roles_with_any_permission(self) -> Iterator[int]:
+        """Role IDs (excluding @everyone) with at least one permission."""
+        return (
+            role_id for role_id, bits in self.role_bits.items()
+            if role_id != self.guild_id and bits != 0
+        )
+
+
+class PermissionIndexCache:
+    """Lazily built per-guild :class:`GuildPermissionIndex` instances."""
+
+    def __init__(self) -> None:
+        self._indexes: dict[int, GuildPermissionIndex] = {}
+
+    def get(self, guild: discord.Guild) -> GuildPermissionIndex:
+        index = self._indexes.get(guild.id)
+        if index is None:
+            index = GuildPermissionIndex(guild)
+            self._indexes[guild.id] = index
+        return index
+
+    def peek(self, guild_id: int) -> Optional[GuildPermissionIndex]:
+        """Return the index only if it has already been built."""
+        return self._indexes.get(guild_id)
+
+    def invalidate(self, guild_id: int) -> None:
+        self._indexes.pop(guild_id, None)
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+
+__all__ = [
+    "PERMISSION_ALIASES",
+    "VALID_PERMISSIONS",
+    "GuildPermissionIndex",
+    "PermissionIndexCache",
+    "match_permission",
+    "permission_bit",
+    "permission_candidates",
+    "resolve_permission",
+]
@@ -0,0 +1,277 @@
+"""Streaming, filtered purge engine used by ``ModCog.purge``.
+
+The engine walks ``channel.history`` page by page (discord.py fetches 100
+messages per request), keeps only messages that match a :class:`PurgeFilter`
+and deletes them as it goes:
+
+- messages younger than 14 days are collected into chunks of up to 100 and
+  removed with a single bulk-delete request per chunk;
+- older messages cannot be bulk deleted, so they are queued and removed one
+  at a time by a paced worker running alongside the scan.
+
+Nothing is materialized beyond the current bulk chunk and the pending
+single-delete queue, so purging thousands of messages uses constant memory.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Optional
+
+import discord  # type: ignore[import-not-found]
+
+logger = logging.getLogger("codeverse.purge")
+
+# Discord refuses bulk deletes for messages older than 14 days. A small safety
+# margin avoids 400s for messages that cross the boundary mid-purge.
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+BULK_DELETE_CHUNK = 100
+# Upper bounds for a single purge run.
+PURGE_MAX_AMOUNT = 2000
+PURGE_MAX_SCAN = 10000
+# Delay between single deletes of old messages (they share a tight bucket).
+SINGLE_DELETE_INTERVAL = 1.0
+# Minimum seconds between two progress callbacks.
+PROGRESS_INTERVAL = 2.0
+
+_LINK_RE = re.compile(r"https?://\S+|discord(?:\.gg|(?:app)?\.com/invite)/\S+", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class PurgeFilter:
+    """Predicate applied to every scanned message."""
+
+    author_id: Optional[int] = None
+    bots_only: bool = False
+    pattern: Optional[re.Pattern[str]] = None
+    has_attachments: bool = False
+    has_links: bool = False
+    skip_ids: set[int] = field(default_factory=set)
+
+    def matches(self, message: discord.Message) -> bool:
+        if message.id in self.skip_ids or message.pinned:
+            return False
+        if self.author_id is not None and message.author.id != self.author_id:
+            return False
+        if self.bots_only and not message.author.bot:
+            return False
+        if self.has_attachments and not message.attachments:
+            return False
+        content = message.content or ""
+        if self.has_links and not _LINK_RE.search(content):
+            return False
+        if self.pattern is not None and not self.pattern.search(content):
+            return False
+        return True
+
+    def describe(self) -> str:
+        """Short human-readable summary for confirmation messages."""
+        parts = []
+        if self.author_id is not None:
+            parts.append(f"author <@{self.author_id}>")
+        if self.bots_only:
+            parts.append("bots only")
+        if self.pattern is not None:
+            parts.append(f"regex `{self.pattern.pattern}`")
+        if self.has_attachments:
+            parts.append("with attachments")
+        if self.has_links:
+            parts.append("with links")
+        return ", ".join(parts) or "none"
+
+
+@dataclass(slots=True)
+class PurgeProgress:
+    """Running counters reported to the progress callback."""
+
+    scanned: int = 0
+    matched: int = 0
+    bulk_deleted: int = 0
+    single_deleted: int = 0
+    failed: int = 0
+    queued_old: int = 0
+    finished: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def deleted(self) -> int:
+        return self.bulk_deleted + self.single_deleted
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def render(self) -> str:
+        status = "✅ Purge complete" if self.finished else "🧹 Purging"
+        lines = [
+            f"{status}: **{self.deleted}** deleted",
+            f"Scanned {self.scanned} • matched {self.matched} • "
+            f"bulk {self.bulk_deleted} • single {self.single_deleted}",
+        ]
+        pending = self.queued_old - self.single_deleted - self.failed
+        if pending > 0:
+            lines.append(f"Old messages queued (>14 days): {pending}")
+        if self.failed:
+            lines.append(f"Failed: {self.failed}")
+        lines.append(f"-# {self.elapsed:.1f}s elapsed")
+        return "\n".join(lines)
+
+
+ProgressCallback = Callable[[PurgeProgress], Awaitable[Any]]
+
+
+def compile_pattern(pattern: Optional[str]) -> Optional[re.Pattern[str]]:
+    """Compile a user-supplied regex (case-insensitive); raise ``ValueError`` if invalid."""
+    if not pattern:
+        return None
+    if len(pattern) > 200:
+        raise ValueError("Regex is too long (max 200 characters).")
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Invalid regex: {e}") from e
+
+
+class PurgeEngine:
+    """Scan a channel's history and delete up to ``amount`` matching messages."""
+
+    def __init__(
+        self,
+        channel: discord.abc.Messageable,
+        amount: int,
+        message_filter: PurgeFilter,
+        *,
+        before: Optional[discord.abc.Snowflake] = None,
+        after: Optional[discord.abc.Snowflake] = None,
+        scan_limit: int = PURGE_MAX_SCAN,
+        progress_callback: Optional[ProgressCallback] = None,
+        reason: Optional[str] = None,
+    ) -> None:
+        self.channel = channel
+        self.amount = max(1, min(amount, PURGE_MAX_AMOUNT))
+        self.filter = message_filter
+        self.before = before
+        self.after = after
+        self.scan_limit = max(1, min(scan_limit, PURGE_MAX_SCAN))
+        self.progress_callback = progress_callback
+        self.reason = reason
+        self.progress = PurgeProgress()
+        self._old_queue: asyncio.Queue[Optional[discord.Message]] = asyncio.Queue()
+        self._last_progress = 0.0
+
+    async def run(self) -> PurgeProgress:
+        """Execute the purge and return the final counters."""
+        worker = asyncio.create_task(self._single_delete_worker())
+        try:
+            await self._scan()
+        finally:
+            # Sentinel: the worker drains whatever is left and exits.
+            await self._old_queue.put(None)
+            await worker
+            self.progress.finished = True
+            await self._report(force=True)
+        return self.progress
+
+    async def _scan(self) -> None:
+        bulk_cutoff = discord.utils.time_snowflake(discord.utils.utcnow() - BULK_DELETE_MAX_AGE)
+        can_bulk = callable(getattr(self.channel, "delete_messages", None))
+        chunk: list[discord.Message] = []
+
+        history = self.channel.history(  # type: ignore[attr-defined]
+            limit=self.scan_limit, before=self.before, after=self.after, oldest_first=False
+        )
+        async for message in history:
+            self.progress.scanned += 1
+            if not self.filter.matches(message):
+                await self._report()
+                continue
+
+            self.progress.matched += 1
+            if can_bulk and message.id > bulk_cutoff:
+                chunk.append(message)
+                if len(chunk) >= BULK_DELETE_CHUNK:
+                    await self._bulk_delete(chunk)
+                    chunk = []
+            else:
+                self.progress.queued_old += 1
+                await self._old_queue.put(message)
+
+            await self._report()
+            if self.progress.matched >= self.amount:
+                break
+
+        if chunk:
+            await self._bulk_delete(chunk)
+
+    async def _bulk_delete(self, chunk: list[discord.Message]) -> None:
+        if len(chunk) == 1:
+            # Bulk delete requires at least two messages.
+            await self._delete_one(chunk[0], bulk=True)
+            return
+        try:
+            await self.channel.delete_messages(chunk, reason=self.reason)  # type: ignore[attr-defined]
+            self.progress.bulk_deleted += len(chunk)
+        except discord.Forbidden:
+            raise
+        except discord.HTTPException as e:
+            logger.warning("Bulk delete of %d messages failed (%s); deleting individually", len(chunk), e)
+            for message in chunk:
+                await self._delete_one(message, bulk=True)
+        await self._report(force=True)
+
+    async def _delete_one(self, message: discord.Message, *, bulk: bool = False) -> None:
+        try:
+            await message.delete()
+        except discord.NotFound:
+            # Already gone: count it so the totals match what the user asked for.
+            pass
+        except discord.Forbidden:
+            raise
+        except discord.HTTPException as e:
+            logger.debug("Failed to delete message %s: %s", message.id, e)
+            self.progress.failed += 1
+            return
+        if bulk:
+            self.progress.bulk_deleted += 1
+        else:
+            self.progress.single_deleted += 1
+
+    async def _single_delete_worker(self) -> None:
+        """Delete queued (older than 14 days) messages one by one, paced."""
+        while True:
+            message = await self._old_queue.get()
+            if message is None:
+                return
+            try:
+                await self._delete_one(message)
+            except discord.Forbidden:
+                self.progress.failed += 1
+            await self._report()
+            await asyncio.sleep(SINGLE_DELETE_INTERVAL)
+
+    async def _report(self, *, force: bool = False) -> None:
+        if self.progress_callback is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        try:
+            await self.progress_callback(self.progress)
+        except Exception as e:
+            logger.debug("Purge progress callback failed: %s", e)
+
+
+__all__ = [
+    "PurgeEngine",
+    "PurgeFilter",
+    "PurgeProgress",
+    "compile_pattern",
+    "PURGE_MAX_AMOUNT",
+    "PURGE_MAX_SCAN",
+]
@@ -0,0 +1,257 @@
+"""Shared sliding-window rate limiter for commands and interactions.
+
+Each :class:`RateLimiter` keeps one tiny :class:`_Window` record per key
+(usually ``(guild_id, user_id)``) using the sliding-window-counter
+approximation: a count for the current fixed window plus the count of the
+previous one, weighted by how much of it still overlaps the sliding window.
+Checking a key is O(1) and never rebuilds a list of timestamps.
+
+Keys live in an ``OrderedDict`` ordered by last use, so stale keys (idle for
+more than two windows) are evicted lazily from the front and the total number
+of keys is capped by ``max_keys``. Memory is bounded no matter how many
+distinct users invoke commands.
+
+Usage on any prefix/hybrid command::
+
+    @rate_limit("ban", 10, 60)
+    async def ban(self, ctx, ...): ...
+
+Direct usage (buttons, modals, listeners)::
+
+    limiter = get_rate_limiter("ticket_create", 3, 600)
+    retry_after = limiter.hit((guild.id, user.id))
+    if retry_after:
+        ...  # denied, try again in ``retry_after`` seconds
+
+All limiters are registered by name so diagnostics can report hit/deny
+metrics via :func:`rate_limiters`.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Optional
+
+from discord.ext import commands  # type: ignore[import-not-found]
+
+from utils.memory_diagnostics import register_cache
+
+DEFAULT_MAX_KEYS = 10_000
+
+
+class _Window:
+    """Per-key sliding-window counter state."""
+
+    __slots__ = ("start", "current", "previous", "last_seen")
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.current = 0
+        self.previous = 0
+        self.last_seen = start
+
+
+class RateLimiter:
+    """Allow at most ``rate`` hits per ``per`` seconds for each key."""
+
+    def __init__(self, name: str, rate: int, per: float, *, max_keys: int = DEFAULT_MAX_KEYS) -> None:
+        if rate < 1 or per <= 0:
+            raise ValueError("rate must be >= 1 and per must be > 0")
+        self.name = name
+        self.rate = rate
+        self.per = float(per)
+        self.max_keys = max_keys
+        self._windows: OrderedDict[Hashable, _Window] = OrderedDict()
+        self.allowed = 0
+        self.denied = 0
+        self.evicted = 0
+
+    def _evict(self, now: float) -> None:
+        ttl = self.per * 2
+        windows = self._windows
+        while windows:
+            oldest = next(iter(windows.values()))
+            if now - oldest.last_seen <= ttl and len(windows) <= self.max_keys:
+                break
+            windows.popitem(last=False)
+            self.evicted += 1
+
+    def _roll(self, window: _Window, now: float) -> None:
+        elapsed = now - window.start
+        if elapsed < self.per:
+            return
+        if elapsed < self.per * 2:
+            window.previous = window.current
+            window.start += self.per
+        else:
+            window.previous = 0
+            window.start = now
+        window.current = 0
+
+    def hit(self, key: Hashable, *, now: Optional[float] = None) -> float:
+        """Record a hit for ``key``.
+
+        Returns ``0.0`` when allowed, otherwise the number of seconds until
+        the key may try again (the hit is not counted).
+        """
+        now = time.monotonic() if now is None else now
+        window = self._windows.get(key)
+        if window is None:
+            window = _Window(now)
+            self._windows[key] = window
+        else:
+            self._windows.move_to_end(key)
+        self._roll(window, now)
+        window.last_seen = now
+
+        weight = 1.0 - (now - window.start) / self.per
+        estimated = window.previous * weight + window.current
+        if estimated + 1 > self.rate:
+            self.denied += 1
+            self._evict(now)
+            return self._retry_after(window, now)
+
+        window.current += 1
+        self.allowed += 1
+        self._evict(now)
+        return 0.0
+
+    def peek(self, key: Hashable, *, now: Optional[float] = None) -> float:
+        """Like :meth:`hit`, but only reports whether a hit would be allowed.
+
+        The hit is not counted towards the limit (a refusal still counts in
+        ``denied``), so callers can reject early and record the hit once the
+        action is known to go ahead.
+        """
+        now = time.monotonic() if now is None else now
+        window = self._windows.get(key)
+        if window is None:
+            return 0.0
+        self._roll(window, now)
+        weight = 1.0 - (now - window.start) / self.per
+        if window.previous * weight + window.current + 1 > self.rate:
+            self.denied += 1
+            return self._retry_after(window, now)
+        return 0.0
+
+    def _retry_after(self, window: _Window, now: float) -> float:
+        remaining = self.per - (now - window.start)
+        if window.current + 1 > self.rate or window.previous == 0:
+            # Current window alone is full: wait for it to roll over, then for
+            # its carried-over weight to decay enough.
+            excess = window.current + 1 - self.rate
+            return remaining + self.per * excess / max(window.current, 1)
+        # Previous window's weight must decay by the excess.
+        excess = window.previous * (1.0 - (now - window.start) / self.per) + window.current + 1 - self.rate
+        return min(remaining, self.per * excess / window.previous)
+
+    def reset(self, key: Hashable) -> None:
+        self._windows.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "rate": self.rate,
+            "per": self.per,
+            "keys": len(self._windows),
+            "allowed": self.allowed,
+            "denied": self.denied,
+            "evicted": self.evicted,
+        }
+
+
+_LIMITERS: dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(name: str, rate: int, per: float, *, max_keys: int = DEFAULT_MAX_KEYS) -> RateLimiter:
+    """Return the limiter registered under ``name``, creating it if needed.
+
+    Re-registering a name (e.g. after a cog reload) keeps the existing state
+    but applies the new rate/window.
+    """
+    limiter = _LIMITERS.get(name)
+    if limiter is None:
+        limiter = RateLimiter(name, rate, per, max_keys=max_keys)
+        _LIMITERS[name] = limiter
+        register_cache(f"rate_limit.{name}", limiter)
+    else:
+        limiter.rate, limiter.per, limiter.max_keys = rate, float(per), max_keys
+    return limiter
+
+
+def rate_limiters() -> dict[str, RateLimiter]:
+    """All registered limiters, keyed by name."""
+    return dict(_LIMITERS)
+
+
+class RateLimited(commands.CheckFailure):
+    """Raised by :func:`rate_limit` when a caller exceeds the limit."""
+
+    def __init__(self, limiter: RateLimiter, retry_after: float) -> None:
+        self.limiter = limiter
+        self.retry_after = retry_after
+        super().__init__(
+            f"You can only use this command {limiter.rate} time{'s' if limiter.rate != 1 else ''} "
+            f"per {int(limiter.per)} seconds. Try again in {retry_after:.0f}s."
+        )
+
+
+def _guild_user_key(ctx: commands.Context) -> Hashable:
+    return (ctx.guild.id if ctx.guild else None, ctx.author.id)
+
+
+def rate_limit(
+    name: str,
+    rate: int,
+    per: float,
+    *,
+    key: Callable[[commands.Context], Hashable] = _guild_user_key,
+    max_keys: int = DEFAULT_MAX_KEYS,
+):
+    """Apply the named sliding-window limiter to a command.
+
+    Defaults to one bucket per (guild, invoking user). The bot owner is never
+    limited. The check only peeks, so a caller who is over the limit is
+    rejected before argument conversion; the hit itself is recorded in a
+    ``before_invoke`` hook, after the arguments converted. A mistyped member
+    or duration therefore does not use up a slot.
+    """
+    limiter = get_rate_limiter(name, rate, per, max_keys=max_keys)
+
+    async def predicate(ctx: commands.Context) -> bool:
+        if await ctx.bot.is_owner(ctx.author):
+            return True
+        retry_after = limiter.peek(key(ctx))
+        if retry_after:
+            raise RateLimited(limiter, retry_after)
+        return True
+
+    async def record(*args: Any) -> None:
+        ctx = args[-1]  # (cog, ctx) for cog commands, (ctx,) otherwise
+        if await ctx.bot.is_owner(ctx.author):
+            return
+        retry_after = limiter.hit(key(ctx))
+        if retry_after:
+            # Another invocation took the last slot while this one converted
+            raise RateLimited(limiter, retry_after)
+
+    # Lets the help menu describe the limit alongside native cooldowns.
+    predicate.rate_limiter = limiter  # type: ignore[attr-defined]
+
+    def decorator(func):
+        return commands.before_invoke(record)(commands.check(predicate)(func))
+
+    return decorator
+
+
+__all__ = [
+    "RateLimiter",
+    "RateLimited",
+    "get_rate_limiter",
+    "rate_limiters",
+    "rate_limit",
+]
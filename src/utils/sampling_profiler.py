@@ -0,0 +1,145 @@
+"""On-demand sampling profiler for the live bot.
+
+``SamplingProfiler.run(seconds)`` starts a daemon thread that, every
+``interval`` seconds, reads the event-loop thread's current frame from
+``sys._current_frames()`` and records the whole call stack. Nothing is
+installed when no capture is running (no ``sys.setprofile`` hook, no
+thread), so the profiler costs nothing until an owner asks for it.
+
+Results are aggregated two ways:
+
+* collapsed stacks (``root;caller;callee count``), the input format of
+  ``flamegraph.pl``, speedscope and similar tools;
+* per-function *self* samples (function on top of the stack) and *total*
+  samples (function anywhere on the stack).
+
+Samples where the loop is waiting in the selector are counted as idle, so
+the busy percentage shows how much of the window the loop was working.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+DEFAULT_INTERVAL = 0.005
+MAX_SECONDS = 120
+MAX_DEPTH = 128
+
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_IDLE_FUNCTIONS = {"select", "poll", "epoll", "kqueue", "_poll", "control"}
+
+
+@dataclass(slots=True)
+class ProfileResult:
+    """Aggregated samples from one capture."""
+
+    duration: float
+    interval: float
+    samples: int = 0
+    idle: int = 0
+    stacks: Counter = field(default_factory=Counter)  # collapsed stack -> samples
+    self_counts: Counter = field(default_factory=Counter)
+    total_counts: Counter = field(default_factory=Counter)
+
+    @property
+    def busy_ratio(self) -> float:
+        return (self.samples - self.idle) / self.samples if self.samples else 0.0
+
+    def top_functions(self, limit: int = 15, *, by: str = "self") -> list[tuple[str, int, int]]:
+        """``(function, self_samples, total_samples)`` sorted by ``by``."""
+        source = self.self_counts if by == "self" else self.total_counts
+        return [(name, self.self_counts[name], self.total_counts[name]) for name, _ in source.most_common(limit)]
+
+    def collapsed(self) -> str:
+        """Flamegraph-compatible collapsed stacks, heaviest first."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+class SamplingProfiler:
+    """Samples one thread's stack at a fixed interval (one capture at a time)."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL) -> None:
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._names: dict = {}  # code object -> display name
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def _name(self, code) -> str:
+        name = self._names.get(code)
+        if name is None:
+            filename = code.co_filename
+            if filename.startswith(_SOURCE_ROOT):
+                filename = os.path.relpath(filename, _SOURCE_ROOT)
+            else:
+                filename = os.path.basename(filename)
+            name = self._names[code] = f"{filename}:{code.co_name}"
+        return name
+
+    def _sample(self, thread_id: int, result: ProfileResult, stop: threading.Event) -> None:
+        current_frames = sys._current_frames
+        while not stop.wait(self.interval):
+            frame = current_frames().get(thread_id)
+            if frame is None:
+                continue
+            codes = []
+            while frame is not None and len(codes) < MAX_DEPTH:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            del frame
+
+            result.samples += 1
+            if codes[0].co_name in _IDLE_FUNCTIONS:
+                result.idle += 1
+                continue
+            names = [self._name(code) for code in reversed(codes)]
+            result.stacks[";".join(names)] += 1
+            result.self_counts[names[-1]] += 1
+            for name in set(names):
+                result.total_counts[name] += 1
+
+    async def run(self, seconds: float) -> ProfileResult:
+        """Profile the calling event loop's thread for ``seconds``."""
+        if self._lock.locked():
+            raise RuntimeError("A profile is already running")
+        seconds = max(0.1, min(seconds, MAX_SECONDS))
+        async with self._lock:
+            result = ProfileResult(duration=seconds, interval=self.interval)
+            stop = threading.Event()
+            thread = threading.Thread(
+                target=self._sample,
+                args=(threading.get_ident(), result, stop),
+                name="sampling-profiler",
+                daemon=True,
+            )
+            started = time.perf_counter()
+            thread.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stop.set()
+                await asyncio.to_thread(thread.join)
+                self._names.clear()
+            result.duration = time.perf_counter() - started
+            return result
+
+
+_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> SamplingProfiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = SamplingProfiler()
+    return _profiler
+
+
+__all__ = ["ProfileResult", "SamplingProfiler", "get_profiler"]